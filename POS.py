@@ -1,6 +1,10 @@
 import sys
 import os
-import json
+import time
+
+# Referência para o relatório de tempo de inicialização
+INICIO_IMPORTS = time.perf_counter()
+
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QApplication,
@@ -23,8 +27,10 @@ from PyQt6.QtWidgets import (
     QDialog,
     QDialogButtonBox,
     QTabWidget,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QStyle,
     QHeaderView,
     QSplitter,
     QInputDialog,
@@ -33,8 +39,21 @@ from PyQt6.QtWidgets import (
     QMenu,
 )
 from PyQt6.QtGui import QFont, QPalette, QColor, QIcon, QAction, QIntValidator
-from PyQt6.QtCore import Qt, QSettings, QTimer
-from updater import Updater
+from PyQt6.QtCore import (
+    Qt,
+    QSettings,
+    QTimer,
+    QEvent,
+    QAbstractTableModel,
+    QModelIndex,
+    QThread,
+    pyqtSignal,
+)
+from storage import open_store
+from archive import PendenciaArchive
+from records import PendenciaRecord
+
+FIM_IMPORTS = time.perf_counter()
 
 
 def get_resource_path(filename):
@@ -132,60 +151,649 @@ class DetalhePendenciaDialog(QDialog):
         layout.addWidget(buttons)
 
 
+class ValidadorFormulario:
+    """
+    Validação incremental do formulário do check-list.
+
+    Cada regra declara os widgets de que depende; quando um widget muda, só
+    as regras dele são reavaliadas e só as bordas afetadas são atualizadas.
+    O conjunto de campos obrigatórios faltando fica sempre atualizado.
+    """
+
+    def __init__(self, aplicar_validade):
+        """
+        Args:
+            aplicar_validade (callable): Recebe (widget, valido) e atualiza a borda.
+        """
+        self.aplicar_validade = aplicar_validade
+        self.faltando = set()  # Regras obrigatórias não atendidas
+        self._regras = {}  # nome -> (verificar, rótulo)
+        self._ordem = {}  # nome -> posição de declaração (ordem das mensagens)
+        self._estado = {}  # nome -> último resultado
+        self._regras_por_widget = {}
+        self._alvos = {}  # widget com borda -> regras que ele reflete
+        self._alvos_por_regra = {}
+
+    def adicionar_regra(self, nome, dependencias, verificar, rotulo=None):
+        """
+        Declara uma regra.
+
+        Args:
+            nome (str): Identificador da regra.
+            dependencias (list): Widgets cuja alteração reavalia a regra.
+            verificar (callable): Retorna True quando a regra é atendida.
+            rotulo (str): Nome exibido quando obrigatório (None = só visual).
+        """
+        self._regras[nome] = (verificar, rotulo)
+        self._ordem[nome] = len(self._ordem)
+        for widget in dependencias:
+            self._regras_por_widget.setdefault(widget, []).append(nome)
+
+    def adicionar_alvo(self, widget, regras):
+        """Faz a borda do widget refletir o conjunto de regras informado"""
+        self._alvos[widget] = list(regras)
+        for nome in regras:
+            self._alvos_por_regra.setdefault(nome, []).append(widget)
+
+    def reavaliar(self, widget):
+        """Reavalia só as regras que dependem do widget alterado"""
+        alvos = set()
+        for nome in self._regras_por_widget.get(widget, ()):
+            if self._avaliar(nome):
+                alvos.update(self._alvos_por_regra.get(nome, ()))
+        for alvo in alvos:
+            self._aplicar(alvo)
+
+    def reavaliar_tudo(self):
+        """Reavalia todas as regras e bordas"""
+        for nome in self._regras:
+            self._avaliar(nome)
+        for alvo in self._alvos:
+            self._aplicar(alvo)
+
+    def valido(self, nome):
+        """Resultado atual de uma regra"""
+        return self._estado.get(nome, False)
+
+    def campos_faltando(self):
+        """Rótulos dos campos obrigatórios faltando, na ordem de declaração"""
+        return [
+            self._regras[nome][1] for nome in sorted(self.faltando, key=self._ordem.get)
+        ]
+
+    def _avaliar(self, nome):
+        # Retorna True se o resultado da regra mudou
+        verificar, rotulo = self._regras[nome]
+        valido = bool(verificar())
+        if self._estado.get(nome) == valido:
+            return False
+        self._estado[nome] = valido
+        if rotulo is not None:
+            if valido:
+                self.faltando.discard(nome)
+            else:
+                self.faltando.add(nome)
+        return True
+
+    def _aplicar(self, widget):
+        self.aplicar_validade(
+            widget, all(self._estado.get(nome, False) for nome in self._alvos[widget])
+        )
+
+
+class PendenciasTableModel(QAbstractTableModel):
+    """
+    Modelo da tabela de pendências, lido direto do dicionário de pendências.
+
+    Só as células visíveis são consultadas pela view, então o custo de
+    exibir a tabela não depende do tamanho do histórico.
+    """
+
+    COLUNAS = ["ID", "Técnico", "Observações", "Data/Hora", "Status", "Progresso", "Ações"]
+    COLUNA_TECNICO = 1
+    COLUNA_OBSERVACOES = 2
+    COLUNA_ACOES = 6
+
+    # Campos contados na coluna Progresso
+    CAMPOS_PROGRESSO = [
+        "check_comissao",
+        "check_ip_mac",
+        "check_instalacao",
+        "check_localizacao",
+        "check_foto_gps",
+        "check_acesso_remoto",
+        "input_senha",
+        "input_rx",
+        "input_tx",
+        "input_nome_arquivo",
+        "input_link_gps",
+    ]
+
+    def __init__(self, pendencias, editar=None, parent=None):
+        """
+        Args:
+            pendencias (dict): Pendências por ID (compartilhado com a janela).
+            editar (callable): Recebe (pendencia, coluna, valor) e retorna
+                True se a alteração foi confirmada e salva.
+        """
+        super().__init__(parent)
+        self.pendencias = pendencias
+        self.editar = editar
+        self._ids = []
+        self._linha_por_id = None  # ID -> linha, recalculado sob demanda
+        self.recarregar()
+
+    def recarregar(self):
+        """Relê a lista de pendências (usar após mudanças em várias linhas)"""
+        self.beginResetModel()
+        self._ids = list(self.pendencias)
+        self._linha_por_id = None
+        self.endResetModel()
+
+    def inserir_pendencia(self, id_pendencia):
+        """Acrescenta a linha de uma pendência nova ao final da tabela"""
+        row = len(self._ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.append(id_pendencia)
+        if self._linha_por_id is not None:
+            self._linha_por_id[id_pendencia] = row
+        self.endInsertRows()
+
+    def atualizar_pendencia(self, id_pendencia):
+        """Repinta apenas a linha de uma pendência alterada"""
+        row = self.linha_do_id(id_pendencia)
+        if row is not None:
+            self.dataChanged.emit(
+                self.index(row, 0), self.index(row, len(self.COLUNAS) - 1)
+            )
+
+    def remover_pendencia(self, id_pendencia):
+        """Remove a linha de uma pendência excluída"""
+        row = self.linha_do_id(id_pendencia)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        # As linhas seguintes mudaram de posição: remapear só quando necessário
+        self._linha_por_id = None
+        self.endRemoveRows()
+
+    def id_da_linha(self, row):
+        """Retorna o ID da pendência exibida na linha (ou None)"""
+        if 0 <= row < len(self._ids):
+            return self._ids[row]
+        return None
+
+    def linha_do_id(self, id_pendencia):
+        """Retorna a linha em que a pendência está exibida (ou None)"""
+        if self._linha_por_id is None:
+            self._linha_por_id = {
+                id_pendencia: i for i, id_pendencia in enumerate(self._ids)
+            }
+        return self._linha_por_id.get(id_pendencia)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUNAS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUNAS[section]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.editar is not None and index.column() in (
+            self.COLUNA_TECNICO, self.COLUNA_OBSERVACOES
+        ):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        pendencia = self.pendencias.get(self._ids[index.row()])
+        if pendencia is None:
+            return None
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return str(pendencia["id"])
+            if col == self.COLUNA_TECNICO:
+                return pendencia["nome_tecnico"]
+            if col == self.COLUNA_OBSERVACOES:
+                # Observações - mostrar mais texto
+                observacoes = pendencia["dados"].get("observacoes", "")
+                if len(observacoes) > 80:
+                    return observacoes[:77] + "..."
+                return observacoes
+            if col == 3:
+                return pendencia["data_hora"]
+            if col == 4:
+                return pendencia["status"]
+            if col == 5:
+                dados = pendencia["dados"]
+                campos_preenchidos = sum(
+                    1 for campo in self.CAMPOS_PROGRESSO if dados.get(campo)
+                )
+                return f"{campos_preenchidos}/{len(self.CAMPOS_PROGRESSO)}"
+        elif role == Qt.ItemDataRole.EditRole:
+            if col == self.COLUNA_TECNICO:
+                return pendencia["nome_tecnico"]
+            if col == self.COLUNA_OBSERVACOES:
+                return pendencia["dados"].get("observacoes", "")
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            if col == self.COLUNA_OBSERVACOES:
+                return pendencia["dados"].get("observacoes", "")
+            if col == self.COLUNA_ACOES:
+                return "Ver detalhes"
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if col == self.COLUNA_ACOES:
+                return Qt.AlignmentFlag.AlignCenter
+            return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        elif role == Qt.ItemDataRole.UserRole:
+            return pendencia["id"]
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or self.editar is None:
+            return False
+
+        pendencia = self.pendencias.get(self._ids[index.row()])
+        if pendencia is None or not self.editar(pendencia, index.column(), value):
+            # Alteração recusada: a view volta a exibir o valor original
+            return False
+
+        self.atualizar_pendencia(pendencia["id"])
+        return True
+
+
+class AcaoDetalhesDelegate(QStyledItemDelegate):
+    """Desenha o link "👁️" da coluna Ações sem criar widgets por linha"""
+
+    detalhes_clicados = pyqtSignal(int)
+
+    def paint(self, painter, option, index):
+        # Fundo padrão da célula (seleção, cores alternadas), sem texto
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.save()
+        if hover:
+            area = option.rect.adjusted(
+                option.rect.width() // 2 - 12, 8, -(option.rect.width() // 2 - 12), -8
+            )
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#f8f9fa"))
+            painter.drawRoundedRect(area, 3, 3)
+
+        font = painter.font()
+        font.setPixelSize(14)
+        painter.setFont(font)
+        painter.setPen(QColor("#495057" if hover else "#6c757d"))
+        painter.drawText(option.rect, Qt.AlignmentFlag.AlignCenter, "👁️")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+        ):
+            self.detalhes_clicados.emit(index.data(Qt.ItemDataRole.UserRole))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class HistoricoDialog(QDialog):
+    """Consulta as pendências finalizadas, um mês por vez"""
+
+    def __init__(self, arquivo, parent=None):
+        super().__init__(parent)
+        self.arquivo = arquivo
+        self.pendencias = {}
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle("Histórico de Pendências")
+        self.setModal(True)
+        self.resize(800, 500)
+
+        layout = QVBoxLayout(self)
+
+        filtro_layout = QHBoxLayout()
+        filtro_layout.addWidget(QLabel("Mês:"))
+        self.combo_mes = QComboBox()
+        for mes in self.arquivo.meses():
+            ano, numero = mes.split("-")
+            self.combo_mes.addItem(f"{numero}/{ano}", mes)
+        filtro_layout.addWidget(self.combo_mes)
+        filtro_layout.addStretch()
+        layout.addLayout(filtro_layout)
+
+        # Mesmo modelo da aba de pendências, somente leitura
+        self.modelo = PendenciasTableModel(self.pendencias, parent=self)
+        self.tabela = QTableView()
+        self.tabela.setModel(self.modelo)
+        self.delegate_detalhes = AcaoDetalhesDelegate(self.tabela)
+        self.delegate_detalhes.detalhes_clicados.connect(self.ver_detalhes)
+        self.tabela.setItemDelegateForColumn(
+            PendenciasTableModel.COLUNA_ACOES, self.delegate_detalhes
+        )
+        header = self.tabela.horizontalHeader()
+        header.setResizeContentsPrecision(0)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Observações
+        self.tabela.setAlternatingRowColors(True)
+        self.tabela.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.tabela)
+
+        self.label_vazio = QLabel("Nenhuma pendência finalizada no histórico.")
+        self.label_vazio.setVisible(self.combo_mes.count() == 0)
+        layout.addWidget(self.label_vazio)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.combo_mes.currentIndexChanged.connect(self.carregar_mes)
+        self.carregar_mes()
+
+    def carregar_mes(self):
+        """Lê do histórico apenas o mês selecionado"""
+        mes = self.combo_mes.currentData()
+        self.pendencias.clear()
+        if mes:
+            try:
+                self.pendencias.update((p["id"], p) for p in self.arquivo.ler_mes(mes))
+            except Exception as e:
+                self.parent().mostrar_erro(f"Erro ao ler o histórico: {str(e)}")
+        self.modelo.recarregar()
+
+    def ver_detalhes(self, id_pendencia):
+        """Mostra os detalhes de uma pendência do histórico"""
+        pendencia = self.pendencias.get(id_pendencia)
+        if pendencia is not None:
+            DetalhePendenciaDialog(pendencia, self).exec()
+
+
+class CarregamentoThread(QThread):
+    """Carrega as pendências do armazenamento sem travar a janela"""
+
+    carregado = pyqtSignal(object)
+
+    def __init__(self, carregar, parent=None):
+        super().__init__(parent)
+        self.carregar = carregar
+        self.resultado = None
+
+    def run(self):
+        self.resultado = self.carregar()
+        self.carregado.emit(self.resultado)
+
+
 class ChecklistApp(QMainWindow):
+    # Erros da gravação em segundo plano (emitido fora da thread da interface)
+    erro_persistencia = pyqtSignal(str)
+
     def __init__(self):
+        self.tempos_inicializacao = {"inicio": time.perf_counter()}
         super().__init__()
         self.settings = QSettings("ChecklistFibra", "WindowSettings")
         self.pendencias_file = "checklist_pendencias.json"
-        self.data = self.carregar_pendencias()
-        self.pendencias = self.data.get("pendencias", [])
-        self.tecnicos = self.data.get("tecnicos", ["Anderson", "Gallina", "Larazin", "Bruno", "Daniel", "Evandro", "Gilberto"])
-        self.next_id = self.data.get("next_id", 1)  # Contador para IDs únicos
+        # Backend de armazenamento: "journal" (padrão) ou "sqlite".
+        # As alterações são gravadas em lote por uma thread de fundo.
+        self.erro_persistencia.connect(
+            lambda erro: self.mostrar_erro(f"Erro ao salvar pendências: {erro}")
+        )
+        self.store = open_store(
+            self.pendencias_file,
+            backend=self.settings.value("armazenamento/backend", "journal"),
+            write_behind=True,
+            on_error=self.erro_persistencia.emit,
+            registro=PendenciaRecord,
+        )
+        # Pendências finalizadas ficam no histórico mensal, fora do arquivo principal
+        self.arquivo = PendenciaArchive(
+            os.path.splitext(self.pendencias_file)[0] + "_arquivo"
+        )
+        # Os dados são lidos em segundo plano após a primeira pintura
+        # (ver aplicar_dados_carregados); até lá valem os padrões abaixo
+        # Pendências por ID (dict mantém a ordem de criação)
+        self.pendencias = {}
+        self.tecnicos = ["Anderson", "Gallina", "Larazin", "Bruno", "Daniel", "Evandro", "Gilberto"]
+        self.next_id = 1  # Contador para IDs únicos
         self.carregando_tabela = False  # Flag para controlar eventos durante carregamento
         self.pendencia_editando_id = None  # ID da pendência sendo editada
+        # Índice (técnico, observações) normalizados -> pendências em aberto
+        self.indice_abertas = {}
+        self.dados_carregados = False
+        self.carregamento_thread = CarregamentoThread(self.carregar_pendencias, self)
+        self.carregamento_thread.carregado.connect(self.aplicar_dados_carregados)
+        # Aba de pendências montada só quando aberta ou após carregar os dados
+        self.modelo_pendencias = None
         
-        # Configuração do sistema de atualização
+        # Configuração do sistema de atualização (updater/requests só são
+        # importados na primeira verificação, fora do caminho da inicialização)
         self.current_version = "1.4"
-        self.updater = Updater(
-            current_version=self.current_version,
-            version_url="https://raw.githubusercontent.com/DreamerJP/POS-assistencia/refs/heads/main/version.json"
-        )
+        self._updater = None
+        self.update_check_thread = None  # Verificação de atualização em andamento
+        self.download_atualizacao = None  # Download em segundo plano em andamento
+        self.atualizacao_para_instalar = None  # Executável a instalar ao fechar a janela
+
+        # Retoma o download em segundo plano após alguns segundos sem interação
+        self.timer_ociosidade = QTimer(self)
+        self.timer_ociosidade.setSingleShot(True)
+        self.timer_ociosidade.setInterval(5000)
+        self.timer_ociosidade.timeout.connect(self.retomar_download_atualizacao)
+
+        # Download em segundo plano que falhou: nova tentativa silenciosa mais
+        # tarde (depois do limite, fica para a próxima inicialização)
+        self.versao_download_pendente = None
+        self.tentativas_download_atualizacao = 0
+        self.timer_nova_tentativa_download = QTimer(self)
+        self.timer_nova_tentativa_download.setSingleShot(True)
+        self.timer_nova_tentativa_download.setInterval(10 * 60 * 1000)
+        self.timer_nova_tentativa_download.timeout.connect(self.tentar_download_atualizacao_novamente)
         
+        self.tempos_inicializacao["initUI_inicio"] = time.perf_counter()
         self.initUI()
+        self.tempos_inicializacao["initUI_fim"] = time.perf_counter()
         self.load_settings()
+        self.tempos_inicializacao["fim"] = time.perf_counter()
         
         # Verificar atualizações na inicialização (após 2 segundos)
         QTimer.singleShot(2000, self.check_updates_on_startup)
 
+    @property
+    def updater(self):
+        """Atualizador, criado (e importado) no primeiro uso"""
+        if self._updater is None:
+            from updater import Updater
+
+            self._updater = Updater(
+                current_version=self.current_version,
+                version_url="https://raw.githubusercontent.com/DreamerJP/POS-assistencia/refs/heads/main/version.json",
+                # Intervalo mínimo (segundos) entre consultas automáticas à rede
+                check_interval=int(self.settings.value("atualizacao/intervalo_verificacao", 6 * 3600)),
+                # Pasta local/compartilhamento com version.json e executáveis (opcional)
+                mirror=self.settings.value("atualizacao/espelho", "") or None,
+                connect_timeout=float(self.settings.value("atualizacao/timeout_conexao", 10)),
+                read_timeout=float(self.settings.value("atualizacao/timeout_leitura", 30)),
+            )
+        return self._updater
+
+    def paintEvent(self, event):
+        """Marca a primeira pintura da janela para o relatório de inicialização"""
+        super().paintEvent(event)
+        if "primeira_pintura" not in self.tempos_inicializacao:
+            self.tempos_inicializacao["primeira_pintura"] = time.perf_counter()
+            QTimer.singleShot(0, self.registrar_tempo_inicializacao)
+            if not self.dados_carregados and not self.carregamento_thread.isRunning():
+                self.carregamento_thread.start()
+
+    def registrar_tempo_inicializacao(self):
+        """Mostra e registra em startup_timing.log os tempos da inicialização (se ativado)"""
+        t = self.tempos_inicializacao
+
+        def ms(inicio, fim):
+            return (fim - inicio) * 1000
+
+        relatorio = (
+            f"imports={ms(INICIO_IMPORTS, FIM_IMPORTS):.0f}ms "
+            f"init={ms(t['inicio'], t['fim']):.0f}ms "
+            f"initUI={ms(t['initUI_inicio'], t['initUI_fim']):.0f}ms "
+            f"primeira_pintura={ms(INICIO_IMPORTS, t['primeira_pintura']):.0f}ms "
+            f"pendencias={len(self.pendencias)}"
+        )
+        # No executável não há console para ler o print
+        if not getattr(sys, "frozen", False):
+            print(f"[DEBUG] Inicialização: {relatorio}")
+        if not self.settings.value("diagnostico/registrar_inicializacao", False, type=bool):
+            return
+        try:
+            caminho = os.path.join(os.path.dirname(os.path.abspath(self.pendencias_file)), "startup_timing.log")
+            # Rotação simples: mantém o log atual e um anterior (~64 KB cada)
+            if os.path.exists(caminho) and os.path.getsize(caminho) > 64 * 1024:
+                os.replace(caminho, caminho + ".1")
+            with open(caminho, "a", encoding="utf-8") as f:
+                f.write(f"{datetime.now().strftime('%d/%m/%Y %H:%M:%S')} v{self.current_version} {relatorio}\n")
+        except OSError as e:
+            print(f"Erro ao registrar tempo de inicialização: {e}")
+
+    def aplicar_dados_carregados(self, data):
+        """Aplica os dados lidos em segundo plano (técnicos, pendências, índice)"""
+        if self.dados_carregados:
+            return
+        self.dados_carregados = True
+        self.pendencias.update(
+            (pendencia["id"], pendencia) for pendencia in data.get("pendencias", [])
+        )
+        self.tecnicos = data.get("tecnicos", self.tecnicos)
+        self.next_id = data.get("next_id", 1)
+        for pendencia in self.pendencias.values():
+            self.indexar_pendencia(pendencia)
+
+        # Lista de técnicos salva, mantendo a seleção atual
+        tecnico_atual = self.input_nome_tecnico.currentText()
+        self.carregar_tecnicos_dropdown()
+        index = self.input_nome_tecnico.findText(tecnico_atual)
+        if index > 0:
+            self.input_nome_tecnico.setCurrentIndex(index)
+
+        print(f"DEBUG: {len(self.pendencias)} pendências carregadas")
+        # Montar a aba de pendências no próximo momento ocioso
+        QTimer.singleShot(0, self.garantir_aba_pendencias)
+
+    def aguardar_carregamento(self):
+        """Garante que os dados já foram carregados (para ações que dependem deles)"""
+        if self.dados_carregados:
+            return
+        if self.carregamento_thread.isRunning():
+            self.carregamento_thread.wait()
+        data = self.carregamento_thread.resultado
+        if data is None:
+            # Ainda não iniciado (ação antes da primeira pintura): carrega aqui
+            data = self.carregar_pendencias()
+        self.aplicar_dados_carregados(data)
+
+    def garantir_aba_pendencias(self):
+        """Monta a aba de pendências na primeira vez que for necessária"""
+        if self.modelo_pendencias is not None:
+            return
+        self.aguardar_carregamento()
+        self.montar_aba_pendencias(self.tab_pendencias)
+
+    def ao_trocar_aba(self, index):
+        """Monta a aba de pendências ao ser aberta pela primeira vez"""
+        if self.tab_widget.widget(index) is self.tab_pendencias:
+            self.garantir_aba_pendencias()
+
     def carregar_pendencias(self):
-        """Carrega as pendências do arquivo JSON"""
+        """Carrega as pendências do armazenamento configurado"""
         try:
-            if os.path.exists(self.pendencias_file):
-                with open(self.pendencias_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # Se o arquivo tem estrutura antiga (só lista de pendências)
-                    if isinstance(data, list):
-                        return {"pendencias": data, "tecnicos": [], "next_id": 1}
-                    # Se já tem a nova estrutura
-                    return data
+            data = self.store.load()
         except Exception as e:
             print(f"Erro ao carregar pendências: {e}")
-        return {"pendencias": [], "tecnicos": [], "next_id": 1}
+            return {"pendencias": [], "tecnicos": [], "next_id": 1}
+
+        # Formato compacto em memória (convertido de volta ao salvar); o
+        # JournalStore já devolve registros, prontos no cache de inicialização
+        data["pendencias"] = [
+            p if isinstance(p, PendenciaRecord) else PendenciaRecord.from_dict(p)
+            for p in data["pendencias"]
+        ]
+
+        # Finalizadas que ainda estão no arquivo principal (versões anteriores
+        # ou arquivamento interrompido) vão para o histórico
+        finalizadas = [p for p in data["pendencias"] if p["status"] == "Finalizada"]
+        if finalizadas:
+            try:
+                self.arquivo.arquivar([p.to_dict() for p in finalizadas])
+                for pendencia in finalizadas:
+                    self.store.delete(pendencia["id"])
+                data["pendencias"] = [
+                    p for p in data["pendencias"] if p["status"] != "Finalizada"
+                ]
+                print(f"DEBUG: {len(finalizadas)} pendências finalizadas movidas para o histórico")
+            except Exception as e:
+                print(f"Erro ao arquivar pendências finalizadas: {e}")
+        return data
+
+    def salvar_pendencia(self, pendencia):
+        """Registra a criação/alteração de uma pendência no armazenamento"""
+        try:
+            self.store.put(pendencia.to_dict())
+            print(f"DEBUG: Pendência {pendencia['id']} salva com sucesso. Total: {len(self.pendencias)}")
+        except Exception as e:
+            self.mostrar_erro(f"Erro ao salvar pendências: {str(e)}")
 
-    def salvar_pendencias(self):
-        """Salva as pendências no arquivo JSON"""
+    def remover_pendencia_salva(self, pendencia):
+        """Registra a exclusão de uma pendência no armazenamento"""
         try:
-            # Atualizar dados com pendências, técnicos e next_id
-            self.data["pendencias"] = self.pendencias
-            self.data["tecnicos"] = self.tecnicos
-            self.data["next_id"] = self.next_id
-                
-            with open(self.pendencias_file, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-            print(f"DEBUG: Pendências salvas com sucesso. Total: {len(self.pendencias)}")
+            self.store.delete(pendencia["id"])
+            print(f"DEBUG: Pendência {pendencia['id']} excluída. Total: {len(self.pendencias)}")
         except Exception as e:
             self.mostrar_erro(f"Erro ao salvar pendências: {str(e)}")
 
+    def chave_pendencia(self, nome_tecnico, observacoes):
+        """Chave normalizada usada para detectar pendências duplicadas"""
+        return (nome_tecnico.lower(), observacoes.lower())
+
+    def indexar_pendencia(self, pendencia):
+        """Inclui a pendência no índice de pendências em aberto"""
+        if pendencia["status"] != "Pendente":
+            return
+        chave = self.chave_pendencia(
+            pendencia["nome_tecnico"], pendencia["dados"].get("observacoes", "")
+        )
+        self.indice_abertas.setdefault(chave, []).append(pendencia)
+
+    def desindexar_pendencia(self, pendencia):
+        """Remove a pendência do índice (chamar antes de alterá-la)"""
+        chave = self.chave_pendencia(
+            pendencia["nome_tecnico"], pendencia["dados"].get("observacoes", "")
+        )
+        abertas = self.indice_abertas.get(chave, [])
+        for i, aberta in enumerate(abertas):
+            if aberta is pendencia:
+                del abertas[i]
+                break
+        if not abertas:
+            self.indice_abertas.pop(chave, None)
+
+    def buscar_pendencia_aberta(self, nome_tecnico, observacoes):
+        """Retorna a pendência em aberto com o mesmo técnico e observações"""
+        abertas = self.indice_abertas.get(self.chave_pendencia(nome_tecnico, observacoes))
+        return abertas[0] if abertas else None
+
     def load_settings(self):
         """Carrega as configurações salvas da janela"""
         geometry = self.settings.value("geometry")
@@ -342,7 +950,7 @@ class ChecklistApp(QMainWindow):
                 color: #495057;
             }
             
-            QTableWidget {
+            QTableView {
                 gridline-color: #e9ecef;
                 background-color: white;
                 alternate-background-color: #f8f9fa;
@@ -352,12 +960,12 @@ class ChecklistApp(QMainWindow):
                 font-size: 11px;
             }
             
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border: none;
             }
             
-            QTableWidget QHeaderView::section {
+            QTableView QHeaderView::section {
                 background-color: #f8f9fa;
                 padding: 8px;
                 border: 1px solid #dee2e6;
@@ -365,6 +973,40 @@ class ChecklistApp(QMainWindow):
                 font-size: 11px;
                 color: #495057;
             }
+            
+            /* Validação visual: propriedade dinâmica "valid" dos campos */
+            QLineEdit[valid="true"], QComboBox[valid="true"] {
+                border: 2px solid #6c757d;
+            }
+            
+            QLineEdit[valid="false"], QComboBox[valid="false"] {
+                border: 2px solid #dc3545;
+            }
+            
+            QLineEdit[valid="false"]:focus, QComboBox[valid="false"]:focus {
+                border-color: #dc3545;
+            }
+            
+            QGroupBox[valid="true"], QGroupBox[valid="false"] {
+                border: 2px solid #6c757d;
+                border-radius: 6px;
+                margin-top: 10px;
+                padding-top: 10px;
+            }
+            
+            QGroupBox[valid="false"] {
+                border-color: #dc3545;
+            }
+            
+            QGroupBox[valid="true"]::title, QGroupBox[valid="false"]::title {
+                padding: 0 8px 0 8px;
+                color: #6c757d;
+                font-weight: bold;
+            }
+            
+            QGroupBox[valid="false"]::title {
+                color: #dc3545;
+            }
         """
         )
 
@@ -383,9 +1025,10 @@ class ChecklistApp(QMainWindow):
         self.tab_checklist = self.criar_aba_checklist()
         self.tab_widget.addTab(self.tab_checklist, "📋 Check-list")
 
-        # Aba 2: Gerenciar Pendências
-        self.tab_pendencias = self.criar_aba_pendencias()
+        # Aba 2: Gerenciar Pendências (conteúdo montado sob demanda)
+        self.tab_pendencias = QWidget()
         self.tab_widget.addTab(self.tab_pendencias, "⏰ Pendências")
+        self.tab_widget.currentChanged.connect(self.ao_trocar_aba)
 
         main_layout.addWidget(self.tab_widget)
 
@@ -698,98 +1341,22 @@ class ChecklistApp(QMainWindow):
         self.carregar_tecnicos_dropdown()
         
         # Conectar eventos de validação
+        self.configurar_validacao()
         self.conectar_eventos_validacao()
         self.validar_e_atualizar_bordas()
 
         return tab
 
-    def atualizar_borda_campo(self, campo, preenchido):
-        """Atualiza a cor da borda do campo baseado no status de preenchimento"""
-        if preenchido:
-            campo.setStyleSheet(
-                f"""
-                {campo.__class__.__name__} {{
-                    padding: 6px 8px;
-                    border: 2px solid #6c757d;
-                    border-radius: 4px;
-                    font-size: 11px;
-                    background-color: white;
-                    color: #495057;
-                    min-height: 16px;
-                }}
-                {campo.__class__.__name__}:focus {{
-                    border-color: #6c757d;
-                    outline: none;
-                }}
-            """
-            )
-        else:
-            campo.setStyleSheet(
-                f"""
-                {campo.__class__.__name__} {{
-                    padding: 6px 8px;
-                    border: 2px solid #dc3545;
-                    border-radius: 4px;
-                    font-size: 11px;
-                    background-color: white;
-                    color: #495057;
-                    min-height: 16px;
-                }}
-                {campo.__class__.__name__}:focus {{
-                    border-color: #dc3545;
-                    outline: none;
-                }}
-            """
-            )
-
-    def atualizar_borda_groupbox(self, groupbox, preenchido):
-        """Atualiza a cor da borda do groupbox baseado no status de preenchimento"""
-        if preenchido:
-            groupbox.setStyleSheet(
-                f"""
-                QGroupBox {{
-                    font-weight: 600;
-                    font-size: 12px;
-                    color: #495057;
-                    border: 2px solid #6c757d;
-                    border-radius: 6px;
-                    margin-top: 10px;
-                    padding-top: 10px;
-                    background-color: white;
-                }}
-                QGroupBox::title {{
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 8px 0 8px;
-                    color: #6c757d;
-                    background-color: white;
-                    font-weight: bold;
-                }}
-            """
-            )
-        else:
-            groupbox.setStyleSheet(
-                f"""
-                QGroupBox {{
-                    font-weight: 600;
-                    font-size: 12px;
-                    color: #495057;
-                    border: 2px solid #dc3545;
-                    border-radius: 6px;
-                    margin-top: 10px;
-                    padding-top: 10px;
-                    background-color: white;
-                }}
-                QGroupBox::title {{
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 8px 0 8px;
-                    color: #dc3545;
-                    background-color: white;
-                    font-weight: bold;
-                }}
-            """
-            )
+    def atualizar_validade(self, widget, valido):
+        """Marca o widget como válido/inválido, repolindo só se o estado mudou"""
+        # As cores vêm da folha de estilo da janela ([valid="true"/"false"]);
+        # repolir força o Qt a reavaliar os seletores apenas deste widget
+        if widget.property("valid") == valido:
+            return
+        widget.setProperty("valid", valido)
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
+        widget.update()
 
     def carregar_tecnicos_dropdown(self):
         """Carrega os técnicos no dropdown em ordem alfabética"""
@@ -814,6 +1381,7 @@ class ChecklistApp(QMainWindow):
         
         if ok and nome.strip():
             nome = nome.strip()
+            self.aguardar_carregamento()
             if nome not in self.tecnicos:
                 self.tecnicos.append(nome)
                 # Ordenar e salvar
@@ -826,95 +1394,112 @@ class ChecklistApp(QMainWindow):
     def salvar_tecnicos(self):
         """Salva a lista de técnicos no arquivo JSON"""
         try:
-            self.data["tecnicos"] = self.tecnicos
-            with open(self.pendencias_file, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            self.store.set_tecnicos(self.tecnicos)
             print(f"DEBUG: Técnicos salvos com sucesso. Total: {len(self.tecnicos)}")
         except Exception as e:
             self.mostrar_erro(f"Erro ao salvar técnicos: {str(e)}")
 
-    def validar_e_atualizar_bordas(self):
-        """Valida todos os campos e atualiza suas bordas"""
-        # Nome do técnico
-        nome_preenchido = bool(self.input_nome_tecnico.currentText().strip()) and self.input_nome_tecnico.currentIndex() > 0
-        self.atualizar_borda_campo(self.input_nome_tecnico, nome_preenchido)
+    def configurar_validacao(self):
+        """Declara as regras de validação do formulário e suas dependências"""
+        self.validador = ValidadorFormulario(self.atualizar_validade)
+        regra = self.validador.adicionar_regra
 
-        # Checkboxes obrigatórios
-        checkboxes_preenchidos = (
-            self.check_comissao.isChecked()
-            and self.check_ip_mac.isChecked()
-            and self.check_instalacao.isChecked()
-            and self.check_localizacao.isChecked()
-            and self.check_foto_gps.isChecked()
+        def preenchido(campo):
+            return lambda: bool(campo.text().strip())
+
+        def marcado(checkbox):
+            return lambda: checkbox.isChecked()
+
+        # Nome do técnico (verificado à parte no relatório)
+        regra(
+            "tecnico",
+            [self.input_nome_tecnico],
+            lambda: bool(self.input_nome_tecnico.currentText().strip())
+            and self.input_nome_tecnico.currentIndex() > 0,
         )
-        self.atualizar_borda_groupbox(self.group_campos, checkboxes_preenchidos)
 
-        # Comissão: se marcado, valor é obrigatório
-        comissao_preenchida = True
-        if self.check_comissao.isChecked():
-            comissao_preenchida = bool(self.input_comissao.text().strip())
-        self.atualizar_borda_campo(self.input_comissao, comissao_preenchida)
+        # Checkboxes obrigatórios
+        regra("comissao", [self.check_comissao], marcado(self.check_comissao), "1 - Comissão Técnico")
+        regra("ip_mac", [self.check_ip_mac], marcado(self.check_ip_mac), "4 - IP/MAC")
+        regra("instalacao", [self.check_instalacao], marcado(self.check_instalacao), "6 - Instalação")
+        regra("localizacao", [self.check_localizacao], marcado(self.check_localizacao), "7 - Localização")
+        regra("foto_gps", [self.check_foto_gps], marcado(self.check_foto_gps), "8 - Foto da Casa + GPS")
+
+        # Comissão: se marcado, valor é obrigatório (apenas visual)
+        regra(
+            "valor_comissao",
+            [self.check_comissao, self.input_comissao],
+            lambda: not self.check_comissao.isChecked()
+            or bool(self.input_comissao.text().strip()),
+        )
 
         # Comodato
-        comodato_preenchido = self.combo_comodato.currentIndex() > 0
-        self.atualizar_borda_campo(self.combo_comodato, comodato_preenchido)
-        self.atualizar_borda_groupbox(self.group_comodato, comodato_preenchido)
+        regra(
+            "comodato",
+            [self.combo_comodato],
+            lambda: self.combo_comodato.currentIndex() > 0,
+            "2 - Comodato Cliente",
+        )
 
         # Acesso remoto
-        acesso_remoto_preenchido = self.check_acesso_remoto.isChecked() and bool(
-            self.input_senha.text().strip()
-        )
-        self.atualizar_borda_campo(
-            self.input_senha, bool(self.input_senha.text().strip())
-        )
-        self.atualizar_borda_groupbox(self.group_acesso, acesso_remoto_preenchido)
+        regra("acesso_remoto", [self.check_acesso_remoto], marcado(self.check_acesso_remoto), "3 - Acesso Remoto (checkbox)")
+        regra("senha", [self.input_senha], preenchido(self.input_senha), "3 - Senha Router")
 
         # Potência
-        potencia_preenchida = bool(self.input_rx.text().strip()) and bool(
-            self.input_tx.text().strip()
-        )
-        self.atualizar_borda_campo(self.input_rx, bool(self.input_rx.text().strip()))
-        self.atualizar_borda_campo(self.input_tx, bool(self.input_tx.text().strip()))
-        self.atualizar_borda_groupbox(self.group_potencia, potencia_preenchida)
+        regra("rx", [self.input_rx], preenchido(self.input_rx), "5 - Sinal RX")
+        regra("tx", [self.input_tx], preenchido(self.input_tx), "5 - Sinal TX")
 
         # GPS (opcional - apenas visual)
-        gps_preenchido = bool(self.input_nome_arquivo.text().strip()) and bool(
-            self.input_link_gps.text().strip()
-        )
-        self.atualizar_borda_campo(
-            self.input_nome_arquivo, bool(self.input_nome_arquivo.text().strip())
-        )
-        self.atualizar_borda_campo(
-            self.input_link_gps, bool(self.input_link_gps.text().strip())
-        )
+        regra("arquivo_gps", [self.input_nome_arquivo], preenchido(self.input_nome_arquivo))
+        regra("link_gps", [self.input_link_gps], preenchido(self.input_link_gps))
+
+        # Bordas: cada widget reflete o conjunto de regras indicado
+        alvo = self.validador.adicionar_alvo
+        alvo(self.input_nome_tecnico, ["tecnico"])
+        alvo(self.group_campos, ["comissao", "ip_mac", "instalacao", "localizacao", "foto_gps"])
+        alvo(self.input_comissao, ["valor_comissao"])
+        alvo(self.combo_comodato, ["comodato"])
+        alvo(self.group_comodato, ["comodato"])
+        alvo(self.input_senha, ["senha"])
+        alvo(self.group_acesso, ["acesso_remoto", "senha"])
+        alvo(self.input_rx, ["rx"])
+        alvo(self.input_tx, ["tx"])
+        alvo(self.group_potencia, ["rx", "tx"])
+        alvo(self.input_nome_arquivo, ["arquivo_gps"])
+        alvo(self.input_link_gps, ["link_gps"])
+
+    def validar_e_atualizar_bordas(self):
+        """Valida todos os campos e atualiza suas bordas"""
+        self.validador.reavaliar_tudo()
 
     def conectar_eventos_validacao(self):
         """Conecta eventos para validação em tempo real"""
-        # Nome do técnico
-        self.input_nome_tecnico.currentTextChanged.connect(self.validar_e_atualizar_bordas)
-
-        # Checkboxes
-        self.check_comissao.toggled.connect(self.validar_e_atualizar_bordas)
-        self.check_ip_mac.toggled.connect(self.validar_e_atualizar_bordas)
-        self.check_instalacao.toggled.connect(self.validar_e_atualizar_bordas)
-        self.check_localizacao.toggled.connect(self.validar_e_atualizar_bordas)
-        self.check_foto_gps.toggled.connect(self.validar_e_atualizar_bordas)
-        self.check_acesso_remoto.toggled.connect(self.validar_e_atualizar_bordas)
-
-        # Comodato
-        self.combo_comodato.currentIndexChanged.connect(self.validar_e_atualizar_bordas)
-
-        # Campos de texto
-        self.input_senha.textChanged.connect(self.validar_e_atualizar_bordas)
-        self.input_rx.textChanged.connect(self.validar_e_atualizar_bordas)
-        self.input_tx.textChanged.connect(self.validar_e_atualizar_bordas)
-        self.input_nome_arquivo.textChanged.connect(self.validar_e_atualizar_bordas)
-        self.input_link_gps.textChanged.connect(self.validar_e_atualizar_bordas)
-        self.input_comissao.textChanged.connect(self.validar_e_atualizar_bordas)
-
-    def criar_aba_pendencias(self):
-        """Cria a aba de gerenciamento de pendências"""
-        tab = QWidget()
+        sinais = [
+            # Nome do técnico
+            (self.input_nome_tecnico, self.input_nome_tecnico.currentTextChanged),
+            # Checkboxes
+            (self.check_comissao, self.check_comissao.toggled),
+            (self.check_ip_mac, self.check_ip_mac.toggled),
+            (self.check_instalacao, self.check_instalacao.toggled),
+            (self.check_localizacao, self.check_localizacao.toggled),
+            (self.check_foto_gps, self.check_foto_gps.toggled),
+            (self.check_acesso_remoto, self.check_acesso_remoto.toggled),
+            # Comodato
+            (self.combo_comodato, self.combo_comodato.currentIndexChanged),
+            # Campos de texto
+            (self.input_senha, self.input_senha.textChanged),
+            (self.input_rx, self.input_rx.textChanged),
+            (self.input_tx, self.input_tx.textChanged),
+            (self.input_nome_arquivo, self.input_nome_arquivo.textChanged),
+            (self.input_link_gps, self.input_link_gps.textChanged),
+            (self.input_comissao, self.input_comissao.textChanged),
+        ]
+        # Cada alteração reavalia só as regras que dependem do widget
+        for widget, sinal in sinais:
+            sinal.connect(lambda *_, widget=widget: self.validador.reavaliar(widget))
+
+    def montar_aba_pendencias(self, tab):
+        """Monta a aba de gerenciamento de pendências"""
         layout = QVBoxLayout(tab)
         layout.setContentsMargins(15, 15, 15, 15)
         layout.setSpacing(10)
@@ -990,6 +1575,21 @@ class ChecklistApp(QMainWindow):
         """
         )
 
+        self.btn_historico = QPushButton("📚 Histórico")
+        self.btn_historico.clicked.connect(self.mostrar_historico)
+        self.btn_historico.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #6c757d;
+                font-size: 11px;
+                min-width: 80px;
+            }
+            QPushButton:hover {
+                background-color: #5a6268;
+            }
+        """
+        )
+
         self.btn_excluir_pendencia = QPushButton("🗑️ Excluir")
         self.btn_excluir_pendencia.clicked.connect(self.excluir_pendencia_selecionada)
         self.btn_excluir_pendencia.setStyleSheet(
@@ -1009,19 +1609,31 @@ class ChecklistApp(QMainWindow):
         buttons_layout.addWidget(self.btn_carregar_pendencia)
         buttons_layout.addWidget(self.btn_finalizar_pendencia)
         buttons_layout.addWidget(self.btn_excluir_pendencia)
+        buttons_layout.addWidget(self.btn_historico)
         buttons_layout.addStretch()
 
         layout.addWidget(buttons_group)
 
-        # Tabela de pendências mais compacta
-        self.tabela_pendencias = QTableWidget()
-        self.tabela_pendencias.setColumnCount(7)
-        self.tabela_pendencias.setHorizontalHeaderLabels(
-            ["ID", "Técnico", "Observações", "Data/Hora", "Status", "Progresso", "Ações"]
+        # Tabela de pendências mais compacta (model/view: só as linhas visíveis custam)
+        self.modelo_pendencias = PendenciasTableModel(
+            self.pendencias, editar=self.salvar_edicao_pendencia, parent=self
+        )
+        self.tabela_pendencias = QTableView()
+        self.tabela_pendencias.setModel(self.modelo_pendencias)
+
+        # Link "👁️" desenhado pelo delegate, sem widgets por linha
+        self.delegate_detalhes = AcaoDetalhesDelegate(self.tabela_pendencias)
+        self.delegate_detalhes.detalhes_clicados.connect(self.ver_detalhes_pendencia)
+        self.tabela_pendencias.setItemDelegateForColumn(
+            PendenciasTableModel.COLUNA_ACOES, self.delegate_detalhes
         )
+        self.tabela_pendencias.setMouseTracking(True)
+        self.tabela_pendencias.entered.connect(self.atualizar_cursor_tabela)
 
         # Configurar tabela para ser responsiva
         header = self.tabela_pendencias.horizontalHeader()
+        # Ajuste ao conteúdo considera só as linhas visíveis
+        header.setResizeContentsPrecision(0)
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # ID
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # Técnico
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Observações
@@ -1033,7 +1645,7 @@ class ChecklistApp(QMainWindow):
 
         self.tabela_pendencias.setAlternatingRowColors(True)
         self.tabela_pendencias.setSelectionBehavior(
-            QTableWidget.SelectionBehavior.SelectRows
+            QTableView.SelectionBehavior.SelectRows
         )
         self.tabela_pendencias.verticalHeader().setDefaultSectionSize(45)
         # Permitir quebra de linha automática
@@ -1041,14 +1653,9 @@ class ChecklistApp(QMainWindow):
 
         layout.addWidget(self.tabela_pendencias)
 
-        # Conectar evento de edição
-        self.tabela_pendencias.itemChanged.connect(self.salvar_edicao_pendencia)
-        
         # Atualizar lista inicial
         self.atualizar_lista_pendencias()
 
-        return tab
-
     def obter_dados_formulario(self):
         """Coleta todos os dados do formulário atual incluindo observações"""
         return {
@@ -1123,359 +1730,91 @@ class ChecklistApp(QMainWindow):
         # Atualizar bordas após preencher
         self.validar_e_atualizar_bordas()
 
-    def salvar_como_pendencia(self):
-        """Salva o estado atual como pendência"""
-        dados = self.obter_dados_formulario()
-
-        if not dados["nome_tecnico"]:
-            QMessageBox.warning(self, "Aviso", "Por favor, informe o nome do técnico!")
-            return
-
-        # Verificar se já existe uma pendência para este técnico com as mesmas observações
-        for i, pendencia in enumerate(self.pendencias):
-            if (
-                pendencia["nome_tecnico"].lower() == dados["nome_tecnico"].lower()
-                and pendencia["status"] == "Pendente"
-                and pendencia["dados"].get("observacoes", "").lower()
-                == dados["observacoes"].lower()
-            ):
-
-                resposta = QMessageBox.question(
-                    self,
-                    "Pendência Existente",
-                    f"Já existe uma pendência similar para o técnico '{dados['nome_tecnico']}'.\n"
-                    "Deseja atualizar os dados existentes?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                )
-
-                if resposta == QMessageBox.StandardButton.Yes:
-                    # Atualizar pendência existente
-                    self.pendencias[i]["dados"] = dados
-                    self.pendencias[i]["data_hora"] = datetime.now().strftime(
-                        "%d/%m/%Y %H:%M"
-                    )
-                    self.salvar_pendencias()
-                    self.atualizar_lista_pendencias()
-                    QMessageBox.information(
-                        self, "Sucesso", "Pendência atualizada com sucesso!"
-                    )
-                    return
-                else:
-                    return
-
-        # Criar nova pendência
-        nova_pendencia = {
-            "nome_tecnico": dados["nome_tecnico"],
-            "data_hora": datetime.now().strftime("%d/%m/%Y %H:%M"),
-            "status": "Pendente",
-            "dados": dados,
-        }
-
-        self.pendencias.append(nova_pendencia)
-        self.salvar_pendencias()
-        self.atualizar_lista_pendencias()
-
-        QMessageBox.information(
-            self,
-            "Sucesso",
-            f"Pendência salva para o técnico '{dados['nome_tecnico']}'!",
-        )
-
-        # Limpar formulário após salvar
-        self.limpar_campos()
-
     def atualizar_lista_pendencias(self):
-        """Atualiza a tabela de pendências incluindo observações"""
+        """Recarrega a tabela inteira mantendo seleção e posição de rolagem"""
+        # Alterações de uma única pendência não passam por aqui: usam
+        # inserir/atualizar/remover_pendencia do modelo (só a linha afetada)
         self.carregando_tabela = True  # Desabilitar eventos durante carregamento
-        self.tabela_pendencias.setRowCount(len(self.pendencias))
-
-        for i, pendencia in enumerate(self.pendencias):
-            # ID - NÃO editável
-            id_pendencia = pendencia.get("id", "N/A")
-            id_item = QTableWidgetItem(str(id_pendencia))
-            id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.tabela_pendencias.setItem(i, 0, id_item)
-            
-            # Nome do técnico
-            self.tabela_pendencias.setItem(
-                i, 1, QTableWidgetItem(pendencia["nome_tecnico"])
-            )
-
-            # Observações - mostrar mais texto
-            observacoes = pendencia["dados"].get("observacoes", "")
-            if len(observacoes) > 80:
-                observacoes_display = observacoes[:77] + "..."
-            else:
-                observacoes_display = observacoes
-
-            obs_item = QTableWidgetItem(observacoes_display)
-            obs_item.setToolTip(pendencia["dados"].get("observacoes", ""))
-            # Permitir quebra de linha na célula
-            obs_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-            self.tabela_pendencias.setItem(i, 2, obs_item)
-
-            # Data/Hora - NÃO editável
-            data_item = QTableWidgetItem(pendencia["data_hora"])
-            data_item.setFlags(data_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.tabela_pendencias.setItem(i, 3, data_item)
-
-            # Status - NÃO editável
-            status_item = QTableWidgetItem(pendencia["status"])
-            status_item.setFlags(status_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            if pendencia["status"] == "Finalizada":
-                status_item.setBackground(QColor("white"))
-            else:
-                status_item.setBackground(QColor("white"))
-            self.tabela_pendencias.setItem(i, 4, status_item)
-
-            # Progresso (contar campos preenchidos) - NÃO editável
-            dados = pendencia["dados"]
-            total_campos = 11
-            campos_preenchidos = 0
-
-            if dados.get("check_comissao"):
-                campos_preenchidos += 1
-            if dados.get("check_ip_mac"):
-                campos_preenchidos += 1
-            if dados.get("check_instalacao"):
-                campos_preenchidos += 1
-            if dados.get("check_localizacao"):
-                campos_preenchidos += 1
-            if dados.get("check_foto_gps"):
-                campos_preenchidos += 1
-            if dados.get("check_acesso_remoto"):
-                campos_preenchidos += 1
-            if dados.get("input_senha"):
-                campos_preenchidos += 1
-            if dados.get("input_rx"):
-                campos_preenchidos += 1
-            if dados.get("input_tx"):
-                campos_preenchidos += 1
-            if dados.get("input_nome_arquivo"):
-                campos_preenchidos += 1
-            if dados.get("input_link_gps"):
-                campos_preenchidos += 1
-
-            progresso = f"{campos_preenchidos}/{total_campos}"
-            progresso_item = QTableWidgetItem(progresso)
-            progresso_item.setFlags(progresso_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.tabela_pendencias.setItem(i, 5, progresso_item)
-
-            # Link clicável minimalista
-            link_detalhes = QLabel("👁️")
-            link_detalhes.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            link_detalhes.setCursor(Qt.CursorShape.PointingHandCursor)
-            link_detalhes.setToolTip("Ver detalhes")
-            link_detalhes.setStyleSheet(
-                """
-                QLabel {
-                    color: #6c757d;
-                    font-size: 14px;
-                    padding: 2px;
-                    background-color: transparent;
-                    border: none;
-                }
-                QLabel:hover {
-                    color: #495057;
-                    background-color: #f8f9fa;
-                    border-radius: 3px;
-                }
-            """
-            )
-            
-            # Conectar o clique do label
-            link_detalhes.mousePressEvent = lambda event, idx=i: self.ver_detalhes_pendencia(idx)
-
-            # Container simples
-            container_widget = QWidget()
-            container_layout = QHBoxLayout(container_widget)
-            container_layout.setContentsMargins(0, 0, 0, 0)
-            container_layout.addWidget(link_detalhes)
-            container_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        id_selecionado = self.modelo_pendencias.id_da_linha(
+            self.tabela_pendencias.currentIndex().row()
+        )
+        rolagem = self.tabela_pendencias.verticalScrollBar().value()
 
-            self.tabela_pendencias.setCellWidget(i, 6, container_widget)
+        self.modelo_pendencias.recarregar()
 
+        if id_selecionado is not None:
+            self.selecionar_pendencia(id_selecionado)
+        self.tabela_pendencias.verticalScrollBar().setValue(rolagem)
         self.carregando_tabela = False  # Reabilitar eventos após carregamento
 
-    def ver_detalhes_pendencia(self, index):
+    def atualizar_cursor_tabela(self, index):
+        """Mostra o cursor de link sobre a coluna Ações"""
+        if index.column() == PendenciasTableModel.COLUNA_ACOES:
+            self.tabela_pendencias.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        else:
+            self.tabela_pendencias.viewport().unsetCursor()
+
+    def ver_detalhes_pendencia(self, id_pendencia):
         """Mostra os detalhes de uma pendência"""
-        if 0 <= index < len(self.pendencias):
-            dialog = DetalhePendenciaDialog(self.pendencias[index], self)
+        pendencia = self.pendencias.get(id_pendencia)
+        if pendencia is not None:
+            dialog = DetalhePendenciaDialog(pendencia, self)
             dialog.exec()
 
-    def salvar_edicao_pendencia(self, item):
+    def pendencia_da_linha(self, row):
+        """Retorna a pendência exibida em uma linha da tabela (ou None)"""
+        return self.pendencias.get(self.modelo_pendencias.id_da_linha(row))
+
+    def selecionar_pendencia(self, id_pendencia):
+        """Seleciona na tabela a linha de uma pendência"""
+        row = self.modelo_pendencias.linha_do_id(id_pendencia)
+        if row is not None:
+            self.tabela_pendencias.selectRow(row)
+
+    def salvar_edicao_pendencia(self, pendencia, col, valor):
         """Salva as alterações feitas diretamente na tabela com confirmação"""
-        if not item:
-            return
-            
+        # Retorna True se a alteração foi confirmada (False reverte a célula)
         # Ignorar eventos durante carregamento da tabela
         if self.carregando_tabela:
-            return
-            
-        row = item.row()
-        col = item.column()
-        
-        print(f"DEBUG: itemChanged - Row: {row}, Col: {col}, Text: {item.text()}")
-        
-        if row >= len(self.pendencias):
-            return
-            
+            return False
+
+        print(f"DEBUG: setData - ID: {pendencia['id']}, Col: {col}, Text: {valor}")
+
         # Verificar se é uma coluna editável
-        if col == 1:  # Coluna Técnico
-            print(f"DEBUG: Editando coluna Técnico - Row: {row}")
-            novo_nome = item.text().strip()
-            if novo_nome:
-                resposta = self.mostrar_pergunta(
-                    "Confirmar Alteração",
-                    f"Deseja alterar o nome do técnico para '{novo_nome}'?"
-                )
-                if resposta == QMessageBox.StandardButton.Yes:
-                    print(f"DEBUG: Salvando nome do técnico: {novo_nome}")
-                    self.pendencias[row]["nome_tecnico"] = novo_nome
-                    self.salvar_pendencias()
-                else:
-                    # Reverter a alteração
-                    item.setText(self.pendencias[row]["nome_tecnico"])
-                    
-        elif col == 2:  # Coluna Observações
-            print(f"DEBUG: Editando coluna Observações - Row: {row}")
-            nova_obs = item.text().strip()
+        if col == PendenciasTableModel.COLUNA_TECNICO:
+            print(f"DEBUG: Editando coluna Técnico - ID: {pendencia['id']}")
+            novo_nome = str(valor).strip()
+            if not novo_nome:
+                return False
             resposta = self.mostrar_pergunta(
                 "Confirmar Alteração",
-                f"Deseja salvar as alterações nas observações?"
-            )
-            if resposta == QMessageBox.StandardButton.Yes:
-                self.pendencias[row]["dados"]["observacoes"] = nova_obs
-                self.salvar_pendencias()
-            else:
-                # Reverter a alteração
-                obs_original = self.pendencias[row]["dados"].get("observacoes", "")
-                if len(obs_original) > 80:
-                    obs_display = obs_original[:77] + "..."
-                else:
-                    obs_display = obs_original
-                item.setText(obs_display)
-
-    def carregar_pendencia_selecionada(self):
-        """Carrega uma pendência selecionada no formulário"""
-        row = self.tabela_pendencias.currentRow()
-        if row < 0:
-            QMessageBox.information(
-                self, "Aviso", "Selecione uma pendência para carregar!"
-            )
-            return
-
-        if row >= len(self.pendencias):
-            QMessageBox.warning(self, "Erro", "Pendência inválida selecionada!")
-            return
-
-        pendencia = self.pendencias[row]
-
-        # Verificar se há dados não salvos no formulário atual
-        dados_atuais = self.obter_dados_formulario()
-        tem_dados = any(
-            [
-                dados_atuais["nome_tecnico"],
-                dados_atuais["observacoes"],
-                dados_atuais["check_comissao"],
-                dados_atuais.get("input_comissao", ""),
-                dados_atuais["check_ip_mac"],
-                dados_atuais["check_instalacao"],
-                dados_atuais["check_localizacao"],
-                dados_atuais["check_foto_gps"],
-                dados_atuais["check_acesso_remoto"],
-                dados_atuais["input_senha"],
-                dados_atuais["input_rx"],
-                dados_atuais["input_tx"],
-                dados_atuais["input_nome_arquivo"],
-                dados_atuais["input_link_gps"],
-            ]
-        )
-
-        if tem_dados:
-            resposta = QMessageBox.question(
-                self,
-                "Dados não salvos",
-                "Há dados preenchidos no formulário atual que serão perdidos.\n"
-                "Deseja continuar?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                f"Deseja alterar o nome do técnico para '{novo_nome}'?"
             )
-
-            if resposta == QMessageBox.StandardButton.No:
-                return
-
-        # Carregar dados da pendência
-        self.preencher_formulario(pendencia["dados"])
-        # Limpar relatório antigo após carregar dados
-        self.resultado_text.clear()
-        # Mudar para a aba do check-list
-        self.tab_widget.setCurrentIndex(0)
-
-    def excluir_pendencia_selecionada(self):
-        """Exclui uma pendência selecionada"""
-        row = self.tabela_pendencias.currentRow()
-        if row < 0:
-            QMessageBox.information(
-                self, "Aviso", "Selecione uma pendência para excluir!"
-            )
-            return
-
-        if row >= len(self.pendencias):
-            QMessageBox.warning(self, "Erro", "Pendência inválida selecionada!")
-            return
-
-        pendencia = self.pendencias[row]
-
-        resposta = QMessageBox.question(
-            self,
-            "Confirmar Exclusão",
-            f"Tem certeza que deseja excluir a pendência do técnico '{pendencia['nome_tecnico']}'?\n"
-            "Esta ação não pode ser desfeita!",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-        )
-
-        if resposta == QMessageBox.StandardButton.Yes:
-            del self.pendencias[row]
-            self.salvar_pendencias()
-            self.atualizar_lista_pendencias()
-            QMessageBox.information(self, "Sucesso", "Pendência excluída com sucesso!")
-
-    def finalizar_pendencia_selecionada(self):
-        """Marca uma pendência como finalizada"""
-        row = self.tabela_pendencias.currentRow()
-        if row < 0:
-            QMessageBox.information(
-                self, "Aviso", "Selecione uma pendência para finalizar!"
+            if resposta != QMessageBox.StandardButton.Yes:
+                return False
+            print(f"DEBUG: Salvando nome do técnico: {novo_nome}")
+            self.desindexar_pendencia(pendencia)
+            pendencia["nome_tecnico"] = novo_nome
+            self.indexar_pendencia(pendencia)
+            self.salvar_pendencia(pendencia)
+            return True
+
+        if col == PendenciasTableModel.COLUNA_OBSERVACOES:
+            print(f"DEBUG: Editando coluna Observações - ID: {pendencia['id']}")
+            nova_obs = str(valor).strip()
+            resposta = self.mostrar_pergunta(
+                "Confirmar Alteração",
+                f"Deseja salvar as alterações nas observações?"
             )
-            return
-
-        if row >= len(self.pendencias):
-            QMessageBox.warning(self, "Erro", "Pendência inválida selecionada!")
-            return
+            if resposta != QMessageBox.StandardButton.Yes:
+                return False
+            self.desindexar_pendencia(pendencia)
+            pendencia["dados"]["observacoes"] = nova_obs
+            self.indexar_pendencia(pendencia)
+            self.salvar_pendencia(pendencia)
+            return True
 
-        pendencia = self.pendencias[row]
-
-        if pendencia["status"] == "Finalizada":
-            QMessageBox.information(self, "Aviso", "Esta pendência já está finalizada!")
-            return
-
-        resposta = QMessageBox.question(
-            self,
-            "Confirmar Finalização",
-            f"Marcar a pendência do técnico '{pendencia['nome_tecnico']}' como finalizada?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-        )
-
-        if resposta == QMessageBox.StandardButton.Yes:
-            self.pendencias[row]["status"] = "Finalizada"
-            self.pendencias[row]["data_finalizacao"] = datetime.now().strftime(
-                "%d/%m/%Y %H:%M"
-            )
-            self.salvar_pendencias()
-            self.atualizar_lista_pendencias()
-            QMessageBox.information(
-                self, "Sucesso", "Pendência marcada como finalizada!"
-            )
+        return False
 
     def gerar_arquivo_gps(self):
         nome_arquivo = self.input_nome_arquivo.text().strip()
@@ -1703,43 +2042,14 @@ class ChecklistApp(QMainWindow):
         return msg.exec()
 
     def gerar_relatorio(self):
+        self.aguardar_carregamento()
         # Verificar se o nome do técnico está preenchido
-        if not self.input_nome_tecnico.currentText().strip() or self.input_nome_tecnico.currentIndex() <= 0:
+        if not self.validador.valido("tecnico"):
             self.mostrar_aviso("Por favor, selecione o nome do técnico!")
             return
 
-        # Verificar se todos os campos obrigatórios estão preenchidos
-        campos_vazios = []
-
-        # Verificar checkboxes obrigatórios
-        if not self.check_comissao.isChecked():
-            campos_vazios.append("1 - Comissão Técnico")
-        if not self.check_ip_mac.isChecked():
-            campos_vazios.append("4 - IP/MAC")
-        if not self.check_instalacao.isChecked():
-            campos_vazios.append("6 - Instalação")
-        if not self.check_localizacao.isChecked():
-            campos_vazios.append("7 - Localização")
-        if not self.check_foto_gps.isChecked():
-            campos_vazios.append("8 - Foto da Casa + GPS")
-
-        # Verificar comodato
-        if self.combo_comodato.currentIndex() <= 0:
-            campos_vazios.append("2 - Comodato Cliente")
-
-        # Verificar acesso remoto
-        if not self.check_acesso_remoto.isChecked():
-            campos_vazios.append("3 - Acesso Remoto (checkbox)")
-
-        # Verificar senha
-        if not self.input_senha.text().strip():
-            campos_vazios.append("3 - Senha Router")
-
-        # Verificar potências
-        if not self.input_rx.text().strip():
-            campos_vazios.append("5 - Sinal RX")
-        if not self.input_tx.text().strip():
-            campos_vazios.append("5 - Sinal TX")
+        # Campos obrigatórios faltando (mantidos em tempo real pelo validador)
+        campos_vazios = self.validador.campos_faltando()
 
         # Se houver campos vazios, mostrar aviso
         if campos_vazios:
@@ -1749,10 +2059,6 @@ class ChecklistApp(QMainWindow):
             self.mostrar_aviso(mensagem)
             return
 
-        # Se Comissão está marcada, valor é obrigatório
-        if self.check_comissao.isChecked() and not self.input_comissao.text().strip():
-            campos_vazios.append("1 - Valor Comissão")
-
         # Gerar relatório apenas se todos os campos estiverem preenchidos
         resultado = []
 
@@ -1800,25 +2106,20 @@ class ChecklistApp(QMainWindow):
         nome_tecnico = self.input_nome_tecnico.currentText().strip()
         obs_atuais = self.input_observacoes.toPlainText().strip()
 
-        for i, pendencia in enumerate(self.pendencias):
-            if (
-                pendencia["nome_tecnico"].lower() == nome_tecnico.lower()
-                and pendencia["status"] == "Pendente"
-                and pendencia["dados"].get("observacoes", "").lower()
-                == obs_atuais.lower()
-            ):
-
-                resposta = self.mostrar_pergunta(
-                    "Pendência Encontrada",
-                    f"Foi encontrada uma pendência para o técnico '{nome_tecnico}'.\n"
-                    "Deseja removê-la da lista de pendências?",
-                )
+        pendencia = self.buscar_pendencia_aberta(nome_tecnico, obs_atuais)
+        if pendencia is not None:
+            resposta = self.mostrar_pergunta(
+                "Pendência Encontrada",
+                f"Foi encontrada uma pendência para o técnico '{nome_tecnico}'.\n"
+                "Deseja removê-la da lista de pendências?",
+            )
 
-                if resposta == QMessageBox.StandardButton.Yes:
-                    del self.pendencias[i]
-                    self.salvar_pendencias()
-                    self.atualizar_lista_pendencias()
-                break
+            if resposta == QMessageBox.StandardButton.Yes:
+                self.desindexar_pendencia(pendencia)
+                del self.pendencias[pendencia["id"]]
+                self.remover_pendencia_salva(pendencia)
+                if self.modelo_pendencias is not None:  # aba já montada
+                    self.modelo_pendencias.remover_pendencia(pendencia["id"])
 
         # Sucesso silencioso ao gerar relatório
 
@@ -1867,6 +2168,7 @@ class ChecklistApp(QMainWindow):
 
     def salvar_como_pendencia(self):
         """Salva o estado atual como pendência"""
+        self.aguardar_carregamento()
         dados = self.obter_dados_formulario()
 
         if not dados["nome_tecnico"]:
@@ -1875,66 +2177,61 @@ class ChecklistApp(QMainWindow):
 
         # Se estamos editando uma pendência existente
         if self.pendencia_editando_id is not None:
-            # Encontrar e atualizar a pendência existente
-            for i, pendencia in enumerate(self.pendencias):
-                if pendencia.get("id") == self.pendencia_editando_id:
-                    self.pendencias[i]["dados"] = dados
-                    self.pendencias[i]["data_hora"] = datetime.now().strftime(
-                        "%d/%m/%Y %H:%M"
-                    )
-                    self.salvar_pendencias()
-                    self.atualizar_lista_pendencias()
-                    
-                    # Limpar ID de edição
-                    self.pendencia_editando_id = None
-                    
-                    # Limpar formulário após salvar
-                    self.limpar_campos()
-                    return
+            pendencia = self.pendencias.get(self.pendencia_editando_id)
+            if pendencia is not None:
+                self.desindexar_pendencia(pendencia)
+                pendencia["dados"] = dados
+                pendencia["data_hora"] = datetime.now().strftime("%d/%m/%Y %H:%M")
+                self.indexar_pendencia(pendencia)
+                self.salvar_pendencia(pendencia)
+                if self.modelo_pendencias is not None:  # aba já montada
+                    self.modelo_pendencias.atualizar_pendencia(pendencia["id"])
+
+                # Limpar ID de edição
+                self.pendencia_editando_id = None
+
+                # Limpar formulário após salvar
+                self.limpar_campos()
+                return
 
         # Verificar se já existe uma pendência para este técnico com as mesmas observações
-        for i, pendencia in enumerate(self.pendencias):
-            if (
-                pendencia["nome_tecnico"].lower() == dados["nome_tecnico"].lower()
-                and pendencia["status"] == "Pendente"
-                and pendencia["dados"].get("observacoes", "").lower()
-                == dados["observacoes"].lower()
-            ):
-
-                resposta = self.mostrar_pergunta(
-                    "Pendência Existente",
-                    f"Já existe uma pendência similar para o técnico '{dados['nome_tecnico']}'.\n"
-                    "Deseja atualizar os dados existentes?",
-                )
+        pendencia = self.buscar_pendencia_aberta(dados["nome_tecnico"], dados["observacoes"])
+        if pendencia is not None:
+            resposta = self.mostrar_pergunta(
+                "Pendência Existente",
+                f"Já existe uma pendência similar para o técnico '{dados['nome_tecnico']}'.\n"
+                "Deseja atualizar os dados existentes?",
+            )
 
-                if resposta == QMessageBox.StandardButton.Yes:
-                    # Atualizar pendência existente
-                    self.pendencias[i]["dados"] = dados
-                    self.pendencias[i]["data_hora"] = datetime.now().strftime(
-                        "%d/%m/%Y %H:%M"
-                    )
-                    self.salvar_pendencias()
-                    self.atualizar_lista_pendencias()
-                    
-                    # Limpar formulário após salvar
-                    self.limpar_campos()
-                    return
-                else:
-                    return
+            if resposta == QMessageBox.StandardButton.Yes:
+                # Atualizar pendência existente
+                self.desindexar_pendencia(pendencia)
+                pendencia["dados"] = dados
+                pendencia["data_hora"] = datetime.now().strftime("%d/%m/%Y %H:%M")
+                self.indexar_pendencia(pendencia)
+                self.salvar_pendencia(pendencia)
+                if self.modelo_pendencias is not None:  # aba já montada
+                    self.modelo_pendencias.atualizar_pendencia(pendencia["id"])
+
+                # Limpar formulário após salvar
+                self.limpar_campos()
+            return
 
         # Criar nova pendência com ID único
-        nova_pendencia = {
+        nova_pendencia = PendenciaRecord.from_dict({
             "id": self.next_id,
             "nome_tecnico": dados["nome_tecnico"],
             "data_hora": datetime.now().strftime("%d/%m/%Y %H:%M"),
             "status": "Pendente",
             "dados": dados,
-        }
+        })
 
-        self.pendencias.append(nova_pendencia)
+        self.pendencias[nova_pendencia["id"]] = nova_pendencia
+        self.indexar_pendencia(nova_pendencia)
         self.next_id += 1  # Incrementar ID para próxima pendência
-        self.salvar_pendencias()
-        self.atualizar_lista_pendencias()
+        self.salvar_pendencia(nova_pendencia)
+        if self.modelo_pendencias is not None:  # aba já montada
+            self.modelo_pendencias.inserir_pendencia(nova_pendencia["id"])
 
         # Sucesso silencioso ao salvar pendência
 
@@ -1943,17 +2240,16 @@ class ChecklistApp(QMainWindow):
 
     def carregar_pendencia_selecionada(self):
         """Carrega uma pendência selecionada no formulário"""
-        row = self.tabela_pendencias.currentRow()
+        row = self.tabela_pendencias.currentIndex().row()
         if row < 0:
             self.mostrar_aviso("Selecione uma pendência para carregar!")
             return
 
-        if row >= len(self.pendencias):
+        pendencia = self.pendencia_da_linha(row)
+        if pendencia is None:
             self.mostrar_erro("Pendência inválida selecionada!")
             return
 
-        pendencia = self.pendencias[row]
-
         # Verificar se há dados não salvos no formulário atual
         dados_atuais = self.obter_dados_formulario()
         tem_dados = any(
@@ -1999,17 +2295,16 @@ class ChecklistApp(QMainWindow):
 
     def excluir_pendencia_selecionada(self):
         """Exclui uma pendência selecionada"""
-        row = self.tabela_pendencias.currentRow()
+        row = self.tabela_pendencias.currentIndex().row()
         if row < 0:
             self.mostrar_aviso("Selecione uma pendência para excluir!")
             return
 
-        if row >= len(self.pendencias):
+        pendencia = self.pendencia_da_linha(row)
+        if pendencia is None:
             self.mostrar_erro("Pendência inválida selecionada!")
             return
 
-        pendencia = self.pendencias[row]
-
         resposta = self.mostrar_pergunta(
             "Confirmar Exclusão",
             f"Tem certeza que deseja excluir a pendência do técnico '{pendencia['nome_tecnico']}'?\n"
@@ -2017,23 +2312,23 @@ class ChecklistApp(QMainWindow):
         )
 
         if resposta == QMessageBox.StandardButton.Yes:
-            del self.pendencias[row]
-            self.salvar_pendencias()
-            self.atualizar_lista_pendencias()
+            self.desindexar_pendencia(pendencia)
+            del self.pendencias[pendencia["id"]]
+            self.remover_pendencia_salva(pendencia)
+            self.modelo_pendencias.remover_pendencia(pendencia["id"])
 
     def finalizar_pendencia_selecionada(self):
         """Marca uma pendência como finalizada"""
-        row = self.tabela_pendencias.currentRow()
+        row = self.tabela_pendencias.currentIndex().row()
         if row < 0:
             self.mostrar_aviso("Selecione uma pendência para finalizar!")
             return
 
-        if row >= len(self.pendencias):
+        pendencia = self.pendencia_da_linha(row)
+        if pendencia is None:
             self.mostrar_erro("Pendência inválida selecionada!")
             return
 
-        pendencia = self.pendencias[row]
-
         if pendencia["status"] == "Finalizada":
             self.mostrar_aviso("Esta pendência já está finalizada!")
             return
@@ -2044,12 +2339,31 @@ class ChecklistApp(QMainWindow):
         )
 
         if resposta == QMessageBox.StandardButton.Yes:
-            self.pendencias[row]["status"] = "Finalizada"
-            self.pendencias[row]["data_finalizacao"] = datetime.now().strftime(
-                "%d/%m/%Y %H:%M"
-            )
-            self.salvar_pendencias()
-            self.atualizar_lista_pendencias()
+            self.desindexar_pendencia(pendencia)
+            pendencia["status"] = "Finalizada"
+            pendencia["data_finalizacao"] = datetime.now().strftime("%d/%m/%Y %H:%M")
+            self.salvar_pendencia(pendencia)
+            self.arquivar_pendencia(pendencia)
+
+    def arquivar_pendencia(self, pendencia):
+        """Move uma pendência finalizada para o histórico"""
+        try:
+            # Gravar no histórico antes de remover do arquivo principal
+            self.arquivo.arquivar([pendencia.to_dict()])
+        except Exception as e:
+            # Continua no arquivo principal e é arquivada na próxima inicialização
+            self.modelo_pendencias.atualizar_pendencia(pendencia["id"])
+            self.mostrar_erro(f"Erro ao arquivar pendência: {str(e)}")
+            return
+
+        del self.pendencias[pendencia["id"]]
+        self.remover_pendencia_salva(pendencia)
+        self.modelo_pendencias.remover_pendencia(pendencia["id"])
+
+    def mostrar_historico(self):
+        """Abre o histórico de pendências finalizadas"""
+        dialog = HistoricoDialog(self.arquivo, self)
+        dialog.exec()
 
     def create_menu_bar(self):
         """Cria a barra de menus com opção de atualização"""
@@ -2086,26 +2400,160 @@ class ChecklistApp(QMainWindow):
 
     def check_updates_on_startup(self):
         """Verifica atualizações automaticamente na inicialização"""
-        try:
-            version_info = self.updater.check_for_updates()
-            if version_info:
-                self.prompt_update(version_info)
-        except Exception as e:
-            print(f"Erro na verificação automática: {e}")
+        self.iniciar_verificacao_atualizacoes(
+            on_failed=lambda erro: print(f"Erro na verificação automática: {erro}")
+        )
 
     def manual_update_check(self):
         """Verificação manual de atualizações (para menu)"""
-        try:
-            version_info = self.updater.check_for_updates()
-            if version_info:
-                self.prompt_update(version_info)
-            else:
-                pass  # Sucesso silencioso quando já está atualizado
-        except Exception as e:
-            self.mostrar_erro(f"Erro ao verificar atualizações: {e}")
+        # Sucesso silencioso quando já está atualizado
+        self.iniciar_verificacao_atualizacoes(
+            on_failed=lambda erro: self.mostrar_erro(f"Erro ao verificar atualizações: {erro}"),
+            force=True,
+        )
 
-    def prompt_update(self, version_info):
-        """Pergunta ao usuário se deseja atualizar"""
+    def iniciar_verificacao_atualizacoes(self, on_failed, force=False):
+        """Consulta atualizações em uma thread, sem travar a janela"""
+        if self.update_check_thread is not None and self.update_check_thread.isRunning():
+            return
+
+        from updater import UpdateCheckThread
+
+        thread = UpdateCheckThread(self.updater, force=force, parent=self)
+        thread.update_available.connect(self.atualizacao_disponivel)
+        thread.check_failed.connect(on_failed)
+        self.update_check_thread = thread
+        thread.start()
+
+    def cancelar_verificacao_atualizacoes(self):
+        """Cancela a verificação em andamento (ao fechar a janela)"""
+        thread = self.update_check_thread
+        if thread is None or not thread.isRunning():
+            return
+        thread.cancel()
+        # A requisição pode estar bloqueada no socket até o timeout: a thread
+        # é daemon e o resultado é descartado, então o fechamento não espera
+        if self._updater is not None:
+            self._updater.close()
+
+    def atualizacao_disponivel(self, version_info):
+        """Baixa a nova versão em segundo plano ou pergunta direto, conforme a configuração"""
+        segundo_plano = self.settings.value("atualizacao/segundo_plano", True, type=bool)
+        if segundo_plano and self.download_atualizacao is None:
+            self.baixar_atualizacao_em_segundo_plano(version_info)
+        else:
+            # Verificação manual durante o download: segue com a janela de progresso
+            self.prompt_update(version_info)
+
+    def baixar_atualizacao_em_segundo_plano(self, version_info):
+        """Baixa a atualização com prioridade baixa, pausando enquanto o usuário trabalha"""
+        from updater import UpdateDownloader
+
+        limite_kbps = int(self.settings.value("atualizacao/limite_banda_kbps", 512))
+        downloader = UpdateDownloader(
+            self.updater,
+            version_info["download_url"],
+            expected_sha256=version_info.get("sha256"),
+            expected_size=version_info.get("size"),
+            patch_info=self.updater.find_patch(version_info),
+            max_rate=limite_kbps * 1024 if limite_kbps > 0 else None,
+            priority=QThread.Priority.LowestPriority,
+            version=version_info["version"],
+            parent=self,
+        )
+        downloader.completed.connect(
+            lambda caminho: self.download_atualizacao_concluido(version_info, caminho)
+        )
+        downloader.failed.connect(
+            lambda erro: self.download_atualizacao_falhou(version_info, erro)
+        )
+        self.download_atualizacao = downloader
+
+        # Atividade do usuário em qualquer janela pausa o download
+        QApplication.instance().installEventFilter(self)
+        print(f"DEBUG: Baixando versão {version_info['version']} em segundo plano")
+        downloader.start()
+
+    def eventFilter(self, obj, event):
+        """Pausa o download em segundo plano enquanto há teclado/mouse em uso"""
+        if event.type() in (
+            QEvent.Type.KeyPress,
+            QEvent.Type.MouseButtonPress,
+            QEvent.Type.Wheel,
+        ):
+            if self.download_atualizacao is not None:
+                if not self.timer_ociosidade.isActive():
+                    self.download_atualizacao.pause()
+                self.timer_ociosidade.start()
+        return super().eventFilter(obj, event)
+
+    def retomar_download_atualizacao(self):
+        """Retoma o download em segundo plano quando o usuário fica ocioso"""
+        if self.download_atualizacao is not None:
+            self.download_atualizacao.resume()
+
+    def finalizar_download_atualizacao(self):
+        """Encerra o acompanhamento do download em segundo plano"""
+        QApplication.instance().removeEventFilter(self)
+        self.timer_ociosidade.stop()
+        self.download_atualizacao = None
+
+    def cancelar_download_atualizacao(self):
+        """Cancela o download em segundo plano (o parcial fica para retomar depois)"""
+        downloader = self.download_atualizacao
+        if downloader is None:
+            return
+        downloader.cancel()
+        downloader.wait(1000)
+        self.finalizar_download_atualizacao()
+
+    def download_atualizacao_concluido(self, version_info, caminho):
+        """Oferece reiniciar para atualizar com a nova versão já baixada"""
+        self.finalizar_download_atualizacao()
+        self.versao_download_pendente = None
+        self.tentativas_download_atualizacao = 0
+        message = self.formatar_mensagem_atualizacao(
+            version_info,
+            "Nova versão baixada e pronta para instalar!",
+            "Reiniciar agora para atualizar?",
+        )
+        resposta = self.mostrar_pergunta("Atualização Pronta", message)
+        if resposta == QMessageBox.StandardButton.Yes:
+            self.instalar_atualizacao_ao_fechar(caminho)
+
+    def instalar_atualizacao_ao_fechar(self, caminho):
+        """Fecha a janela pelo fluxo normal e instala a atualização no closeEvent"""
+        # closeEvent confere o formulário e grava o pendente antes da troca
+        self.atualizacao_para_instalar = caminho
+        if not self.close():
+            # Fechamento cancelado pelo usuário: a atualização fica para depois
+            self.atualizacao_para_instalar = None
+
+    def download_atualizacao_falhou(self, version_info, erro):
+        """Agenda nova tentativa silenciosa se o download em segundo plano falhar"""
+        print(f"DEBUG: Download em segundo plano falhou: {erro}")
+        self.finalizar_download_atualizacao()
+        # Sem janela modal: o usuário não pediu nada, e o parcial fica no cache
+        if self.tentativas_download_atualizacao >= 3:
+            print("DEBUG: Nova tentativa do download fica para a próxima inicialização")
+            self.versao_download_pendente = None
+            return
+        self.tentativas_download_atualizacao += 1
+        self.versao_download_pendente = version_info
+        self.timer_nova_tentativa_download.start()
+
+    def tentar_download_atualizacao_novamente(self):
+        """Retoma o download em segundo plano que falhou (pausa de novo se o usuário estiver ativo)"""
+        version_info = self.versao_download_pendente
+        self.versao_download_pendente = None
+        if version_info is None or self.download_atualizacao is not None:
+            return
+        print(f"DEBUG: Nova tentativa do download em segundo plano "
+              f"({self.tentativas_download_atualizacao}/3)")
+        self.baixar_atualizacao_em_segundo_plano(version_info)
+
+    def formatar_mensagem_atualizacao(self, version_info, cabecalho, pergunta):
+        """Monta a mensagem de nova versão com o changelog"""
         # Formatar changelog
         changelog_text = ""
         if "changelog" in version_info:
@@ -2122,7 +2570,7 @@ class ChecklistApp(QMainWindow):
         
         # Construir mensagem com changelog
         if changelog_text:
-            message = f"""Nova versão disponível!
+            return f"""{cabecalho}
 
 Versão atual: {self.current_version}
 Nova versão: {version_info['version']}
@@ -2130,14 +2578,19 @@ Nova versão: {version_info['version']}
 Changelog:
 {changelog_text}
 
-Deseja atualizar agora?"""
-        else:
-            message = f"""Nova versão disponível!
+{pergunta}"""
+        return f"""{cabecalho}
 
 Versão atual: {self.current_version}
 Nova versão: {version_info['version']}
 
-Deseja atualizar agora?"""
+{pergunta}"""
+
+    def prompt_update(self, version_info):
+        """Pergunta ao usuário se deseja atualizar"""
+        message = self.formatar_mensagem_atualizacao(
+            version_info, "Nova versão disponível!", "Deseja atualizar agora?"
+        )
         
         resposta = self.mostrar_pergunta(
             "Atualização Disponível",
@@ -2145,7 +2598,22 @@ Deseja atualizar agora?"""
         )
         
         if resposta == QMessageBox.StandardButton.Yes:
-            self.updater.download_and_install(version_info["download_url"], self)
+            # Não disputar o mesmo arquivo parcial com o download em segundo plano
+            self.cancelar_download_atualizacao()
+            self.timer_nova_tentativa_download.stop()
+            self.versao_download_pendente = None
+            self.updater.download_and_install(
+                version_info["download_url"],
+                self,
+                expected_sha256=version_info.get("sha256"),
+                expected_size=version_info.get("size"),
+                patch_info=self.updater.find_patch(version_info),
+                version=version_info["version"],
+                # Fora da janela de progresso, para fechar pelo fluxo normal
+                on_downloaded=lambda caminho: QTimer.singleShot(
+                    0, lambda: self.instalar_atualizacao_ao_fechar(caminho)
+                ),
+            )
 
     def show_about(self):
         """Mostra informações sobre o aplicativo"""
@@ -2280,6 +2748,27 @@ Deseja atualizar agora?"""
                     return
 
         self.save_settings()
+        self.aguardar_carregamento()
+        # Gravar o que ainda estiver na fila antes de compactar e sair
+        try:
+            self.store.flush()
+        except Exception as e:
+            self.mostrar_erro(f"Erro ao salvar pendências: {str(e)}")
+        # Compactar o journal para deixar o JSON atualizado ao sair
+        try:
+            self.store.compact(wait=True)
+        except Exception as e:
+            print(f"Erro ao compactar pendências: {e}")
+        try:
+            self.store.close()
+        except Exception as e:
+            print(f"Erro ao fechar armazenamento: {e}")
+        # Só depois de salvar: nada da atualização pode atrasar a gravação
+        self.cancelar_download_atualizacao()
+        self.cancelar_verificacao_atualizacoes()
+        if self.atualizacao_para_instalar is not None:
+            # Tudo gravado e fechado: iniciar a troca (o script espera o processo sair)
+            self.updater.install_downloaded(self.atualizacao_para_instalar)
         event.accept()
 
 
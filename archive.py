@@ -0,0 +1,353 @@
+import os
+import json
+import lzma
+import mmap
+import zlib
+import struct
+from datetime import datetime
+
+
+EXTENSAO = ".pda"
+
+MAGIC_INICIO = b"PDARQ001"
+MAGIC_FIM = b"PDAIDX01"
+# Rodapé fixo no fim do arquivo: posição, tamanho e CRC32 do índice + magic
+RODAPE = struct.Struct("<QII8s")
+REGISTROS_POR_BLOCO = 128
+
+
+class ArchiveError(Exception):
+    """Arquivo de histórico corrompido ou em formato desconhecido"""
+
+
+def _dump_compacto(obj):
+    """Serializa um objeto em JSON compacto (uma linha, sem espaços extras)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _data_pendencia(pendencia):
+    """Retorna a data de finalização (ou criação) da pendência, ou None"""
+    for campo in ("data_finalizacao", "data_hora"):
+        try:
+            return datetime.strptime(pendencia.get(campo), "%d/%m/%Y %H:%M")
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _chave_data(data):
+    """Converte uma data em inteiro AAAAMMDDhhmm (ordenável, sem fuso horário)"""
+    return int(data.strftime("%Y%m%d%H%M"))
+
+
+def _mes_da_pendencia(pendencia):
+    """Retorna o mês ("AAAA-MM") em que a pendência foi finalizada"""
+    data = _data_pendencia(pendencia) or datetime.now()
+    return data.strftime("%Y-%m")
+
+
+def _compactar(dados, compressao):
+    if compressao == "lzma":
+        return lzma.compress(dados, preset=6)
+    return zlib.compress(dados, 6)
+
+
+def _descompactar(dados, compressao):
+    if compressao == "lzma":
+        return lzma.decompress(dados)
+    if compressao == "zlib":
+        return zlib.decompress(dados)
+    raise ArchiveError(f"Compressão desconhecida: {compressao}")
+
+
+def _entrada_indice(registros, offset, dados, compressao):
+    """Monta a entrada do índice de um bloco a partir dos seus registros"""
+    ids = [p["id"] for p in registros]
+    datas = [_chave_data(d) for d in map(_data_pendencia, registros) if d is not None]
+    return {
+        "offset": offset,
+        "tamanho": len(dados),
+        "crc": zlib.crc32(dados),
+        "compressao": compressao,
+        "n": len(registros),
+        "id_min": min(ids),
+        "id_max": max(ids),
+        "data_min": min(datas) if datas else None,
+        "data_max": max(datas) if datas else None,
+        "tecnicos": sorted({p.get("nome_tecnico", "") for p in registros}),
+    }
+
+
+def gravar_blocos(caminho, registros, compressao="zlib", registros_por_bloco=REGISTROS_POR_BLOCO):
+    """
+    Acrescenta registros a um arquivo de blocos (criado se não existir).
+
+    O arquivo é regravado em um temporário e trocado com os.replace, então
+    uma queda no meio mantém a versão anterior íntegra. Blocos completos são
+    copiados sem descompactar; só o último bloco incompleto é refeito junto
+    com os registros novos.
+
+    Args:
+        caminho (str): Arquivo de blocos.
+        registros (list): Registros (dict com "id") a acrescentar.
+        compressao (str): "zlib" (padrão) ou "lzma".
+        registros_por_bloco (int): Máximo de registros por bloco.
+    """
+    temp_path = caminho + ".tmp"
+    with BlockFile(caminho) as antigo:
+        blocos = list(antigo.blocos)
+        pendentes = []
+        if blocos and blocos[-1]["n"] < registros_por_bloco:
+            pendentes = antigo.ler_bloco(blocos.pop())
+        pendentes.extend(registros)
+
+        indice = []
+        with open(temp_path, "wb") as f:
+            f.write(MAGIC_INICIO)
+            for entrada in blocos:
+                indice.append(dict(entrada, offset=f.tell()))
+                f.write(antigo.dados_bloco(entrada))
+            for i in range(0, len(pendentes), registros_por_bloco):
+                lote = pendentes[i:i + registros_por_bloco]
+                texto = "".join(_dump_compacto(p) + "\n" for p in lote)
+                dados = _compactar(texto.encode("utf-8"), compressao)
+                indice.append(_entrada_indice(lote, f.tell(), dados, compressao))
+                f.write(dados)
+
+            dados_indice = zlib.compress(_dump_compacto({"versao": 1, "blocos": indice}).encode("utf-8"))
+            offset_indice = f.tell()
+            f.write(dados_indice)
+            f.write(RODAPE.pack(offset_indice, len(dados_indice), zlib.crc32(dados_indice), MAGIC_FIM))
+            f.flush()
+            os.fsync(f.fileno())
+    # Só depois de fechar o mapeamento do arquivo antigo (exigência do Windows)
+    os.replace(temp_path, caminho)
+
+
+class BlockFile:
+    """
+    Leitura de um arquivo de histórico em blocos compactados.
+
+    Layout: MAGIC_INICIO, blocos (linhas JSON compactadas com zlib ou lzma),
+    índice (JSON compactado) e RODAPE. O índice guarda, por bloco, a faixa
+    de IDs, a faixa de datas e os técnicos, então uma busca só descompacta
+    os blocos que podem conter o resultado. O arquivo é lido via mmap.
+
+    Uso:
+        with BlockFile(caminho) as arquivo:
+            registros = list(arquivo.buscar(tecnico="Bruno"))
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.blocos = []
+        self._arquivo = None
+        self._mapa = None
+
+    def __enter__(self):
+        try:
+            self._arquivo = open(self.caminho, "rb")
+        except FileNotFoundError:
+            return self
+        try:
+            if os.fstat(self._arquivo.fileno()).st_size:
+                self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+                self.blocos = self._ler_indice()
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Libera o mapeamento e o arquivo"""
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def _ler_indice(self):
+        mapa = self._mapa
+        if len(mapa) < len(MAGIC_INICIO) + RODAPE.size or mapa[:len(MAGIC_INICIO)] != MAGIC_INICIO:
+            raise ArchiveError(f"Formato de histórico desconhecido: {self.caminho}")
+        offset, tamanho, crc, magic = RODAPE.unpack(mapa[len(mapa) - RODAPE.size:])
+        dados = mapa[offset:offset + tamanho]
+        if magic != MAGIC_FIM or len(dados) != tamanho or zlib.crc32(dados) != crc:
+            raise ArchiveError(f"Índice do histórico corrompido: {self.caminho}")
+        return json.loads(zlib.decompress(dados))["blocos"]
+
+    def dados_bloco(self, entrada):
+        """
+        Retorna os bytes compactados de um bloco, conferindo o CRC.
+
+        Raises:
+            ArchiveError: Se o bloco estiver corrompido.
+        """
+        dados = self._mapa[entrada["offset"]:entrada["offset"] + entrada["tamanho"]]
+        if zlib.crc32(dados) != entrada["crc"]:
+            raise ArchiveError(f"Bloco corrompido em {self.caminho} (offset {entrada['offset']})")
+        return dados
+
+    def ler_bloco(self, entrada):
+        """
+        Descompacta um bloco.
+
+        Returns:
+            list: Registros do bloco, na ordem em que foram gravados.
+        """
+        texto = _descompactar(self.dados_bloco(entrada), entrada["compressao"]).decode("utf-8")
+        return [json.loads(linha) for linha in texto.split("\n") if linha]
+
+    def registros(self):
+        """Percorre todos os registros do arquivo"""
+        for entrada in self.blocos:
+            yield from self.ler_bloco(entrada)
+
+    def buscar(self, id_pendencia=None, tecnico=None, inicio=None, fim=None):
+        """
+        Percorre os registros que atendem a todos os filtros informados.
+
+        Args:
+            id_pendencia (int): ID exato.
+            tecnico (str): Nome do técnico (exato).
+            inicio (datetime): Data mínima de finalização.
+            fim (datetime): Data máxima de finalização.
+        """
+        chave_inicio = _chave_data(inicio) if inicio is not None else None
+        chave_fim = _chave_data(fim) if fim is not None else None
+
+        for entrada in self.blocos:
+            # Descartar o bloco só pelo índice, sem descompactar
+            if id_pendencia is not None and not entrada["id_min"] <= id_pendencia <= entrada["id_max"]:
+                continue
+            if tecnico is not None and tecnico not in entrada["tecnicos"]:
+                continue
+            if chave_inicio is not None or chave_fim is not None:
+                if entrada["data_max"] is None:
+                    continue
+                if chave_inicio is not None and entrada["data_max"] < chave_inicio:
+                    continue
+                if chave_fim is not None and entrada["data_min"] > chave_fim:
+                    continue
+
+            for pendencia in self.ler_bloco(entrada):
+                if id_pendencia is not None and pendencia["id"] != id_pendencia:
+                    continue
+                if tecnico is not None and pendencia.get("nome_tecnico", "") != tecnico:
+                    continue
+                if chave_inicio is not None or chave_fim is not None:
+                    data = _data_pendencia(pendencia)
+                    if data is None:
+                        continue
+                    if chave_inicio is not None and _chave_data(data) < chave_inicio:
+                        continue
+                    if chave_fim is not None and _chave_data(data) > chave_fim:
+                        continue
+                yield pendencia
+
+
+class PendenciaArchive:
+    """
+    Histórico de pendências finalizadas, separado do arquivo principal.
+
+    Cada mês tem um arquivo de blocos compactados (AAAA-MM.pda, ver
+    BlockFile). Nada é lido até o histórico ser consultado, e uma busca
+    por ID, técnico ou período descompacta apenas os blocos candidatos.
+    """
+
+    def __init__(self, pasta, compressao="zlib"):
+        """
+        Args:
+            pasta (str): Pasta dos arquivos mensais (criada ao arquivar).
+            compressao (str): Compressão dos blocos novos: "zlib" ou "lzma".
+        """
+        self.pasta = pasta
+        self.compressao = compressao
+
+    def arquivar(self, pendencias):
+        """
+        Acrescenta pendências finalizadas aos arquivos dos seus meses.
+
+        Os dados são gravados em disco (fsync) antes do retorno, para que a
+        pendência só seja removida do arquivo principal depois de arquivada.
+
+        Args:
+            pendencias (list): Pendências (dict) a arquivar.
+        """
+        por_mes = {}
+        for pendencia in pendencias:
+            por_mes.setdefault(_mes_da_pendencia(pendencia), []).append(pendencia)
+        if not por_mes:
+            return
+
+        os.makedirs(self.pasta, exist_ok=True)
+        for mes, registros in por_mes.items():
+            gravar_blocos(self._caminho(mes), registros, compressao=self.compressao)
+
+    def meses(self):
+        """
+        Lista os meses com pendências arquivadas (sem abrir os arquivos).
+
+        Returns:
+            list: Meses no formato "AAAA-MM", do mais recente ao mais antigo.
+        """
+        try:
+            nomes = os.listdir(self.pasta)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            (nome[: -len(EXTENSAO)] for nome in nomes if nome.endswith(EXTENSAO)),
+            reverse=True,
+        )
+
+    def ler_mes(self, mes):
+        """
+        Lê as pendências arquivadas de um mês.
+
+        Args:
+            mes (str): Mês no formato "AAAA-MM".
+
+        Returns:
+            list: Pendências ordenadas por ID (a última versão de cada uma).
+        """
+        with BlockFile(self._caminho(mes)) as arquivo:
+            return self._sem_repetidas(arquivo.registros())
+
+    def buscar(self, id_pendencia=None, tecnico=None, inicio=None, fim=None):
+        """
+        Busca pendências arquivadas, abrindo só os meses do período.
+
+        Args:
+            id_pendencia (int): ID exato.
+            tecnico (str): Nome do técnico (exato).
+            inicio (datetime): Data mínima de finalização.
+            fim (datetime): Data máxima de finalização.
+
+        Returns:
+            list: Pendências encontradas, ordenadas por ID.
+        """
+        mes_inicio = inicio.strftime("%Y-%m") if inicio is not None else None
+        mes_fim = fim.strftime("%Y-%m") if fim is not None else None
+        encontradas = []
+        for mes in self.meses():
+            if (mes_inicio and mes < mes_inicio) or (mes_fim and mes > mes_fim):
+                continue
+            with BlockFile(self._caminho(mes)) as arquivo:
+                encontradas.extend(arquivo.buscar(id_pendencia, tecnico, inicio, fim))
+        return self._sem_repetidas(encontradas)
+
+    def _sem_repetidas(self, registros):
+        # Um arquivamento repetido (queda antes de remover do arquivo
+        # principal) gera duas cópias: vale a última
+        por_id = {}
+        for pendencia in registros:
+            por_id[pendencia["id"]] = pendencia
+        return [por_id[id_pendencia] for id_pendencia in sorted(por_id)]
+
+    def _caminho(self, mes):
+        return os.path.join(self.pasta, mes + EXTENSAO)
+
@@ -0,0 +1,150 @@
+"""
+Benchmark local: histórico em blocos compactados x JSON simples.
+
+Gera pendências finalizadas sintéticas (mesma estrutura de
+obter_dados_formulario), grava em JSON e no formato de blocos (zlib e lzma)
+e compara tamanho em disco e latência de consultas por ID, técnico e
+período. Também confere que o formato de blocos devolve os registros
+exatamente iguais aos originais.
+
+Uso:
+    python benchmarks/archive_benchmark.py
+    python benchmarks/archive_benchmark.py --registros 50000 --repeticoes 50
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from archive import BlockFile, gravar_blocos  # noqa: E402
+
+TECNICOS = ["Anderson", "Gallina", "Larazin", "Bruno", "Daniel", "Evandro", "Gilberto"]
+COMODATOS = ["", "ONU", "ONU + Roteador", "Roteador"]
+PALAVRAS = "cliente sem sinal trocar conector caixa poste rota fibra onu roteador senha ajustar".split()
+
+
+def gerar_pendencias(quantidade, seed=42):
+    """Gera pendências finalizadas sintéticas, em ordem de ID e de data"""
+    rnd = random.Random(seed)
+    inicio = datetime(2026, 1, 1, 8, 0)
+    pendencias = []
+    for i in range(1, quantidade + 1):
+        criada = inicio + timedelta(minutes=i * 3)
+        finalizada = criada + timedelta(hours=rnd.randrange(1, 72))
+        tecnico = rnd.choice(TECNICOS)
+        dados = {
+            "nome_tecnico": tecnico,
+            "observacoes": " ".join(rnd.choice(PALAVRAS) for _ in range(rnd.randrange(0, 15))),
+            "check_comissao": rnd.random() < 0.8,
+            "input_comissao": rnd.choice(["", "120"]),
+            "check_ip_mac": rnd.random() < 0.8,
+            "check_instalacao": rnd.random() < 0.8,
+            "check_localizacao": rnd.random() < 0.8,
+            "check_foto_gps": rnd.random() < 0.8,
+            "check_acesso_remoto": rnd.random() < 0.8,
+            "combo_comodato": rnd.choice(COMODATOS),
+            "input_senha": f"senha{rnd.randrange(10000)}",
+            "input_rx": f"-{rnd.randrange(15, 28)}.{rnd.randrange(10)}",
+            "input_tx": f"{rnd.randrange(1, 4)}.{rnd.randrange(10)}",
+            "input_nome_arquivo": f"Cliente {i}",
+            "input_link_gps": f"https://maps.google.com/?q=-27.{rnd.randrange(10**6)},-52.{rnd.randrange(10**6)}",
+        }
+        pendencias.append({
+            "id": i,
+            "nome_tecnico": tecnico,
+            "data_hora": criada.strftime("%d/%m/%Y %H:%M"),
+            "status": "Finalizada",
+            "dados": dados,
+            "data_finalizacao": finalizada.strftime("%d/%m/%Y %H:%M"),
+        })
+    return pendencias
+
+
+def medir(funcao, repeticoes):
+    """Retorna a mediana do tempo de execução (ms) e o último resultado"""
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return tempos[len(tempos) // 2], resultado
+
+
+def data_finalizacao(pendencia):
+    return datetime.strptime(pendencia["data_finalizacao"], "%d/%m/%Y %H:%M")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=20000, help="Quantidade de pendências")
+    parser.add_argument("--repeticoes", type=int, default=20, help="Repetições de cada consulta")
+    args = parser.parse_args()
+
+    pendencias = gerar_pendencias(args.registros)
+    alvo = pendencias[len(pendencias) // 2]
+    inicio_periodo = data_finalizacao(alvo)
+    fim_periodo = inicio_periodo + timedelta(days=1)
+
+    def filtrar(registros, id_pendencia=None, tecnico=None, inicio=None, fim=None):
+        return [
+            p for p in registros
+            if (id_pendencia is None or p["id"] == id_pendencia)
+            and (tecnico is None or p["nome_tecnico"] == tecnico)
+            and (inicio is None or inicio <= data_finalizacao(p))
+            and (fim is None or data_finalizacao(p) <= fim)
+        ]
+
+    consultas = [
+        ("ID", {"id_pendencia": alvo["id"]}),
+        ("Técnico + 1 dia", {"tecnico": alvo["nome_tecnico"], "inicio": inicio_periodo, "fim": fim_periodo}),
+        ("Técnico (todos)", {"tecnico": alvo["nome_tecnico"]}),
+    ]
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_json = os.path.join(pasta, "historico.json")
+        with open(caminho_json, "w", encoding="utf-8") as f:
+            json.dump(pendencias, f, ensure_ascii=False, indent=2)
+
+        def consultar_json(**filtros):
+            with open(caminho_json, encoding="utf-8") as f:
+                return filtrar(json.load(f), **filtros)
+
+        formatos = [("JSON", caminho_json, consultar_json)]
+        for compressao in ("zlib", "lzma"):
+            caminho = os.path.join(pasta, f"historico_{compressao}.pda")
+            gravar_blocos(caminho, pendencias, compressao=compressao)
+
+            with BlockFile(caminho) as arquivo:
+                if list(arquivo.registros()) != pendencias:
+                    raise SystemExit(f"Falha na ida e volta ({compressao})")
+
+            def consultar_blocos(caminho=caminho, **filtros):
+                with BlockFile(caminho) as arquivo:
+                    return list(arquivo.buscar(**filtros))
+
+            formatos.append((f"Blocos {compressao}", caminho, consultar_blocos))
+
+        print(f"{len(pendencias):,} pendências; mediana de {args.repeticoes} repetições por consulta")
+        print("Ida e volta dos registros no formato de blocos: OK (zlib e lzma)")
+        print(f"{'Formato':<14}{'Tamanho':>14}" + "".join(f"{nome:>20}" for nome, _ in consultas))
+        for nome, caminho, consultar in formatos:
+            colunas = []
+            for _, filtros in consultas:
+                tempo, resultado = medir(lambda: consultar(**filtros), args.repeticoes)
+                esperado = filtrar(pendencias, **filtros)
+                if resultado != esperado:
+                    raise SystemExit(f"Resultado divergente em {nome}: {filtros}")
+                colunas.append(f"{tempo:>15.2f} ms ")
+            tamanho = os.path.getsize(caminho)
+            print(f"{nome:<14}{tamanho:>14,}" + "".join(f"{c:>20}" for c in colunas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark local: atualização completa x patch binário.
+
+Sobe um servidor HTTP local com limite de banda, e mede bytes transferidos
+e tempo até ter o novo executável verificado (download + patch + SHA-256).
+
+Uso:
+    python benchmarks/delta_update_benchmark.py
+    python benchmarks/delta_update_benchmark.py --old POS_1.3.exe --new POS_1.4.exe --banda 2
+"""
+import os
+import sys
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from binpatch import make_patch, apply_patch  # noqa: E402
+
+
+def gerar_versoes(tamanho_mb, seed=42):
+    """Gera um "executável" sintético e uma nova versão com pequenas alterações"""
+    rnd = random.Random(seed)
+    # Metade aleatória, metade repetitiva (parecido com seções de código/recursos)
+    metade = tamanho_mb * 1024 * 1024 // 2
+    old = bytearray(rnd.randbytes(metade))
+    old += bytes(rnd.choice(b"\x00\x90ABCDEF") for _ in range(4096)) * (metade // 4096)
+
+    new = bytearray(old)
+    for _ in range(300):
+        i = rnd.randrange(len(new) - 8)
+        new[i:i + 4] = rnd.randbytes(4)
+    for _ in range(10):
+        i = rnd.randrange(len(new))
+        new[i:i] = rnd.randbytes(rnd.randrange(100, 20000))
+    return bytes(old), bytes(new)
+
+
+class HandlerLimitado(SimpleHTTPRequestHandler):
+    """Serve arquivos limitando a banda (bytes por segundo)"""
+    banda = None
+
+    def log_message(self, *args):
+        pass
+
+    def copyfile(self, source, outputfile):
+        bloco = 64 * 1024
+        inicio = time.monotonic()
+        enviados = 0
+        while True:
+            dados = source.read(bloco)
+            if not dados:
+                break
+            outputfile.write(dados)
+            enviados += len(dados)
+            if self.banda:
+                atraso = enviados / self.banda - (time.monotonic() - inicio)
+                if atraso > 0:
+                    time.sleep(atraso)
+
+
+def baixar(url):
+    """Baixa uma URL inteira, retornando o conteúdo"""
+    with urllib.request.urlopen(url) as resposta:
+        return resposta.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--old", help="Executável da versão atual")
+    parser.add_argument("--new", help="Executável da nova versão")
+    parser.add_argument("--tamanho", type=int, default=16, help="Tamanho do executável sintético (MB)")
+    parser.add_argument("--banda", type=float, default=4.0, help="Banda simulada em MB/s (0 = sem limite)")
+    args = parser.parse_args()
+
+    if args.old and args.new:
+        with open(args.old, "rb") as f:
+            old = f.read()
+        with open(args.new, "rb") as f:
+            new = f.read()
+    else:
+        old, new = gerar_versoes(args.tamanho)
+
+    inicio = time.perf_counter()
+    patch = make_patch(old, new)
+    tempo_geracao = time.perf_counter() - inicio
+    sha_new = hashlib.sha256(new).hexdigest()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        with open(os.path.join(pasta, "POS.exe"), "wb") as f:
+            f.write(new)
+        with open(os.path.join(pasta, "POS.patch"), "wb") as f:
+            f.write(patch)
+
+        HandlerLimitado.banda = args.banda * 1024 * 1024 if args.banda else None
+        servidor = ThreadingHTTPServer(("127.0.0.1", 0), partial(HandlerLimitado, directory=pasta))
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+        try:
+            inicio = time.perf_counter()
+            completo = baixar(base + "/POS.exe")
+            assert hashlib.sha256(completo).hexdigest() == sha_new
+            tempo_completo = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            recebido = baixar(base + "/POS.patch")
+            meio = time.perf_counter()
+            resultado = apply_patch(old, recebido)
+            assert hashlib.sha256(resultado).hexdigest() == sha_new
+            tempo_patch = time.perf_counter() - inicio
+            tempo_aplicacao = time.perf_counter() - meio
+        finally:
+            servidor.shutdown()
+
+    banda = f"{args.banda:g} MB/s" if args.banda else "sem limite"
+    print(f"Executável: {len(old):,} -> {len(new):,} bytes (banda simulada: {banda})")
+    print(f"Patch gerado em {tempo_geracao:.2f}s")
+    print(f"{'Modo':<10}{'Bytes transferidos':>22}{'Tempo até atualizar':>22}")
+    print(f"{'Completo':<10}{len(completo):>22,}{tempo_completo:>21.2f}s")
+    print(f"{'Patch':<10}{len(recebido):>22,}{tempo_patch:>21.2f}s  (aplicação + verificação: {tempo_aplicacao:.2f}s)")
+    print(f"Economia: {100 - 100 * len(recebido) / len(completo):.1f}% dos bytes, "
+          f"{tempo_completo / tempo_patch:.1f}x mais rápido")
+
+
+if __name__ == "__main__":
+    main()
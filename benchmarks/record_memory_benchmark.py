@@ -0,0 +1,129 @@
+"""
+Benchmark local: memória por pendência, dicts aninhados x PendenciaRecord.
+
+Gera pendências sintéticas (mesma estrutura de obter_dados_formulario),
+serializa em JSON e mede com tracemalloc a memória ocupada depois de ler o
+JSON como dicts (formato atual) e depois de converter para PendenciaRecord.
+Também confere que a conversão de volta para dict é exata e mede a carga
+na inicialização pelo JournalStore (JSON, cache com dicts convertidos
+depois e cache já no formato compacto).
+
+Uso:
+    python benchmarks/record_memory_benchmark.py
+    python benchmarks/record_memory_benchmark.py --registros 200000
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from records import PendenciaRecord  # noqa: E402
+from storage import JournalStore  # noqa: E402
+from archive_benchmark import gerar_pendencias  # noqa: E402
+
+
+def medir_memoria(criar):
+    """Retorna (bytes alocados que continuam em uso, tempo em s, objeto criado)"""
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    objeto = criar()
+    tempo = time.perf_counter() - inicio
+    gc.collect()
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memoria, tempo, objeto
+
+
+def medir_carga(funcao, repeticoes=5):
+    """Retorna o menor tempo (ms) de várias execuções"""
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tempos)
+
+
+def medir_inicializacao(texto):
+    """Tempos de carga das pendências na inicialização (ms)"""
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "pendencias.json")
+        with open(caminho, "w", encoding="utf-8") as f:
+            f.write(texto)
+        registros = [
+            json.dumps(p, ensure_ascii=False, separators=(",", ":"))
+            for p in json.loads(texto)["pendencias"]
+        ]
+
+        def carregar(registro):
+            # Só leitura: sem gravar cache/journal durante a medição
+            return JournalStore(caminho, registro=registro).load(somente_leitura=True)["pendencias"]
+
+        tempos = [
+            ("json.loads (só o parse)", medir_carga(lambda: json.loads(texto))),
+            ("JSON, sem cache", medir_carga(lambda: carregar(None))),
+        ]
+        for nome, funcao, registro in (
+            ("cache dicts", lambda: carregar(None), None),
+            ("cache dicts + from_dict", lambda: [PendenciaRecord.from_dict(p) for p in carregar(None)], None),
+            ("cache compacto", lambda: carregar(PendenciaRecord), PendenciaRecord),
+        ):
+            store = JournalStore(caminho, registro=registro)
+            store._gravar_cache(store._chave_cache(), registros, [], 1)
+            tempos.append((nome, medir_carga(funcao)))
+        return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=100000, help="Quantidade de pendências")
+    args = parser.parse_args()
+
+    pendencias = gerar_pendencias(args.registros)
+    for i, pendencia in enumerate(pendencias):
+        # Metade em aberto, como no arquivo principal antes do histórico
+        if i % 2:
+            pendencia["status"] = "Pendente"
+            del pendencia["data_finalizacao"]
+    texto = json.dumps({"pendencias": pendencias}, ensure_ascii=False)
+    del pendencias
+
+    def como_dicts():
+        return json.loads(texto)["pendencias"]
+
+    def como_registros():
+        return [PendenciaRecord.from_dict(p) for p in json.loads(texto)["pendencias"]]
+
+    memoria_dicts, tempo_dicts, dicts = medir_memoria(como_dicts)
+    memoria_registros, tempo_registros, registros = medir_memoria(como_registros)
+
+    # Comparar o JSON gerado: confere também a ordem das chaves
+    if json.dumps([registro.to_dict() for registro in registros], ensure_ascii=False) != json.dumps(dicts, ensure_ascii=False):
+        raise SystemExit("Falha na conversão de volta para dict")
+
+    n = args.registros
+    print(f"{n:,} pendências ({len(texto.encode('utf-8')) / n:.0f} bytes de JSON por pendência)")
+    print("Conversão PendenciaRecord -> dict: idêntica ao JSON original")
+    print(f"{'Formato':<18}{'Memória total':>16}{'Por pendência':>16}{'Carga':>10}")
+    print(f"{'dicts aninhados':<18}{memoria_dicts / 2**20:>13.1f} MB{memoria_dicts / n:>14.0f} B"
+          f"{tempo_dicts:>9.2f}s")
+    print(f"{'PendenciaRecord':<18}{memoria_registros / 2**20:>13.1f} MB{memoria_registros / n:>14.0f} B"
+          f"{tempo_registros:>9.2f}s")
+    print(f"Redução: {100 - 100 * memoria_registros / memoria_dicts:.0f}% "
+          f"({(memoria_dicts - memoria_registros) / n:.0f} bytes por pendência)")
+    print("(tempos de carga medidos com tracemalloc ativo, que os torna mais lentos)")
+
+    print("Carga na inicialização (JournalStore, menor de 5):")
+    for nome, tempo in medir_inicializacao(texto):
+        print(f"  {nome:<26}{tempo:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
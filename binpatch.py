@@ -0,0 +1,251 @@
+import os
+import bz2
+import hashlib
+
+
+BSDIFF_MAGIC = b"BSDIFF40"
+HEADER_SIZE = 32
+
+
+class PatchError(Exception):
+    """Patch inválido ou incompatível com o executável de origem"""
+
+
+def _offtin(buf, pos):
+    """Lê um inteiro de 8 bytes no formato do bsdiff (sinal-magnitude, little-endian)"""
+    valor = int.from_bytes(buf[pos:pos + 8], "little")
+    if valor & (1 << 63):
+        return -(valor & ((1 << 63) - 1))
+    return valor
+
+
+def _offtout(valor):
+    """Codifica um inteiro no formato de 8 bytes do bsdiff"""
+    if valor < 0:
+        return ((-valor) | (1 << 63)).to_bytes(8, "little")
+    return valor.to_bytes(8, "little")
+
+
+def _add_bytes(a, b):
+    """
+    Soma dois blocos byte a byte (módulo 256) sem laço em Python.
+
+    Os blocos viram inteiros grandes e a soma é feita sem propagar o
+    "vai um" entre bytes: os 7 bits baixos são somados direto e o bit alto
+    é corrigido com XOR.
+    """
+    if b.count(0) == len(b):
+        return bytes(a)
+    n = len(a)
+    baixo = int.from_bytes(b"\x7f" * n, "little")
+    alto = int.from_bytes(b"\x80" * n, "little")
+    ia = int.from_bytes(a, "little")
+    ib = int.from_bytes(b, "little")
+    soma = ((ia & baixo) + (ib & baixo)) ^ ((ia ^ ib) & alto)
+    return soma.to_bytes(n, "little")
+
+
+def _sub_bytes(a, b):
+    """Subtrai dois blocos byte a byte (módulo 256), inverso de _add_bytes"""
+    if a == b:
+        return bytes(len(a))
+    n = len(a)
+    baixo = int.from_bytes(b"\x7f" * n, "little")
+    alto = int.from_bytes(b"\x80" * n, "little")
+    ia = int.from_bytes(a, "little")
+    ib = int.from_bytes(b, "little")
+    diferenca = ((ia | alto) - (ib & baixo)) ^ ((ia ^ ib ^ alto) & alto)
+    return diferenca.to_bytes(n, "little")
+
+
+def apply_patch(old, patch):
+    """
+    Aplica um patch no formato BSDIFF40 (bsdiff/bspatch).
+
+    Args:
+        old (bytes): Conteúdo do arquivo de origem.
+        patch (bytes): Conteúdo do patch.
+
+    Returns:
+        bytes: Conteúdo do arquivo novo.
+
+    Raises:
+        PatchError: Patch corrompido ou fora dos limites do arquivo de origem.
+    """
+    if len(patch) < HEADER_SIZE or patch[:8] != BSDIFF_MAGIC:
+        raise PatchError("Cabeçalho de patch inválido")
+
+    ctrl_len = _offtin(patch, 8)
+    diff_len = _offtin(patch, 16)
+    new_size = _offtin(patch, 24)
+    if ctrl_len < 0 or diff_len < 0 or new_size < 0:
+        raise PatchError("Cabeçalho de patch inválido")
+
+    inicio_diff = HEADER_SIZE + ctrl_len
+    inicio_extra = inicio_diff + diff_len
+    try:
+        ctrl = bz2.decompress(patch[HEADER_SIZE:inicio_diff])
+        diff = bz2.decompress(patch[inicio_diff:inicio_extra])
+        extra = bz2.decompress(patch[inicio_extra:])
+    except (OSError, ValueError) as e:
+        raise PatchError(f"Patch corrompido: {e}")
+
+    partes = []
+    old_pos = new_pos = 0
+    diff_pos = extra_pos = ctrl_pos = 0
+    old_size = len(old)
+
+    while new_pos < new_size:
+        if ctrl_pos + 24 > len(ctrl):
+            raise PatchError("Bloco de controle truncado")
+        x = _offtin(ctrl, ctrl_pos)
+        y = _offtin(ctrl, ctrl_pos + 8)
+        z = _offtin(ctrl, ctrl_pos + 16)
+        ctrl_pos += 24
+
+        if x < 0 or y < 0 or new_pos + x + y > new_size:
+            raise PatchError("Bloco de controle inválido")
+        if diff_pos + x > len(diff) or extra_pos + y > len(extra):
+            raise PatchError("Patch truncado")
+
+        # Bytes fora do arquivo de origem contam como zero (igual ao bspatch)
+        inicio = max(old_pos, 0)
+        fim = min(max(old_pos + x, 0), old_size)
+        trecho = old[inicio:fim] if fim > inicio else b""
+        antes = min(max(inicio - old_pos, 0), x)
+        trecho = b"\0" * antes + trecho
+        trecho += b"\0" * (x - len(trecho))
+
+        partes.append(_add_bytes(trecho, diff[diff_pos:diff_pos + x]))
+        diff_pos += x
+        new_pos += x
+        old_pos += x
+
+        partes.append(extra[extra_pos:extra_pos + y])
+        extra_pos += y
+        new_pos += y
+        old_pos += z
+
+    return b"".join(partes)
+
+
+def _estender(old, new, old_pos, new_pos, janela):
+    """
+    Estende um trecho casado enquanto cada janela tiver ao menos metade dos bytes iguais.
+
+    Returns:
+        int: Tamanho do trecho a ser codificado como diferença.
+    """
+    tamanho = 0
+    limite = min(len(old) - old_pos, len(new) - new_pos)
+    while tamanho < limite:
+        w = min(janela, limite - tamanho)
+        a = new[new_pos + tamanho:new_pos + tamanho + w]
+        b = old[old_pos + tamanho:old_pos + tamanho + w]
+        if a != b and sum(1 for x, y in zip(a, b) if x == y) * 2 < w:
+            break
+        tamanho += w
+    return tamanho
+
+
+def make_patch(old, new, block_size=64):
+    """
+    Gera um patch BSDIFF40 casando blocos do arquivo antigo no novo.
+
+    Não é tão compacto quanto o bsdiff (que usa ordenação de sufixos), mas
+    o resultado é lido por qualquer bspatch e por apply_patch.
+
+    Args:
+        old (bytes): Conteúdo do arquivo antigo.
+        new (bytes): Conteúdo do arquivo novo.
+        block_size (int): Tamanho dos blocos indexados do arquivo antigo.
+
+    Returns:
+        bytes: Patch completo.
+    """
+    indice = {}
+    for i in range(0, len(old) - block_size + 1, block_size):
+        indice.setdefault(old[i:i + block_size], i)
+
+    ctrl = []
+    diff = []
+    extra = []
+    x = 0
+    old_end = 0
+    new_pos = 0
+    scan = 0
+    while scan <= len(new) - block_size:
+        o = indice.get(new[scan:scan + block_size])
+        if o is None:
+            scan += 1
+            continue
+
+        # Recua enquanto os bytes anteriores também coincidem
+        while scan > new_pos and o > 0 and new[scan - 1] == old[o - 1]:
+            scan -= 1
+            o -= 1
+        tamanho = _estender(old, new, o, scan, block_size)
+
+        extra.append(new[new_pos:scan])
+        ctrl.append((x, scan - new_pos, o - old_end))
+        diff.append(_sub_bytes(new[scan:scan + tamanho], old[o:o + tamanho]))
+        x = tamanho
+        old_end = o + tamanho
+        scan = new_pos = scan + tamanho
+
+    extra.append(new[new_pos:])
+    ctrl.append((x, len(new) - new_pos, 0))
+    return build_patch(ctrl, b"".join(diff), b"".join(extra), len(new))
+
+
+def build_patch(ctrl_entries, diff, extra, new_size):
+    """
+    Monta um patch BSDIFF40 a partir dos blocos já calculados.
+
+    Args:
+        ctrl_entries (list): Triplas (x, y, z) do bloco de controle.
+        diff (bytes): Diferenças somadas ao arquivo de origem.
+        extra (bytes): Bytes novos copiados diretamente.
+        new_size (int): Tamanho do arquivo resultante.
+
+    Returns:
+        bytes: Patch completo.
+    """
+    ctrl = b"".join(_offtout(x) + _offtout(y) + _offtout(z) for x, y, z in ctrl_entries)
+    ctrl_bz = bz2.compress(ctrl)
+    diff_bz = bz2.compress(diff)
+    extra_bz = bz2.compress(extra)
+    header = BSDIFF_MAGIC + _offtout(len(ctrl_bz)) + _offtout(len(diff_bz)) + _offtout(new_size)
+    return header + ctrl_bz + diff_bz + extra_bz
+
+
+def apply_patch_file(old_path, patch_path, new_path, expected_sha256=None, expected_size=None):
+    """
+    Aplica um patch a um arquivo e grava o resultado verificado.
+
+    Args:
+        old_path (str): Arquivo de origem (ex.: executável em uso).
+        patch_path (str): Arquivo de patch.
+        new_path (str): Destino do arquivo novo.
+        expected_sha256 (str): SHA-256 esperado do resultado (opcional).
+        expected_size (int): Tamanho esperado do resultado (opcional).
+
+    Raises:
+        PatchError: Patch inválido ou resultado diferente do esperado.
+    """
+    with open(old_path, "rb") as f:
+        old = f.read()
+    with open(patch_path, "rb") as f:
+        patch = f.read()
+
+    new = apply_patch(old, patch)
+
+    if expected_size and len(new) != int(expected_size):
+        raise PatchError(f"Tamanho após o patch: {len(new)} bytes (esperado {expected_size})")
+    if expected_sha256 and hashlib.sha256(new).hexdigest() != expected_sha256.lower():
+        raise PatchError("Resultado do patch não confere com o SHA-256 publicado")
+
+    temp_path = new_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(new)
+    os.replace(temp_path, new_path)
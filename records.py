@@ -0,0 +1,484 @@
+import sys
+from collections.abc import MutableMapping
+
+
+# Campos de "dados", na ordem de obter_dados_formulario
+CAMPOS_DADOS = (
+    "nome_tecnico",
+    "observacoes",
+    "check_comissao",
+    "input_comissao",
+    "check_ip_mac",
+    "check_instalacao",
+    "check_localizacao",
+    "check_foto_gps",
+    "check_acesso_remoto",
+    "combo_comodato",
+    "input_senha",
+    "input_rx",
+    "input_tx",
+    "input_nome_arquivo",
+    "input_link_gps",
+)
+CAMPOS_CHECK = tuple(campo for campo in CAMPOS_DADOS if campo.startswith("check_"))
+# Campos de texto de "dados" -> slot do PendenciaRecord
+SLOTS_TEXTO = {
+    campo: ("dados_tecnico" if campo == "nome_tecnico" else campo)
+    for campo in CAMPOS_DADOS
+    if campo not in CAMPOS_CHECK
+}
+# Textos repetidos entre pendências: uma única cópia em memória
+CAMPOS_INTERNADOS = ("nome_tecnico", "combo_comodato")
+
+# Campos de primeiro nível, na ordem em que a janela cria a pendência
+CAMPOS_PENDENCIA = ("id", "nome_tecnico", "data_hora", "status", "dados", "data_finalizacao")
+CAMPOS_SIMPLES = tuple(campo for campo in CAMPOS_PENDENCIA if campo != "dados")
+
+# Bits de "flags": valor de cada check_*, presença de cada campo de
+# "dados" e presença do próprio "dados"
+BIT_CHECK = {campo: 1 << i for i, campo in enumerate(CAMPOS_CHECK)}
+BIT_PRESENTE = {campo: 1 << (8 + i) for i, campo in enumerate(CAMPOS_DADOS)}
+BIT_TEM_DADOS = 1 << 30
+# Campo de "dados" -> (bit de presença, bit do check ou 0, slot de texto ou
+# None, posição na ordem padrão)
+_LAYOUT_DADOS = {
+    campo: (BIT_PRESENTE[campo], BIT_CHECK.get(campo, 0), SLOTS_TEXTO.get(campo), i)
+    for i, campo in enumerate(CAMPOS_DADOS)
+}
+# Posição de cada campo de primeiro nível na ordem padrão (extras vêm depois)
+_POSICAO_SIMPLES = {campo: i for i, campo in enumerate(CAMPOS_PENDENCIA) if campo != "dados"}
+_POSICAO_DADOS = CAMPOS_PENDENCIA.index("dados")
+
+
+class _Ausente:
+    """Marca um campo de primeiro nível que não existe no JSON"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<ausente>"
+
+    def __reduce__(self):
+        # copy, deepcopy e pickle devolvem o próprio AUSENTE (comparado com "is")
+        return "AUSENTE"
+
+
+AUSENTE = _Ausente()
+
+
+def _internar(valor):
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+class PendenciaRecord(MutableMapping):
+    """
+    Pendência em formato compacto, com a mesma interface de um dict.
+
+    Os campos ficam em __slots__ em vez de dois dicts aninhados; os seis
+    check_* e a presença de cada campo de "dados" ficam em um único
+    inteiro (flags); técnico, status e comodato são internados, então
+    pendências do mesmo técnico compartilham a mesma string. Valores fora
+    do formato esperado (tipos diferentes ou campos desconhecidos) vão para
+    "extras"/"extras_dados". Chaves fora da ordem padrão têm a ordem
+    guardada em "ordem"/"ordem_dados" (None no caso comum), então to_dict()
+    devolve um dict igual ao original, inclusive na ordem das chaves.
+
+    pendencia["dados"] retorna uma visão (DadosPendencia) que lê e grava
+    direto nos slots.
+    """
+
+    __slots__ = (
+        "id",
+        "nome_tecnico",
+        "data_hora",
+        "status",
+        "data_finalizacao",
+        "flags",
+        "dados_tecnico",
+        "observacoes",
+        "input_comissao",
+        "combo_comodato",
+        "input_senha",
+        "input_rx",
+        "input_tx",
+        "input_nome_arquivo",
+        "input_link_gps",
+        "extras",
+        "extras_dados",
+        "ordem",
+        "ordem_dados",
+    )
+
+    # Versão do formato de estado() (alterar invalida os caches gravados
+    # com o formato anterior)
+    VERSAO_ESTADO = 1
+
+    def __init__(self):
+        for campo in CAMPOS_SIMPLES:
+            setattr(self, campo, AUSENTE)
+        for slot in SLOTS_TEXTO.values():
+            setattr(self, slot, "")
+        self.flags = 0
+        self.extras = None
+        self.extras_dados = None
+        self.ordem = None
+        self.ordem_dados = None
+
+    @classmethod
+    def from_dict(cls, pendencia):
+        """
+        Converte uma pendência no formato JSON (dict) para o formato compacto.
+
+        Args:
+            pendencia (dict): Pendência com "dados" aninhado.
+
+        Returns:
+            PendenciaRecord: Registro equivalente.
+        """
+        registro = cls()
+        # Ordem padrão: campos conhecidos em CAMPOS_PENDENCIA/CAMPOS_DADOS e
+        # depois os extras; qualquer outra ordem é guardada
+        posicao = -1
+        fora_de_ordem = False
+        for chave, valor in pendencia.items():
+            if chave == "dados" and type(valor) is dict:
+                posicao_campo = _POSICAO_DADOS
+            else:
+                registro._definir(chave, valor)
+                # Desconhecidos (e "dados" fora do formato) vão para os extras
+                posicao_campo = _POSICAO_SIMPLES.get(chave, len(CAMPOS_PENDENCIA))
+            if posicao_campo < posicao:
+                fora_de_ordem = True
+            posicao = posicao_campo
+            if posicao_campo != _POSICAO_DADOS:
+                continue
+
+            # Caminho rápido para "dados" no formato do formulário
+            flags = registro.flags | BIT_TEM_DADOS
+            posicao_dados = -1
+            dados_fora_de_ordem = False
+            for campo, valor_campo in valor.items():
+                layout = _LAYOUT_DADOS.get(campo)
+                if layout is None:
+                    registro.flags = flags
+                    registro._definir_campo_dados(campo, valor_campo)
+                    flags = registro.flags
+                    posicao_dados = len(CAMPOS_DADOS)
+                    continue
+                bit, bit_check, slot, posicao_dado = layout
+                tipo = type(valor_campo)
+                if bit_check and tipo is bool:
+                    flags |= bit | (bit_check if valor_campo else 0)
+                elif slot is not None and tipo is str:
+                    flags |= bit
+                    if campo in CAMPOS_INTERNADOS:
+                        valor_campo = sys.intern(valor_campo)
+                    setattr(registro, slot, valor_campo)
+                else:
+                    registro.flags = flags
+                    registro._definir_campo_dados(campo, valor_campo)
+                    flags = registro.flags
+                    posicao_dados = len(CAMPOS_DADOS)
+                    continue
+                if posicao_dado < posicao_dados:
+                    dados_fora_de_ordem = True
+                posicao_dados = posicao_dado
+            registro.flags = flags
+            if dados_fora_de_ordem:
+                registro.ordem_dados = list(valor)
+        if fora_de_ordem:
+            registro.ordem = list(pendencia)
+        return registro
+
+    def estado(self):
+        """
+        Valores de todos os slots, para gravar em cache (marshal).
+
+        Returns:
+            tuple: Um valor por slot, na ordem de __slots__ (campo ausente vira ...).
+        """
+        return tuple(
+            ... if valor is AUSENTE else valor
+            for valor in (getattr(self, slot) for slot in self.__slots__)
+        )
+
+    @classmethod
+    def from_estado(cls, estado):
+        """
+        Recria um registro a partir de estado(), sem passar pelo formato JSON.
+
+        Args:
+            estado (tuple): Valores devolvidos por estado().
+
+        Returns:
+            PendenciaRecord: Registro equivalente.
+        """
+        registro = cls.__new__(cls)
+        # Mesma ordem de __slots__
+        (
+            registro.id,
+            registro.nome_tecnico,
+            registro.data_hora,
+            registro.status,
+            registro.data_finalizacao,
+            registro.flags,
+            registro.dados_tecnico,
+            registro.observacoes,
+            registro.input_comissao,
+            registro.combo_comodato,
+            registro.input_senha,
+            registro.input_rx,
+            registro.input_tx,
+            registro.input_nome_arquivo,
+            registro.input_link_gps,
+            registro.extras,
+            registro.extras_dados,
+            registro.ordem,
+            registro.ordem_dados,
+        ) = estado
+        # Em aberto não têm data_finalizacao; os demais faltam só em JSON editado
+        if registro.data_finalizacao is ...:
+            registro.data_finalizacao = AUSENTE
+        if ... in estado[:4]:
+            for campo in CAMPOS_SIMPLES:
+                if getattr(registro, campo) is ...:
+                    setattr(registro, campo, AUSENTE)
+        return registro
+
+    def to_dict(self):
+        """
+        Converte de volta para o formato JSON.
+
+        Returns:
+            dict: Pendência igual à usada em from_dict (mesma ordem de chaves).
+        """
+        if self.ordem is not None:
+            return {
+                chave: self._dados_dict() if chave == "dados" and self.flags & BIT_TEM_DADOS else self[chave]
+                for chave in self.ordem
+            }
+        pendencia = {}
+        for campo in CAMPOS_PENDENCIA:
+            if campo == "dados":
+                if self.flags & BIT_TEM_DADOS:
+                    pendencia["dados"] = self._dados_dict()
+                continue
+            valor = getattr(self, campo)
+            if valor is not AUSENTE:
+                pendencia[campo] = valor
+        if self.extras:
+            pendencia.update(self.extras)
+        return pendencia
+
+    def _dados_dict(self):
+        flags = self.flags
+        dados = {}
+        for campo, (bit, bit_check, slot, _) in _LAYOUT_DADOS.items():
+            if not flags & bit:
+                continue
+            if bit_check:
+                dados[campo] = bool(flags & bit_check)
+            else:
+                dados[campo] = getattr(self, slot)
+        if self.extras_dados:
+            dados.update(self.extras_dados)
+        if self.ordem_dados is not None:
+            return {campo: dados[campo] for campo in self.ordem_dados}
+        return dados
+
+    def _limpar_dados(self):
+        self.flags &= ~(BIT_TEM_DADOS | sum(BIT_PRESENTE.values()) | sum(BIT_CHECK.values()))
+        for slot in SLOTS_TEXTO.values():
+            setattr(self, slot, "")
+        self.extras_dados = None
+        self.ordem_dados = None
+
+    def _definir_dados(self, dados):
+        self._limpar_dados()
+        if not isinstance(dados, dict):
+            # Formato inesperado: guardar como está
+            self._definir_extra("dados", dados)
+            return
+        if self.extras:
+            self.extras.pop("dados", None)
+        self.flags |= BIT_TEM_DADOS
+        for chave, valor in dados.items():
+            self._definir_campo_dados(chave, valor)
+        if list(self._dados_dict()) != list(dados):
+            self.ordem_dados = list(dados)
+
+    def _definir_campo_dados(self, chave, valor):
+        if chave in BIT_CHECK and type(valor) is bool:
+            self.flags |= BIT_PRESENTE[chave]
+            if valor:
+                self.flags |= BIT_CHECK[chave]
+            else:
+                self.flags &= ~BIT_CHECK[chave]
+        elif chave in SLOTS_TEXTO and type(valor) is str:
+            self.flags |= BIT_PRESENTE[chave]
+            if chave in CAMPOS_INTERNADOS:
+                valor = sys.intern(valor)
+            setattr(self, SLOTS_TEXTO[chave], valor)
+        else:
+            # Campo desconhecido ou de outro tipo: fica fora dos slots
+            self._remover_campo_dados(chave)
+            if self.extras_dados is None:
+                self.extras_dados = {}
+            self.extras_dados[chave] = valor
+            return
+        if self.extras_dados:
+            self.extras_dados.pop(chave, None)
+
+    def _remover_campo_dados(self, chave):
+        if chave in BIT_PRESENTE and self.flags & BIT_PRESENTE[chave]:
+            self.flags &= ~(BIT_PRESENTE[chave] | BIT_CHECK.get(chave, 0))
+            if chave in SLOTS_TEXTO:
+                setattr(self, SLOTS_TEXTO[chave], "")
+            return True
+        if self.extras_dados and chave in self.extras_dados:
+            del self.extras_dados[chave]
+            return True
+        return False
+
+    def _definir_extra(self, chave, valor):
+        if self.extras is None:
+            self.extras = {}
+        self.extras[chave] = valor
+
+    def __getitem__(self, chave):
+        if chave == "dados":
+            if self.flags & BIT_TEM_DADOS:
+                return DadosPendencia(self)
+        elif chave in CAMPOS_SIMPLES:
+            valor = getattr(self, chave)
+            if valor is not AUSENTE:
+                return valor
+        if self.extras and chave in self.extras:
+            return self.extras[chave]
+        raise KeyError(chave)
+
+    def __setitem__(self, chave, valor):
+        if self.ordem is not None:
+            if chave not in self.ordem:
+                self.ordem.append(chave)
+            self._definir(chave, valor)
+            return
+        # Como em um dict: chave existente mantém a posição, nova vai para o fim
+        antes = list(self)
+        self._definir(chave, valor)
+        esperado = antes if chave in antes else antes + [chave]
+        if list(self) != esperado:
+            self.ordem = esperado
+
+    def _definir(self, chave, valor):
+        if chave == "dados":
+            self._definir_dados(valor)
+        elif chave in CAMPOS_SIMPLES:
+            if chave in ("nome_tecnico", "status"):
+                valor = _internar(valor)
+            setattr(self, chave, valor)
+        else:
+            self._definir_extra(chave, valor)
+
+    def __delitem__(self, chave):
+        if chave == "dados" and self.flags & BIT_TEM_DADOS:
+            self._limpar_dados()
+        elif chave in CAMPOS_SIMPLES and getattr(self, chave) is not AUSENTE:
+            setattr(self, chave, AUSENTE)
+        elif self.extras and chave in self.extras:
+            del self.extras[chave]
+        else:
+            raise KeyError(chave)
+        if self.ordem is not None:
+            self.ordem.remove(chave)
+
+    def __iter__(self):
+        if self.ordem is not None:
+            yield from list(self.ordem)
+            return
+        for campo in CAMPOS_PENDENCIA:
+            if campo == "dados":
+                if self.flags & BIT_TEM_DADOS:
+                    yield campo
+            elif getattr(self, campo) is not AUSENTE:
+                yield campo
+        if self.extras:
+            yield from list(self.extras)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, outro):
+        if isinstance(outro, PendenciaRecord):
+            outro = outro.to_dict()
+        if isinstance(outro, dict):
+            return self.to_dict() == outro
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle pelo formato JSON: cópia rasa como a de um
+        # dict (extras não compartilhados) e independente dos __slots__
+        return (self.__class__.from_dict, (self.to_dict(),))
+
+    def __repr__(self):
+        return f"PendenciaRecord({self.to_dict()!r})"
+
+
+class DadosPendencia(MutableMapping):
+    """Visão de pendencia["dados"] que lê e grava nos slots do PendenciaRecord"""
+
+    __slots__ = ("registro",)
+
+    def __init__(self, registro):
+        self.registro = registro
+
+    def __getitem__(self, chave):
+        registro = self.registro
+        bit = BIT_PRESENTE.get(chave)
+        if bit is not None and registro.flags & bit:
+            if chave in BIT_CHECK:
+                return bool(registro.flags & BIT_CHECK[chave])
+            return getattr(registro, SLOTS_TEXTO[chave])
+        if registro.extras_dados and chave in registro.extras_dados:
+            return registro.extras_dados[chave]
+        raise KeyError(chave)
+
+    def __setitem__(self, chave, valor):
+        registro = self.registro
+        if registro.ordem_dados is not None:
+            if chave not in registro.ordem_dados:
+                registro.ordem_dados.append(chave)
+            registro._definir_campo_dados(chave, valor)
+            return
+        # Como em um dict: chave existente mantém a posição, nova vai para o fim
+        antes = list(registro._dados_dict())
+        registro._definir_campo_dados(chave, valor)
+        esperado = antes if chave in antes else antes + [chave]
+        if list(registro._dados_dict()) != esperado:
+            registro.ordem_dados = esperado
+
+    def __delitem__(self, chave):
+        if not self.registro._remover_campo_dados(chave):
+            raise KeyError(chave)
+        if self.registro.ordem_dados is not None:
+            self.registro.ordem_dados.remove(chave)
+
+    def __iter__(self):
+        return iter(self.registro._dados_dict())
+
+    def __len__(self):
+        return len(self.registro._dados_dict())
+
+    def __eq__(self, outro):
+        if isinstance(outro, DadosPendencia):
+            outro = dict(outro)
+        if isinstance(outro, dict):
+            return self.registro._dados_dict() == outro
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DadosPendencia({self.registro._dados_dict()!r})"
@@ -0,0 +1,912 @@
+import os
+import copy
+import json
+import time
+import marshal
+import sqlite3
+import threading
+
+
+# Versão da estrutura do cache de inicialização (alterar invalida caches antigos)
+CACHE_SCHEMA = 2
+
+
+def _dump_compacto(obj):
+    """Serializa um objeto em JSON compacto (uma linha, sem espaços extras)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _erro_transitorio(erro):
+    """Indica se a falha é do disco/banco (nova tentativa) e não da própria alteração"""
+    return isinstance(erro, (OSError, sqlite3.OperationalError))
+
+
+def open_store(json_path, backend="journal", write_behind=False, on_error=None, registro=None):
+    """
+    Abre o armazenamento de pendências conforme o backend escolhido.
+
+    Args:
+        json_path (str): Caminho do arquivo JSON de pendências.
+        backend (str): "journal" (padrão) ou "sqlite".
+        write_behind (bool): Grava as alterações em segundo plano (WriteBehindStore).
+        on_error (callable): Recebe a mensagem de erro de uma gravação em segundo plano.
+        registro (type): Formato compacto das pendências em memória (ex.:
+            PendenciaRecord), guardado pronto no cache do JournalStore.
+
+    Returns:
+        JournalStore, SQLiteStore ou WriteBehindStore: Armazenamento ainda não carregado.
+    """
+    if backend == "sqlite":
+        db_path = os.path.splitext(json_path)[0] + ".db"
+        store = SQLiteStore(db_path, json_path=json_path)
+    else:
+        store = JournalStore(json_path, registro=registro)
+    if write_behind:
+        return WriteBehindStore(store, on_error=on_error)
+    return store
+
+
+class WriteBehindStore:
+    """
+    Grava as alterações de outro armazenamento em uma thread de fundo.
+
+    put/delete/set_tecnicos só guardam uma cópia da alteração e marcam o
+    armazenamento como sujo, sem acessar o disco. A thread espera a rajada
+    terminar (janela de coalescência), junta várias alterações da mesma
+    pendência em uma só e grava o lote de uma vez com apply() do
+    armazenamento interno. flush() e close() gravam o que estiver pendente.
+
+    Se um lote falhar, as operações são gravadas uma a uma: uma alteração
+    que nunca poderá ser gravada (ex.: valor não serializável) é descartada
+    e informada, sem travar as demais. Falhas de disco devolvem o lote e a
+    próxima tentativa espera cada vez mais (até ESPERA_MAXIMA segundos).
+    """
+
+    ESPERA_INICIAL = 1
+    ESPERA_MAXIMA = 60
+
+    def __init__(self, store, janela=0.5, on_error=None):
+        """
+        Args:
+            store (JournalStore ou SQLiteStore): Armazenamento que recebe os lotes.
+            janela (float): Segundos de espera por mais alterações antes de gravar.
+            on_error (callable): Recebe a mensagem de erro (chamado na thread de
+                fundo, uma vez por erro enquanto ele se repetir).
+        """
+        self.store = store
+        self.janela = janela
+        self.on_error = on_error
+
+        self._cond = threading.Condition()
+        self._pendentes = {}  # ("pendencia", id) ou ("tecnicos",) -> operação
+        self._gravando = False
+        self._flush_pedidos = 0
+        self._falhas = 0
+        self._ultimo_erro = None
+        self._erro_reportado = None  # Última mensagem repassada a on_error
+        self._espera = 0  # Espera atual entre tentativas após falha (s)
+        self._espera_ate = 0  # Instante (monotonic) liberado para nova tentativa
+        self._parar = False
+        self._thread = None
+
+    def load(self):
+        """
+        Carrega os dados do armazenamento interno e inicia a thread de gravação.
+
+        Returns:
+            dict: Mesma estrutura de JournalStore.load().
+        """
+        data = self.store.load()
+        self._iniciar()
+        return data
+
+    def put(self, pendencia):
+        """
+        Marca a criação ou alteração de uma pendência para gravação.
+
+        Args:
+            pendencia (dict): Pendência completa (copiada no momento da chamada).
+        """
+        self._marcar(("pendencia", pendencia["id"]), ("put", copy.deepcopy(pendencia)))
+
+    def delete(self, id_pendencia):
+        """
+        Marca a exclusão de uma pendência para gravação.
+
+        Args:
+            id_pendencia (int): ID da pendência excluída.
+        """
+        self._marcar(("pendencia", id_pendencia), ("del", id_pendencia))
+
+    def set_tecnicos(self, tecnicos):
+        """
+        Marca a lista atual de técnicos para gravação.
+
+        Args:
+            tecnicos (list): Nomes dos técnicos.
+        """
+        self._marcar(("tecnicos",), ("tecnicos", list(tecnicos)))
+
+    def flush(self):
+        """
+        Grava imediatamente as alterações pendentes e aguarda o término.
+
+        Retorna ou falha depois de uma única tentativa; durante a espera após
+        uma falha não força outra tentativa e falha com o último erro.
+
+        Raises:
+            OSError: Se a gravação falhar ou alguma alteração for descartada.
+        """
+        with self._cond:
+            if not self._pendentes and not self._gravando:
+                return
+            if time.monotonic() < self._espera_ate:
+                raise OSError(f"Falha ao gravar pendências: {self._ultimo_erro}")
+            self._iniciar()
+            falhas = self._falhas
+            self._flush_pedidos += 1
+            self._cond.notify_all()
+            try:
+                while (self._pendentes or self._gravando) and self._falhas == falhas:
+                    self._cond.wait()
+            finally:
+                self._flush_pedidos -= 1
+            if self._falhas != falhas:
+                raise OSError(f"Falha ao gravar pendências: {self._ultimo_erro}")
+
+    def export_json(self, path):
+        """Grava o pendente e exporta o estado atual no formato JSON completo"""
+        self.flush()
+        self.store.export_json(path)
+
+    def compact(self, wait=False):
+        """Grava o pendente e compacta o armazenamento interno"""
+        self.flush()
+        self.store.compact(wait=wait)
+
+    def close(self):
+        """
+        Grava o pendente (uma última tentativa, sem a espera após falha),
+        encerra a thread e fecha o armazenamento interno.
+
+        Raises:
+            OSError: Se a última gravação falhar.
+        """
+        try:
+            with self._cond:
+                falhas = self._falhas
+                self._parar = True
+                self._cond.notify_all()
+            if self._thread is not None:
+                self._thread.join()
+            if self._pendentes or self._falhas != falhas:
+                raise OSError(f"Falha ao gravar pendências: {self._ultimo_erro}")
+        finally:
+            self.store.close()
+
+    def __getattr__(self, nome):
+        # Demais métodos do armazenamento interno veem
+        # também as alterações ainda não gravadas
+        atributo = getattr(self.store, nome)
+        if callable(atributo):
+            self.flush()
+        return atributo
+
+    def _iniciar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._executar, daemon=True)
+            self._thread.start()
+
+    def _marcar(self, chave, operacao):
+        with self._cond:
+            # A alteração mais recente substitui a anterior da mesma chave,
+            # na mesma posição (o journal mantém a ordem de criação)
+            self._pendentes[chave] = operacao
+            self._iniciar()
+            self._cond.notify_all()
+
+    def _executar(self):
+        while True:
+            with self._cond:
+                while not self._pendentes and not self._parar:
+                    self._cond.wait()
+                if not self._pendentes:
+                    return
+
+                # Espera após falha: vale também para flush, só close antecipa
+                # a tentativa (a última antes de encerrar)
+                while not self._parar:
+                    restante = self._espera_ate - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._cond.wait(restante)
+
+                # Janela de coalescência (encurtada por flush/close)
+                prazo = time.monotonic() + self.janela
+                while not self._parar and not self._flush_pedidos:
+                    restante = prazo - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._cond.wait(restante)
+
+                lote = list(self._pendentes.items())
+                self._pendentes.clear()
+                self._gravando = True
+
+            devolver, descartadas, erro = self._gravar(lote)
+
+            with self._cond:
+                self._gravando = False
+                # Devolver o lote sem passar por cima de alterações mais novas
+                for chave, operacao in devolver:
+                    self._pendentes.setdefault(chave, operacao)
+                if erro is not None:
+                    self._espera = min(self._espera * 2 or self.ESPERA_INICIAL, self.ESPERA_MAXIMA)
+                    self._espera_ate = time.monotonic() + self._espera
+                else:
+                    self._espera = 0
+                    self._espera_ate = 0
+                if erro is not None or descartadas:
+                    self._falhas += 1
+                    self._ultimo_erro = erro if erro is not None else descartadas[-1][1]
+                else:
+                    self._erro_reportado = None
+                parar = self._parar
+                self._cond.notify_all()
+
+            for chave, erro_operacao in descartadas:
+                alvo = f"pendência {chave[1]}" if chave[0] == "pendencia" else "lista de técnicos"
+                self._reportar(f"Alteração descartada ({alvo}): {erro_operacao}")
+            if erro is not None:
+                self._reportar(str(erro))
+                if parar:
+                    # Tentativa final do close: não há mais a quem devolver
+                    return
+
+    def _gravar(self, lote):
+        """
+        Grava um lote; se falhar, grava uma operação por vez para isolar a causa.
+
+        Args:
+            lote (list): Pares (chave, operação).
+
+        Returns:
+            tuple: (pares a devolver para nova tentativa, [(chave, erro)]
+                descartados, erro de disco/banco ou None).
+        """
+        try:
+            self.store.apply([operacao for _, operacao in lote])
+            return [], [], None
+        except Exception as e:
+            # Disco cheio, sem permissão, banco travado: tentar uma a uma não ajuda
+            if _erro_transitorio(e):
+                return lote, [], e
+
+        descartadas = []
+        for i, (chave, operacao) in enumerate(lote):
+            try:
+                self.store.apply([operacao])
+            except Exception as e:
+                if _erro_transitorio(e):
+                    return lote[i:], descartadas, e
+                descartadas.append((chave, e))
+        return [], descartadas, None
+
+    def _reportar(self, mensagem):
+        """Registra o erro e repassa a on_error, sem repetir a mesma mensagem seguida"""
+        print(f"Erro ao gravar pendências: {mensagem}")
+        with self._cond:
+            if mensagem == self._erro_reportado:
+                return
+            self._erro_reportado = mensagem
+        if self.on_error is not None:
+            self.on_error(mensagem)
+
+
+class JournalStore:
+    """
+    Armazena as pendências em um snapshot JSON mais um journal append-only.
+
+    O snapshot é o próprio arquivo JSON usado até a versão 1.4 (mesma
+    estrutura, continua servindo para importação/exportação). Cada criação,
+    alteração, finalização ou exclusão grava apenas uma linha no journal,
+    então salvar uma pendência não depende mais do tamanho do histórico.
+    Periodicamente o journal é compactado em um novo snapshot em background.
+
+    Ao lado do snapshot fica um cache binário (marshal) com as pendências
+    já validadas e serializadas (no formato compacto, se houver "registro"),
+    identificado por mtime, tamanho e inode do JSON e pela versão do
+    formato. Se bater, a inicialização não precisa interpretar o JSON nem
+    converter as pendências; se não bater, o JSON é lido e o cache é
+    refeito em background.
+    """
+
+    def __init__(self, json_path, compact_threshold=500, registro=None):
+        """
+        Args:
+            json_path (str): Caminho do arquivo JSON (snapshot).
+            compact_threshold (int): Entradas no journal antes de compactar.
+            registro (type): Classe das pendências devolvidas por load(), com
+                from_dict/estado/from_estado (ex.: PendenciaRecord); o cache
+                guarda o estado() já convertido. None devolve dicts.
+        """
+        self.json_path = json_path
+        self.registro = registro
+        self.journal_path = json_path + ".journal"
+        # Journal congelado enquanto a compactação grava o novo snapshot
+        self.compacting_path = json_path + ".journal.compacting"
+        self.cache_path = json_path + ".cache"
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.Lock()
+        self._registros = {}  # id -> registro serializado (JSON compacto)
+        self._tecnicos = None  # None: arquivo sem lista de técnicos
+        self._next_id = 1
+        self._journal = None
+        self._entradas_journal = 0
+        self._compact_thread = None
+        self._cache_lock = threading.Lock()
+
+    def load(self, somente_leitura=False):
+        """
+        Carrega o snapshot e reaplica o journal por cima dele.
+
+        Args:
+            somente_leitura (bool): Não grava nada no disco (cache, snapshot
+                ou journal); o armazenamento fica só para leitura.
+
+        Returns:
+            dict: Estrutura {"pendencias": [...], "tecnicos": [...], "next_id": n}.
+        """
+        chave = self._chave_cache()
+        cache = self._ler_cache(chave)
+        if cache is not None:
+            pendencias = cache["pendencias"]
+            if self.registro is not None:
+                pendencias = [self.registro.from_estado(estado) for estado in pendencias]
+            # O cache só é gravado quando todas as pendências têm ID
+            registros = dict(zip(cache["ids"], pendencias))
+            textos = dict(zip(cache["ids"], cache["registros"]))
+            sem_id = []
+            self._tecnicos = cache["tecnicos"]
+            self._next_id = cache["next_id"]
+        else:
+            data = self._ler_snapshot()
+            if data is None:
+                # JSON ilegível: não gerar cache a partir dele
+                chave = None
+                data = {"pendencias": [], "tecnicos": [], "next_id": 1}
+            pendencias = data.get("pendencias", [])
+            self._tecnicos = data.get("tecnicos")
+            self._next_id = data.get("next_id", 1)
+            textos = None
+
+            registros = {}
+            sem_id = []
+            for pendencia in pendencias:
+                if pendencia.get("id") is None:
+                    sem_id.append(pendencia)
+                else:
+                    registros[pendencia["id"]] = pendencia
+
+        if textos is None:
+            textos = {
+                id_pendencia: _dump_compacto(pendencia)
+                for id_pendencia, pendencia in registros.items()
+            }
+            # (se o snapshot for regravado abaixo, o cache é refeito a partir dele)
+            if (
+                not somente_leitura
+                and chave is not None
+                and not sem_id
+                and not os.path.exists(self.compacting_path)
+            ):
+                self._reconstruir_cache(chave, list(textos.values()), self._tecnicos, self._next_id)
+
+        # Reaplicar journals (a ordem importa: o congelado é mais antigo)
+        alterados = set()
+        self._reaplicar_journal(self.compacting_path, registros, alterados)
+        entradas = self._reaplicar_journal(self.journal_path, registros, alterados)
+
+        if registros:
+            self._next_id = max(self._next_id, max(registros) + 1)
+
+        # Pendências antigas (antes da v1.3) não têm ID; atribuir para journal
+        for pendencia in sem_id:
+            pendencia["id"] = self._next_id
+            self._next_id += 1
+            registros[pendencia["id"]] = pendencia
+
+        # Só as pendências alteradas pelo journal precisam ser serializadas
+        alterados.update(pendencia["id"] for pendencia in sem_id)
+        self._registros = {
+            id_pendencia: (
+                _dump_compacto(pendencia) if id_pendencia in alterados else textos[id_pendencia]
+            )
+            for id_pendencia, pendencia in registros.items()
+        }
+
+        pendencias = list(registros.values())
+        if self.registro is not None:
+            # Vindas do JSON ou do journal (as do cache já estão convertidas)
+            pendencias = [
+                self.registro.from_dict(p) if type(p) is dict else p
+                for p in pendencias
+            ]
+        data = {"pendencias": pendencias, "next_id": self._next_id}
+        if self._tecnicos is not None:
+            data["tecnicos"] = list(self._tecnicos)
+        if somente_leitura:
+            return data
+
+        # Compactação interrompida ou IDs recém-atribuídos: gravar snapshot já
+        if sem_id or os.path.exists(self.compacting_path):
+            textos = list(self._registros.values())
+            self._gravar_snapshot(textos, self._tecnicos, self._next_id)
+            self._remover_arquivo(self.compacting_path)
+            self._remover_arquivo(self.journal_path)
+            entradas = 0
+            self._reconstruir_cache(self._chave_cache(), textos, self._tecnicos, self._next_id)
+
+        self._abrir_journal()
+        self._entradas_journal = entradas
+        return data
+
+    def put(self, pendencia):
+        """
+        Registra a criação ou alteração de uma pendência.
+
+        Args:
+            pendencia (dict): Pendência completa (precisa ter "id").
+        """
+        with self._lock:
+            self._append(self._registrar("put", pendencia))
+
+    def delete(self, id_pendencia):
+        """
+        Registra a exclusão de uma pendência.
+
+        Args:
+            id_pendencia (int): ID da pendência excluída.
+        """
+        with self._lock:
+            self._append(self._registrar("del", id_pendencia))
+
+    def set_tecnicos(self, tecnicos):
+        """
+        Registra a lista atual de técnicos.
+
+        Args:
+            tecnicos (list): Nomes dos técnicos.
+        """
+        with self._lock:
+            self._append(self._registrar("tecnicos", tecnicos))
+
+    def apply(self, operacoes):
+        """
+        Registra um lote de alterações com uma única gravação (flush + fsync).
+
+        Args:
+            operacoes (list): Tuplas ("put", pendencia), ("del", id) ou ("tecnicos", lista).
+        """
+        with self._lock:
+            linhas = [self._registrar(op, valor) for op, valor in operacoes]
+            if not linhas:
+                return
+            self._journal.write("".join(linha + "\n" for linha in linhas))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._entradas_journal += len(linhas)
+            if self._entradas_journal >= self.compact_threshold:
+                self._iniciar_compactacao()
+
+    def export_json(self, path):
+        """
+        Exporta o estado atual no formato JSON completo.
+
+        Args:
+            path (str): Arquivo de destino.
+        """
+        with self._lock:
+            registros = list(self._registros.values())
+            tecnicos = self._tecnicos
+            next_id = self._next_id
+        self._gravar_json(path, registros, tecnicos, next_id)
+
+    def compact(self, wait=False):
+        """
+        Compacta o journal em um novo snapshot, em background.
+
+        Args:
+            wait (bool): Aguarda o término da compactação.
+        """
+        with self._lock:
+            self._iniciar_compactacao()
+            thread = self._compact_thread
+
+        if wait and thread is not None:
+            thread.join()
+
+    def close(self):
+        """Aguarda compactações pendentes e fecha o journal"""
+        thread = self._compact_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _iniciar_compactacao(self):
+        # Chamado com o lock adquirido
+        if self._compact_thread is not None and self._compact_thread.is_alive():
+            return
+        if self._entradas_journal == 0:
+            return
+        if os.path.exists(self.compacting_path):
+            # Compactação anterior falhou: só é refeita no próximo início
+            return
+
+        # Congelar o journal atual e começar um novo
+        self._journal.close()
+        os.replace(self.journal_path, self.compacting_path)
+        self._abrir_journal()
+
+        self._compact_thread = threading.Thread(
+            target=self._executar_compactacao,
+            args=(list(self._registros.values()), self._tecnicos, self._next_id),
+            daemon=True,
+        )
+        self._compact_thread.start()
+
+    def _executar_compactacao(self, registros, tecnicos, next_id):
+        try:
+            self._gravar_snapshot(registros, tecnicos, next_id)
+            self._remover_arquivo(self.compacting_path)
+            print(f"DEBUG: Journal compactado. Total: {len(registros)}")
+        except Exception as e:
+            # O journal congelado é mantido e reaplicado no próximo início
+            print(f"Erro ao compactar journal: {e}")
+            return
+        # Já estamos em background: atualizar o cache para o novo snapshot
+        self._gravar_cache(self._chave_cache(), registros, tecnicos, next_id)
+
+    def _chave_cache(self):
+        """Identifica a versão do snapshot em disco (None se não existir)"""
+        try:
+            st = os.stat(self.json_path)
+        except OSError:
+            return None
+        formato = self.registro.VERSAO_ESTADO if self.registro is not None else None
+        return [CACHE_SCHEMA, marshal.version, formato, st.st_mtime_ns, st.st_size, st.st_ino]
+
+    def _ler_cache(self, chave):
+        """Retorna o conteúdo do cache se ele corresponder ao snapshot atual"""
+        if chave is None:
+            return None
+        try:
+            with open(self.cache_path, "rb") as f:
+                # A chave vem antes do conteúdo: cache velho não é lido inteiro
+                if marshal.load(f) == chave:
+                    return marshal.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"DEBUG: Cache de inicialização ignorado: {e}")
+        return None
+
+    def _reconstruir_cache(self, chave, registros, tecnicos, next_id):
+        # Registros serializados (str) são imutáveis: seguros para outra thread
+        threading.Thread(
+            target=self._gravar_cache,
+            args=(chave, registros, tecnicos, next_id),
+            daemon=True,
+        ).start()
+
+    def _gravar_cache(self, chave, registros, tecnicos, next_id):
+        if chave is None:
+            return
+        try:
+            # Uma única leitura compartilha as chaves entre os registros,
+            # e o marshal grava cada chave repetida só uma vez
+            pendencias = json.loads("[" + ",".join(registros) + "]")
+            ids = [p["id"] for p in pendencias]
+            if self.registro is not None:
+                # Já no formato compacto: a inicialização não converte de novo
+                pendencias = [self.registro.from_dict(p).estado() for p in pendencias]
+            cache = {
+                "ids": ids,
+                "pendencias": pendencias,
+                "registros": list(registros),
+                "tecnicos": list(tecnicos) if tecnicos is not None else None,
+                "next_id": next_id,
+            }
+            with self._cache_lock:
+                temp_path = self.cache_path + ".tmp"
+                with open(temp_path, "wb") as f:
+                    marshal.dump(chave, f)
+                    marshal.dump(cache, f)
+                os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            # Sem cache a próxima inicialização só volta a ler o JSON
+            print(f"Erro ao gravar cache de inicialização: {e}")
+
+    def _registrar(self, op, valor):
+        # Chamado com o lock adquirido: atualiza o estado e devolve a linha do journal
+        if op == "put":
+            registro = _dump_compacto(valor)
+            self._registros[valor["id"]] = registro
+            self._next_id = max(self._next_id, valor["id"] + 1)
+            return '{"op":"put","registro":' + registro + "}"
+        if op == "del":
+            self._registros.pop(valor, None)
+            return _dump_compacto({"op": "del", "id": valor})
+        self._tecnicos = list(valor)
+        return _dump_compacto({"op": "tecnicos", "tecnicos": self._tecnicos})
+
+    def _append(self, linha):
+        self._journal.write(linha + "\n")
+        self._journal.flush()
+        self._entradas_journal += 1
+        if self._entradas_journal >= self.compact_threshold:
+            self._iniciar_compactacao()
+
+    def _abrir_journal(self):
+        # Linha incompleta no final: não emendar a próxima entrada nela
+        quebra_pendente = False
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0:
+            with open(self.journal_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                quebra_pendente = f.read(1) != b"\n"
+
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if quebra_pendente:
+            self._journal.write("\n")
+        self._entradas_journal = 0
+
+    def _ler_snapshot(self):
+        try:
+            if os.path.exists(self.json_path) and os.path.getsize(self.json_path) > 0:
+                with open(self.json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                    # Se o arquivo tem estrutura antiga (só lista de pendências)
+                    if isinstance(data, list):
+                        return {"pendencias": data, "tecnicos": [], "next_id": 1}
+                    return data
+        except Exception as e:
+            print(f"Erro ao carregar pendências: {e}")
+            return None
+        return {"pendencias": [], "tecnicos": [], "next_id": 1}
+
+    def _reaplicar_journal(self, path, registros, alterados):
+        entradas = 0
+        if not os.path.exists(path):
+            return entradas
+        with open(path, "r", encoding="utf-8") as f:
+            for linha in f:
+                entradas += 1
+                try:
+                    entrada = json.loads(linha)
+                except ValueError:
+                    # Última linha incompleta (queda durante a gravação)
+                    continue
+                op = entrada.get("op")
+                if op == "put":
+                    registro = entrada["registro"]
+                    registros[registro["id"]] = registro
+                    alterados.add(registro["id"])
+                    self._next_id = max(self._next_id, registro["id"] + 1)
+                elif op == "del":
+                    registros.pop(entrada["id"], None)
+                    alterados.add(entrada["id"])
+                elif op == "tecnicos":
+                    self._tecnicos = entrada["tecnicos"]
+        return entradas
+
+    def _gravar_snapshot(self, registros, tecnicos, next_id):
+        temp_path = self.json_path + ".tmp"
+        self._gravar_json(temp_path, registros, tecnicos, next_id)
+        os.replace(temp_path, self.json_path)
+
+    def _gravar_json(self, path, registros, tecnicos, next_id):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{\n  "pendencias": [')
+            if registros:
+                f.write("\n    " + ",\n    ".join(registros) + "\n  ")
+            f.write("],\n")
+            f.write(f'  "tecnicos": {_dump_compacto(tecnicos or [])},\n')
+            f.write(f'  "next_id": {int(next_id)}\n')
+            f.write("}\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _remover_arquivo(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class SQLiteStore:
+    """
+    Armazena as pendências em um banco SQLite (modo WAL).
+
+    Expõe a mesma interface do JournalStore (load/put/delete/set_tecnicos).
+    Cada alteração é uma transação pequena, sem regravar as demais
+    pendências. As buscas continuam no índice em memória da janela, que só
+    contém pendências em aberto (as finalizadas vão para o histórico).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pendencias (
+            id INTEGER PRIMARY KEY,
+            registro TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            chave TEXT PRIMARY KEY,
+            valor TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path, json_path=None):
+        """
+        Args:
+            db_path (str): Caminho do banco SQLite.
+            json_path (str): JSON a migrar se o banco ainda estiver vazio.
+        """
+        self.db_path = db_path
+        self.json_path = json_path
+        self._conn = None
+
+    def load(self):
+        """
+        Abre o banco (migrando o JSON na primeira vez) e carrega as pendências.
+
+        Returns:
+            dict: Estrutura {"pendencias": [...], "tecnicos": [...], "next_id": n}.
+        """
+        self._abrir()
+        if self._get_meta("schema") is None and self.json_path:
+            migrate_json_to_sqlite(self.json_path, self)
+
+        pendencias = [
+            json.loads(registro)
+            for (registro,) in self._conn.execute(
+                "SELECT registro FROM pendencias ORDER BY id"
+            )
+        ]
+        data = {"pendencias": pendencias, "next_id": self._next_id()}
+        tecnicos = self._get_meta("tecnicos")
+        if tecnicos is not None:
+            data["tecnicos"] = json.loads(tecnicos)
+        return data
+
+    def put(self, pendencia):
+        """
+        Registra a criação ou alteração de uma pendência.
+
+        Args:
+            pendencia (dict): Pendência completa (precisa ter "id").
+        """
+        with self._conn:
+            self._registrar("put", pendencia)
+
+    def delete(self, id_pendencia):
+        """
+        Registra a exclusão de uma pendência.
+
+        Args:
+            id_pendencia (int): ID da pendência excluída.
+        """
+        with self._conn:
+            self._registrar("del", id_pendencia)
+
+    def set_tecnicos(self, tecnicos):
+        """
+        Registra a lista atual de técnicos.
+
+        Args:
+            tecnicos (list): Nomes dos técnicos.
+        """
+        with self._conn:
+            self._registrar("tecnicos", tecnicos)
+
+    def apply(self, operacoes):
+        """
+        Registra um lote de alterações em uma única transação.
+
+        Args:
+            operacoes (list): Tuplas ("put", pendencia), ("del", id) ou ("tecnicos", lista).
+        """
+        with self._conn:
+            for op, valor in operacoes:
+                self._registrar(op, valor)
+
+    def _registrar(self, op, valor):
+        # Chamado dentro de uma transação
+        if op == "put":
+            self._inserir(valor)
+            if valor["id"] >= self._next_id():
+                self._set_meta("next_id", str(valor["id"] + 1))
+        elif op == "del":
+            self._conn.execute("DELETE FROM pendencias WHERE id = ?", (valor,))
+        else:
+            self._set_meta("tecnicos", _dump_compacto(list(valor)))
+
+    def export_json(self, path):
+        """
+        Exporta o estado atual no formato JSON completo.
+
+        Args:
+            path (str): Arquivo de destino.
+        """
+        data = self.load()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def compact(self, wait=False):
+        """Transfere o WAL para o banco principal"""
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """Fecha a conexão com o banco"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _abrir(self):
+        if self._conn is not None:
+            return
+        # A conexão passa por várias threads, mas uma de cada vez (não há
+        # trava aqui): a carga roda na thread de fundo e a interface aguarda
+        # o término; depois, com WriteBehindStore, só a thread de gravação
+        # usa a conexão, e a interface só a alcança via flush() (que espera
+        # o lote em andamento) ou close() (após o join da thread). Sem
+        # WriteBehindStore, tudo após a carga roda na interface.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def _inserir(self, pendencia):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pendencias (id, registro) VALUES (?, ?)",
+            (pendencia["id"], _dump_compacto(pendencia)),
+        )
+
+    def _next_id(self):
+        return int(self._get_meta("next_id") or 1)
+
+    def _get_meta(self, chave):
+        row = self._conn.execute(
+            "SELECT valor FROM meta WHERE chave = ?", (chave,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, chave, valor):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (chave, valor)
+        )
+
+
+def migrate_json_to_sqlite(json_path, store):
+    """
+    Migra (uma única vez) as pendências do JSON para um banco SQLite.
+
+    Lê o JSON pelo JournalStore, então o journal pendente e a estrutura
+    antiga (só lista de pendências) também são considerados. Os arquivos de
+    origem não são alterados.
+
+    Args:
+        json_path (str): Arquivo JSON de origem.
+        store (SQLiteStore): Banco de destino, já aberto.
+    """
+    origem = JournalStore(json_path)
+    data = origem.load(somente_leitura=True)
+
+    with store._conn:
+        for pendencia in data["pendencias"]:
+            store._inserir(pendencia)
+        store._set_meta("next_id", str(data.get("next_id", 1)))
+        if "tecnicos" in data:
+            store._set_meta("tecnicos", _dump_compacto(data["tecnicos"]))
+        store._set_meta("schema", "1")
+    print(f"DEBUG: {len(data['pendencias'])} pendências migradas para {store.db_path}")
@@ -0,0 +1,165 @@
+"""
+Testes do formato compacto de pendências (records.py).
+
+Uso:
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import copy
+import json
+import pickle
+import marshal
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from records import AUSENTE, PendenciaRecord  # noqa: E402
+
+
+def pendencia_formulario(id_pendencia=1):
+    """Pendência no formato criado pela janela (obter_dados_formulario)"""
+    return {
+        "id": id_pendencia,
+        "nome_tecnico": "Anderson",
+        "data_hora": "01/02/2026 08:30",
+        "status": "Pendente",
+        "dados": {
+            "nome_tecnico": "Anderson",
+            "observacoes": "Trocar conector",
+            "check_comissao": True,
+            "input_comissao": "120",
+            "check_ip_mac": False,
+            "check_instalacao": True,
+            "check_localizacao": False,
+            "check_foto_gps": True,
+            "check_acesso_remoto": False,
+            "combo_comodato": "ONT Zyxel",
+            "input_senha": "senha123",
+            "input_rx": "-20.1",
+            "input_tx": "2.4",
+            "input_nome_arquivo": "12345 - João Silva",
+            "input_link_gps": "https://maps.google.com/?q=-27.1,-52.6",
+        },
+    }
+
+
+def pendencia_fora_do_padrao():
+    """Pendência editada à mão: ordem diferente, tipos inesperados e campos extras"""
+    return {
+        "status": "Finalizada",
+        "id": 7,
+        "extra": [1, 2],
+        "dados": {
+            "input_rx": 20.5,
+            "check_ip_mac": "sim",
+            "observacoes": "",
+            "campo_novo": None,
+            "check_comissao": True,
+        },
+        "nome_tecnico": "Gallina",
+        "data_finalizacao": "03/02/2026 10:00",
+    }
+
+
+class TestIdaEVolta(unittest.TestCase):
+    def assertIdentico(self, registro, original):
+        """Mesmo conteúdo e mesma ordem de chaves (inclusive em "dados")"""
+        self.assertEqual(
+            json.dumps(registro.to_dict(), ensure_ascii=False),
+            json.dumps(original, ensure_ascii=False),
+        )
+
+    def test_formato_do_formulario(self):
+        original = pendencia_formulario()
+        registro = PendenciaRecord.from_dict(original)
+        self.assertIdentico(registro, original)
+        self.assertIsNone(registro.ordem)
+        self.assertIsNone(registro.ordem_dados)
+
+    def test_ordem_tipos_e_campos_extras(self):
+        original = pendencia_fora_do_padrao()
+        registro = PendenciaRecord.from_dict(original)
+        self.assertIdentico(registro, original)
+        self.assertEqual(list(registro), list(original))
+        self.assertEqual(list(registro["dados"]), list(original["dados"]))
+
+    def test_dados_fora_do_formato(self):
+        original = {"id": 3, "dados": "texto", "status": "Pendente"}
+        self.assertIdentico(PendenciaRecord.from_dict(original), original)
+
+    def test_alteracoes_como_dict(self):
+        original = pendencia_fora_do_padrao()
+        registro = PendenciaRecord.from_dict(original)
+        for pendencia in (original, registro):
+            pendencia["id"] = 8
+            pendencia["novo"] = "x"
+            del pendencia["extra"]
+            pendencia["dados"]["input_rx"] = "-19.0"
+            pendencia["dados"]["input_tx"] = "2.0"
+            del pendencia["dados"]["campo_novo"]
+        self.assertIdentico(registro, original)
+
+    def test_nova_chave_vai_para_o_fim(self):
+        original = {"id": 1, "status": "Pendente", "extra": 1}
+        registro = PendenciaRecord.from_dict(original)
+        original["data_finalizacao"] = registro["data_finalizacao"] = "01/01/2026 10:00"
+        original["dados"] = registro["dados"] = {"input_tx": "1", "check_comissao": True}
+        self.assertIdentico(registro, original)
+
+    def test_campo_ausente(self):
+        registro = PendenciaRecord.from_dict({"id": 1})
+        self.assertNotIn("status", registro)
+        self.assertIs(registro.status, AUSENTE)
+        with self.assertRaises(KeyError):
+            registro["dados"]
+
+
+class TestCopia(unittest.TestCase):
+    def test_ausente_continua_unico(self):
+        self.assertIs(copy.copy(AUSENTE), AUSENTE)
+        self.assertIs(copy.deepcopy(AUSENTE), AUSENTE)
+        for protocolo in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertIs(pickle.loads(pickle.dumps(AUSENTE, protocolo)), AUSENTE)
+
+    def test_copia_rasa(self):
+        original = pendencia_fora_do_padrao()
+        registro = PendenciaRecord.from_dict(original)
+        copia = copy.copy(registro)
+        self.assertEqual(json.dumps(copia.to_dict()), json.dumps(original))
+        copia["outro"] = 1
+        copia["dados"]["observacoes"] = "alterada"
+        self.assertNotIn("outro", registro)
+        self.assertEqual(registro["dados"]["observacoes"], "")
+        # Valores mutáveis são compartilhados, como em um dict
+        self.assertIs(copia["extra"], registro["extra"])
+
+    def test_copia_profunda(self):
+        registro = PendenciaRecord.from_dict(pendencia_fora_do_padrao())
+        del registro["id"]
+        copia = copy.deepcopy(registro)
+        self.assertEqual(json.dumps(copia.to_dict()), json.dumps(registro.to_dict()))
+        self.assertIs(copia.id, AUSENTE)
+        self.assertIsNot(copia["extra"], registro["extra"])
+
+    def test_estado_para_cache(self):
+        for original in (pendencia_formulario(), pendencia_fora_do_padrao(), {"dados": {}}):
+            registro = PendenciaRecord.from_dict(original)
+            estado = marshal.loads(marshal.dumps(registro.estado()))
+            restaurado = PendenciaRecord.from_estado(estado)
+            self.assertEqual(json.dumps(restaurado.to_dict()), json.dumps(original))
+            self.assertEqual(list(restaurado), list(original))
+        self.assertIs(restaurado.id, AUSENTE)
+
+    def test_pickle(self):
+        for original in (pendencia_formulario(), pendencia_fora_do_padrao()):
+            registro = PendenciaRecord.from_dict(original)
+            del registro["status"]
+            for protocolo in range(pickle.HIGHEST_PROTOCOL + 1):
+                restaurado = pickle.loads(pickle.dumps(registro, protocolo))
+                self.assertIsInstance(restaurado, PendenciaRecord)
+                self.assertEqual(json.dumps(restaurado.to_dict()), json.dumps(registro.to_dict()))
+                self.assertIs(restaurado.status, AUSENTE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,327 @@
+"""
+Testes do armazenamento de pendências (storage.py).
+
+Uso:
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from records import PendenciaRecord  # noqa: E402
+from storage import JournalStore, WriteBehindStore  # noqa: E402
+
+
+def pendencia(id_pendencia, status="Pendente"):
+    return {
+        "id": id_pendencia,
+        "nome_tecnico": "Anderson",
+        "data_hora": "01/02/2026 08:30",
+        "status": status,
+        "dados": {"observacoes": f"Pendência {id_pendencia}"},
+    }
+
+
+def aguardar(condicao, limite=5):
+    """Espera a condição ficar verdadeira (threads de fundo do armazenamento)"""
+    prazo = time.monotonic() + limite
+    while not condicao():
+        if time.monotonic() > prazo:
+            raise AssertionError("Tempo esgotado aguardando a thread de fundo")
+        time.sleep(0.01)
+
+
+class TestJournalStore(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.pasta, "pendencias.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+    def abrir(self, **kwargs):
+        store = JournalStore(self.json_path, **kwargs)
+        data = store.load()
+        self.addCleanup(store.close)
+        return store, data
+
+    def por_id(self, data):
+        return {p["id"]: p for p in data["pendencias"]}
+
+    def test_reaplica_journal_apos_queda(self):
+        store, _ = self.abrir()
+        for i in range(1, 6):
+            store.put(pendencia(i))
+        store.put(pendencia(2, status="Finalizada"))
+        store.delete(4)
+        store.set_tecnicos(["Anderson", "Bruno"])
+        # Sem close(): o processo "cai" com tudo ainda só no journal
+
+        _, data = self.abrir()
+        pendencias = self.por_id(data)
+        self.assertEqual(sorted(pendencias), [1, 2, 3, 5])
+        self.assertEqual(pendencias[2]["status"], "Finalizada")
+        self.assertEqual(data["tecnicos"], ["Anderson", "Bruno"])
+        self.assertEqual(data["next_id"], 6)
+
+    def test_ultima_linha_truncada(self):
+        store, _ = self.abrir()
+        store.put(pendencia(1))
+        store.put(pendencia(2))
+        store.close()
+        with open(self.json_path + ".journal", "a", encoding="utf-8") as f:
+            f.write('{"op":"put","registro":{"id":3,"sta')
+
+        store, data = self.abrir()
+        self.assertEqual(sorted(self.por_id(data)), [1, 2])
+        # A próxima entrada não pode ser emendada na linha incompleta
+        store.put(pendencia(4))
+        store.close()
+
+        _, data = self.abrir()
+        self.assertEqual(sorted(self.por_id(data)), [1, 2, 4])
+
+    def test_compactacao_concorrente_com_alteracoes(self):
+        liberar = threading.Event()
+        gravando = threading.Event()
+
+        class JournalLento(JournalStore):
+            def _gravar_snapshot(self, registros, tecnicos, next_id):
+                gravando.set()
+                liberar.wait(5)
+                super()._gravar_snapshot(registros, tecnicos, next_id)
+
+        store = JournalLento(self.json_path)
+        store.load()
+        self.addCleanup(store.close)
+        for i in range(1, 21):
+            store.put(pendencia(i))
+        store.compact()
+        self.assertTrue(gravando.wait(5))
+
+        # Alterações durante a compactação vão para o journal novo
+        store.put(pendencia(21))
+        store.put(pendencia(5, status="Finalizada"))
+        store.delete(7)
+        liberar.set()
+        store.close()
+
+        self.assertFalse(os.path.exists(self.json_path + ".journal.compacting"))
+        with open(self.json_path, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["pendencias"]), 20)
+
+        _, data = self.abrir()
+        pendencias = self.por_id(data)
+        self.assertEqual(sorted(pendencias), [i for i in range(1, 22) if i != 7])
+        self.assertEqual(pendencias[5]["status"], "Finalizada")
+
+    def test_compactacao_interrompida(self):
+        class JournalFalho(JournalStore):
+            def _gravar_snapshot(self, registros, tecnicos, next_id):
+                raise OSError("disco cheio")
+
+        store = JournalFalho(self.json_path)
+        store.load()
+        for i in range(1, 4):
+            store.put(pendencia(i))
+        store.compact(wait=True)
+        store.put(pendencia(4))
+        store.close()
+        self.assertTrue(os.path.exists(self.json_path + ".journal.compacting"))
+
+        # O journal congelado é reaplicado (antes do atual) e vira snapshot
+        _, data = self.abrir()
+        self.assertEqual(sorted(self.por_id(data)), [1, 2, 3, 4])
+        self.assertFalse(os.path.exists(self.json_path + ".journal.compacting"))
+
+    def test_cache_com_registro(self):
+        store, _ = self.abrir(registro=PendenciaRecord)
+        store.put(pendencia(1))
+        store.compact(wait=True)
+        store.put(pendencia(2))
+        store.close()
+
+        store = JournalStore(self.json_path, registro=PendenciaRecord)
+        self.assertIsNotNone(store._ler_cache(store._chave_cache()))
+        data = store.load()
+        self.addCleanup(store.close)
+        self.assertTrue(all(isinstance(p, PendenciaRecord) for p in data["pendencias"]))
+        self.assertEqual([p.to_dict() for p in data["pendencias"]], [pendencia(1), pendencia(2)])
+
+
+class TestInvalidacaoDoCache(unittest.TestCase):
+    """O cache só vale para o mesmo arquivo: mtime, tamanho e inode"""
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.pasta, "pendencias.json")
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump({"pendencias": [pendencia(1)], "tecnicos": [], "next_id": 2}, f)
+        store = JournalStore(self.json_path)
+        store.load()
+        store.close()
+        aguardar(lambda: os.path.exists(store.cache_path))
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+    def cache_valido(self):
+        store = JournalStore(self.json_path)
+        return store._ler_cache(store._chave_cache()) is not None
+
+    def reescrever(self, texto, mtime_ns):
+        """Regrava o JSON no mesmo inode e restaura o mtime"""
+        with open(self.json_path, "r+", encoding="utf-8") as f:
+            f.truncate(0)
+            f.write(texto)
+        os.utime(self.json_path, ns=(mtime_ns, mtime_ns))
+
+    def test_cache_valido(self):
+        self.assertTrue(self.cache_valido())
+
+    def test_mtime(self):
+        st = os.stat(self.json_path)
+        os.utime(self.json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertFalse(self.cache_valido())
+
+    def test_tamanho(self):
+        st = os.stat(self.json_path)
+        with open(self.json_path, encoding="utf-8") as f:
+            texto = f.read()
+        self.reescrever(texto + "\n", st.st_mtime_ns)
+        self.assertEqual(os.stat(self.json_path).st_ino, st.st_ino)
+        self.assertFalse(self.cache_valido())
+
+    def test_inode(self):
+        st = os.stat(self.json_path)
+        # Outro conteúdo, mesmo tamanho e mesmo mtime, trocado via os.replace
+        with open(self.json_path, encoding="utf-8") as f:
+            texto = f.read().replace("Anderson", "Gallina!")
+        temp_path = self.json_path + ".novo"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(texto)
+        os.utime(temp_path, ns=(st.st_mtime_ns, st.st_mtime_ns))
+        os.replace(temp_path, self.json_path)
+        novo = os.stat(self.json_path)
+        self.assertNotEqual(novo.st_ino, st.st_ino)
+        self.assertEqual((novo.st_size, novo.st_mtime_ns), (st.st_size, st.st_mtime_ns))
+        self.assertFalse(self.cache_valido())
+
+        store = JournalStore(self.json_path)
+        data = store.load(somente_leitura=True)
+        self.assertEqual(data["pendencias"][0]["nome_tecnico"], "Gallina!")
+
+
+class ArmazenamentoFalho:
+    """Armazenamento interno que falha nas primeiras gravações"""
+
+    def __init__(self, falhas):
+        self.falhas = falhas
+        self.tentativas = 0
+        self.gravadas = []
+        self.fechado = False
+
+    def load(self):
+        return {"pendencias": [], "tecnicos": [], "next_id": 1}
+
+    def apply(self, operacoes):
+        self.tentativas += 1
+        if self.falhas > 0:
+            self.falhas -= 1
+            raise OSError("disco cheio")
+        self.gravadas.extend(operacoes)
+
+    def close(self):
+        self.fechado = True
+
+
+class TestWriteBehindStore(unittest.TestCase):
+    def abrir(self, interno, espera_inicial, espera_maxima=60):
+        erros = []
+        store = WriteBehindStore(interno, janela=0, on_error=erros.append)
+        store.ESPERA_INICIAL = espera_inicial
+        store.ESPERA_MAXIMA = espera_maxima
+        store.load()
+        return store, erros
+
+    def test_espera_crescente_e_recuperacao(self):
+        interno = ArmazenamentoFalho(falhas=3)
+        store, erros = self.abrir(interno, espera_inicial=0.2, espera_maxima=0.4)
+        store.put(pendencia(1))
+
+        aguardar(lambda: interno.tentativas >= 1)
+        # Durante a espera, flush falha na hora sem nova tentativa
+        with self.assertRaises(OSError):
+            store.flush()
+        self.assertEqual(interno.tentativas, 1)
+
+        aguardar(lambda: interno.gravadas)
+        self.assertEqual(interno.tentativas, 4)
+        self.assertEqual(store._espera, 0)
+        # A mesma falha repetida é informada uma vez só
+        self.assertEqual(erros, ["disco cheio"])
+        store.close()
+        self.assertTrue(interno.fechado)
+
+    def test_espera_limitada(self):
+        interno = ArmazenamentoFalho(falhas=10**6)
+        store, _ = self.abrir(interno, espera_inicial=0.01, espera_maxima=0.04)
+        store.put(pendencia(1))
+        aguardar(lambda: interno.tentativas >= 5)
+        self.assertEqual(store._espera, 0.04)
+        with self.assertRaises(OSError):
+            store.close()
+
+    def test_close_grava_sem_aguardar_a_espera(self):
+        interno = ArmazenamentoFalho(falhas=1)
+        store, _ = self.abrir(interno, espera_inicial=60)
+        store.put(pendencia(1))
+        aguardar(lambda: interno.tentativas == 1)
+        store.put(pendencia(2))
+
+        inicio = time.monotonic()
+        store.close()
+        self.assertLess(time.monotonic() - inicio, 5)
+        self.assertEqual(interno.tentativas, 2)
+        self.assertEqual(sorted(op[1]["id"] for op in interno.gravadas), [1, 2])
+        self.assertTrue(interno.fechado)
+
+    def test_close_falha_na_ultima_tentativa(self):
+        interno = ArmazenamentoFalho(falhas=2)
+        store, _ = self.abrir(interno, espera_inicial=60)
+        store.put(pendencia(1))
+        aguardar(lambda: interno.tentativas == 1)
+        with self.assertRaises(OSError):
+            store.close()
+        self.assertEqual(interno.tentativas, 2)
+        self.assertEqual(interno.gravadas, [])
+        # O armazenamento interno é fechado mesmo assim
+        self.assertTrue(interno.fechado)
+
+    def test_com_journal(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta, True)
+        json_path = os.path.join(pasta, "pendencias.json")
+        store = WriteBehindStore(JournalStore(json_path), janela=0.05)
+        store.load()
+        for i in range(1, 4):
+            store.put(pendencia(i))
+        store.put(pendencia(2, status="Finalizada"))
+        store.close()
+
+        journal = JournalStore(json_path)
+        data = journal.load(somente_leitura=True)
+        self.assertEqual(
+            [(p["id"], p["status"]) for p in data["pendencias"]],
+            [(1, "Pendente"), (2, "Finalizada"), (3, "Pendente")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,84 +1,816 @@
 import os
 import sys
+import json
 import time
+import random
+import hashlib
+import shlex
+import shutil
 import tempfile
+import threading
+import urllib.parse
+import urllib.request
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from binpatch import apply_patch_file, PatchError
 import subprocess
 from PyQt6.QtWidgets import QMessageBox, QProgressDialog, QApplication
-from PyQt6.QtCore import QThread, pyqtSignal, Qt
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, Qt
+
+
+def default_cache_dir():
+    """
+    Diretório local de cache do atualizador.
+
+    Returns:
+        str: %LOCALAPPDATA%\\POS-assistencia no Windows, ~/.cache/POS-assistencia nos demais.
+    """
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "POS-assistencia")
+
+
+class JitterRetry(Retry):
+    """Retry do urllib3 com backoff exponencial e jitter ("full jitter")"""
+
+    def get_backoff_time(self):
+        # Retry-After do servidor tem prioridade (tratado pelo próprio urllib3)
+        return random.uniform(0, super().get_backoff_time())
+
+
+def create_session(max_retries=3, backoff_factor=1.0, pool_size=4):
+    """
+    Cria uma sessão HTTP com keep-alive e novas tentativas automáticas.
+
+    Repete falhas de conexão e respostas 429/5xx com backoff exponencial
+    com jitter, respeitando o cabeçalho Retry-After.
+
+    Args:
+        max_retries (int): Tentativas extras por requisição.
+        backoff_factor (float): Base do backoff exponencial (segundos).
+        pool_size (int): Conexões mantidas por host.
+
+    Returns:
+        requests.Session: Sessão configurada.
+    """
+    retry = JitterRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def local_path(url):
+    """
+    Converte uma URL file:// ou um caminho simples em caminho local.
+
+    Args:
+        url (str): URL ou caminho (pasta local, unidade de rede, \\\\servidor\\pasta).
+
+    Returns:
+        str ou None: Caminho local, ou None para URLs http/https.
+    """
+    if not url:
+        return None
+    parsed = urllib.parse.urlparse(url)
+    if parsed.scheme in ("http", "https"):
+        return None
+    if parsed.scheme == "file":
+        path = urllib.request.url2pathname(parsed.path)
+        if parsed.netloc and parsed.netloc != "localhost":
+            # file://servidor/pasta -> compartilhamento de rede
+            path = "\\\\" + parsed.netloc + path if os.name == "nt" else "//" + parsed.netloc + path
+        return path
+    return url
+
+
+def _sha256_file(path):
+    """
+    Calcula o SHA-256 de um arquivo em blocos.
+
+    Returns:
+        hashlib: Objeto de hash (pode continuar recebendo dados).
+    """
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher
 
 
 class DownloadThread(QThread):
     """
-    Thread para download em background com progresso
+    Thread para download em background com progresso.
+
+    O arquivo é baixado para um .part no cache local, com os metadados
+    (URL, tamanho, ETag) ao lado; depois de um cancelamento, queda de rede
+    ou travamento, o download é retomado com uma requisição Range.
+
+    O SHA-256 é calculado sobre os próprios chunks, na mesma passada da
+    gravação, e comparado com o hash/tamanho publicados no version.json.
+
+    O tamanho do bloco lido cresce com a vazão medida, e o progresso só é
+    emitido quando o percentual inteiro muda (no máximo a cada
+    PROGRESS_INTERVAL segundos), junto com a velocidade e o tempo restante.
+
+    Para downloads em segundo plano, max_rate limita a banda (bytes/s) e
+    pause()/resume() suspendem a transferência sem perder a conexão.
     """
-    progress_updated = pyqtSignal(int)
+    MIN_CHUNK = 8 * 1024
+    MAX_CHUNK = 1024 * 1024
+    CHUNK_TARGET_SECONDS = 0.1
+    PROGRESS_INTERVAL = 0.1
+
+    # percentual (-1 se o tamanho é desconhecido), bytes/s, ETA em segundos (-1 se desconhecido)
+    progress_updated = pyqtSignal(int, float, float)
     download_completed = pyqtSignal(str)
     download_failed = pyqtSignal(str)
     download_cancelled = pyqtSignal()
     
-    def __init__(self, url):
+    def __init__(self, url, cache_dir=None, expected_sha256=None, expected_size=None, suffix=".exe",
+                 max_rate=None, session=None, timeout=(10, 30)):
         super().__init__()
         self.url = url
+        self.session = session or requests
+        self.timeout = timeout
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self.expected_size = int(expected_size) if expected_size else None
+        self.download_dir = os.path.join(cache_dir or default_cache_dir(), "downloads")
+        nome = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+        self.part_path = os.path.join(self.download_dir, f"update_{nome}{suffix}.part")
+        self.meta_path = self.part_path + ".json"
+        self.max_rate = max_rate
         self._cancelled = False
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         
     def run(self):
         try:
-            response = requests.get(self.url, timeout=30, stream=True)
-            response.raise_for_status()
-            
-            # Obter tamanho total do arquivo
-            total_size = int(response.headers.get('content-length', 0))
-            
-            # Salvar em arquivo temporário
-            with tempfile.NamedTemporaryFile(suffix=".exe", delete=False) as temp_file:
-                downloaded_size = 0
-                
-                for chunk in response.iter_content(chunk_size=8192):
-                    # Verificar se foi cancelado
-                    if self._cancelled:
-                        temp_file.close()
-                        os.unlink(temp_file.name)  # Deletar arquivo temporário
-                        self.download_cancelled.emit()
-                        return
-                    
-                    if chunk:
-                        temp_file.write(chunk)
-                        downloaded_size += len(chunk)
-                        
-                        # Calcular e emitir progresso
-                        if total_size > 0:
-                            progress = int((downloaded_size / total_size) * 100)
-                            self.progress_updated.emit(progress)
-                
-                # Verificar se foi cancelado antes de finalizar
+            os.makedirs(self.download_dir, exist_ok=True)
+
+            # Já baixado e verificado antes (ex.: em segundo plano)
+            if self._cached_download():
+                return
+
+            # A pausa fecha a conexão (um socket parado por minutos seria
+            # derrubado pelo servidor); ao retomar, o restante é pedido com Range
+            while True:
+                self._resume_event.wait()
                 if self._cancelled:
-                    temp_file.close()
-                    os.unlink(temp_file.name)  # Deletar arquivo temporário
                     self.download_cancelled.emit()
                     return
-                
-                temp_file.flush()
-                file_path = temp_file.name
-                
-                # Verificar se arquivo foi salvo corretamente
-                if not os.path.exists(file_path):
-                    self.download_failed.emit("Falha ao salvar arquivo temporário")
-                    return
-                
-                file_size = os.path.getsize(file_path)
-                if file_size == 0:
-                    self.download_failed.emit("Arquivo baixado está vazio")
+                if self._transfer():
                     return
-                
-                self.download_completed.emit(file_path)
-                
+
         except Exception as e:
+            # O parcial é mantido: a próxima tentativa continua de onde parou
             self.download_failed.emit(str(e))
+
+    def _transfer(self):
+        """
+        Baixa (ou continua baixando) para o arquivo parcial e finaliza.
+
+        Returns:
+            bool: False se parou por pausa (parcial gravado e conexão fechada);
+            True se terminou (concluído, falhou ou cancelado, já sinalizado).
+        """
+        # Retomar download parcial da mesma URL, se existir
+        meta = self._load_meta() or {}
+        offset = 0
+        if meta and os.path.exists(self.part_path):
+            offset = os.path.getsize(self.part_path)
+
+        if local_path(self.url) is not None:
+            read, close, offset, total_size = self._open_local(meta, offset)
+        else:
+            read, close, offset, total_size = self._open_http(meta, offset)
+
+        if read is None:
+            # Já estava completo (ex.: fechado antes de instalar)
+            self._finish(self._hash_partial(), offset)
+            return True
+
+        if offset > 0:
+            print(f"[DEBUG] Retomando download a partir de {offset} bytes")
+            mode = "ab"
+            # O prefixo já baixado entra no hash uma única vez
+            hasher = self._hash_partial()
+        else:
+            mode = "wb"
+            hasher = hashlib.sha256()
+
+        # Tamanho anunciado diferente do publicado: nem começa a baixar
+        if self.expected_size and total_size and total_size != self.expected_size:
+            close()
+            self._discard()
+            self.download_failed.emit(
+                f"Tamanho do arquivo no servidor ({total_size} bytes) difere do "
+                f"publicado ({self.expected_size} bytes)"
+            )
+            return True
+
+        with open(self.part_path, mode) as part_file:
+            downloaded_size = offset
+            chunk_size = self.MIN_CHUNK
+            self._start_progress(offset)
+            ritmo_inicio, ritmo_bytes = time.monotonic(), downloaded_size
+
+            while True:
+                # Verificar se foi cancelado (o parcial fica para retomar)
+                if self._cancelled:
+                    close()
+                    self.download_cancelled.emit()
+                    return True
+
+                if not self._resume_event.is_set():
+                    close()
+                    return False
+
+                inicio = time.monotonic()
+                chunk = read(chunk_size)
+                if not chunk:
+                    break
+
+                part_file.write(chunk)
+                hasher.update(chunk)
+                downloaded_size += len(chunk)
+
+                if self.expected_size and downloaded_size > self.expected_size:
+                    break
+
+                chunk_size = self._next_chunk_size(chunk_size, len(chunk), time.monotonic() - inicio)
+                self._report_progress(downloaded_size, total_size)
+
+                # Limite de banda: espera até o ritmo voltar ao máximo permitido
+                if self.max_rate:
+                    atraso = (downloaded_size - ritmo_bytes) / self.max_rate - (time.monotonic() - ritmo_inicio)
+                    if atraso > 0:
+                        time.sleep(min(atraso, 1.0))
+
+            self._report_progress(downloaded_size, total_size, force=True)
+            close()
+
+        # Verificar se foi cancelado antes de finalizar
+        if self._cancelled:
+            self.download_cancelled.emit()
+            return True
+
+        if total_size > 0 and downloaded_size < total_size:
+            self.download_failed.emit(
+                f"Download incompleto ({downloaded_size} de {total_size} bytes)"
+            )
+            return True
+
+        self._finish(hasher, downloaded_size)
+        return True
     
+    def _open_http(self, meta, offset):
+        """
+        Abre a resposta HTTP, pedindo só o restante com Range quando há parcial.
+
+        Args:
+            meta (dict): Metadados do download parcial.
+            offset (int): Bytes já baixados.
+
+        Returns:
+            tuple: (read, close, offset, total_size); read None se já estava
+            completo e offset 0 se o download recomeça do início.
+        """
+        headers = {}
+        if offset > 0:
+            headers["Range"] = f"bytes={offset}-"
+            validador = meta.get("etag") or meta.get("last_modified")
+            if validador:
+                # Se o arquivo mudou no servidor, vem o arquivo inteiro (200)
+                headers["If-Range"] = validador
+
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout, stream=True)
+
+        if response.status_code == 416 and offset > 0:
+            response.close()
+            if offset == meta.get("total_size"):
+                return None, None, offset, offset
+            # Parcial maior que o arquivo no servidor (corrompido, ou o arquivo
+            # mudou): repetir o mesmo Range falharia sempre, recomeçar do zero
+            print(f"[DEBUG] Parcial inválido ({offset} bytes, 416): recomeçando o download")
+            self._discard()
+            return self._open_http({}, 0)
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            total_size = self._total_from_content_range(response) or meta.get("total_size", 0)
+        else:
+            offset = 0
+            # Obter tamanho total do arquivo
+            total_size = int(response.headers.get('content-length', 0))
+            self._save_meta({
+                "url": self.url,
+                "total_size": total_size,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            })
+
+        def read(size):
+            return response.raw.read(size, decode_content=True)
+
+        return read, response.close, offset, total_size
+
+    def _open_local(self, meta, offset):
+        """
+        Abre o arquivo em uma pasta local ou compartilhamento de rede (espelho).
+
+        A data de modificação e o tamanho fazem o papel do ETag para retomar.
+
+        Args:
+            meta (dict): Metadados do download parcial.
+            offset (int): Bytes já copiados.
+
+        Returns:
+            tuple: (read, close, offset, total_size), como em _open_http.
+        """
+        source = open(local_path(self.url), "rb")
+        info = os.fstat(source.fileno())
+        total_size = info.st_size
+        validador = f"{info.st_mtime_ns}-{total_size}"
+
+        if offset > 0 and meta.get("etag") == validador and offset <= total_size:
+            if offset == total_size:
+                source.close()
+                return None, None, offset, total_size
+            source.seek(offset)
+        else:
+            offset = 0
+            self._save_meta({"url": self.url, "total_size": total_size, "etag": validador})
+
+        return source.read, source.close, offset, total_size
+
     def cancel(self):
         """Cancela o download"""
         self._cancelled = True
+        self._resume_event.set()
+
+    def pause(self):
+        """Suspende a transferência até resume()"""
+        self._resume_event.clear()
+
+    def resume(self):
+        """Retoma a transferência suspensa"""
+        self._resume_event.set()
+
+    def _cached_download(self):
+        """
+        Usa o arquivo final já presente no cache, se conferir com o SHA-256 publicado.
+
+        Returns:
+            bool: True se o download concluído foi emitido a partir do cache.
+        """
+        file_path = self.part_path[: -len(".part")]
+        if not self.expected_sha256 or not os.path.exists(file_path):
+            return False
+
+        if _sha256_file(file_path).hexdigest() != self.expected_sha256:
+            os.remove(file_path)
+            return False
+
+        print(f"[DEBUG] Atualização já baixada: {file_path}")
+        self.progress_updated.emit(100, 0.0, 0.0)
+        self.download_completed.emit(file_path)
+        return True
+
+    def _next_chunk_size(self, chunk_size, lidos, duracao):
+        """
+        Ajusta o tamanho do próximo bloco para ~CHUNK_TARGET_SECONDS de leitura.
+
+        Args:
+            chunk_size (int): Tamanho pedido na última leitura.
+            lidos (int): Bytes efetivamente recebidos.
+            duracao (float): Tempo da leitura em segundos.
+
+        Returns:
+            int: Próximo tamanho de bloco (potência de 2 entre MIN_CHUNK e MAX_CHUNK).
+        """
+        if lidos < chunk_size:
+            return chunk_size
+        if duracao <= 0 or lidos / duracao * self.CHUNK_TARGET_SECONDS > chunk_size:
+            return min(chunk_size * 2, self.MAX_CHUNK)
+        if lidos / duracao * self.CHUNK_TARGET_SECONDS < chunk_size / 4:
+            return max(chunk_size // 2, self.MIN_CHUNK)
+        return chunk_size
+
+    def _start_progress(self, offset):
+        """Zera o estado de medição de progresso"""
+        agora = time.monotonic()
+        self._last_emit = 0.0
+        self._last_percent = None
+        self._speed_time = agora
+        self._speed_bytes = offset
+        self._speed = 0.0
+
+    def _report_progress(self, downloaded_size, total_size, force=False):
+        """
+        Emite progresso, velocidade e ETA respeitando a cadência.
+
+        Args:
+            downloaded_size (int): Bytes baixados até agora.
+            total_size (int): Tamanho total (0 se desconhecido).
+            force (bool): Emite mesmo sem mudança de percentual.
+        """
+        agora = time.monotonic()
+
+        # Velocidade por média móvel exponencial, medida a cada janela
+        janela = agora - self._speed_time
+        if janela >= 0.5:
+            instantanea = (downloaded_size - self._speed_bytes) / janela
+            self._speed = instantanea if self._speed == 0 else 0.7 * self._speed + 0.3 * instantanea
+            self._speed_time = agora
+            self._speed_bytes = downloaded_size
+
+        if total_size > 0:
+            percent = min(int(downloaded_size * 100 / total_size), 100)
+        else:
+            percent = -1
+
+        if not force:
+            if agora - self._last_emit < self.PROGRESS_INTERVAL:
+                return
+            if total_size > 0 and percent == self._last_percent:
+                return
+
+        if total_size > 0 and self._speed > 0:
+            eta = (total_size - downloaded_size) / self._speed
+        else:
+            eta = -1.0
+
+        self._last_emit = agora
+        self._last_percent = percent
+        self.progress_updated.emit(percent, self._speed, eta)
+
+    def _finish(self, hasher, size):
+        """
+        Confere tamanho e SHA-256, move o arquivo para o nome final e avisa a interface.
+
+        Args:
+            hasher: Objeto hashlib com todos os bytes do arquivo.
+            size (int): Tamanho total baixado.
+        """
+        file_path = self.part_path[: -len(".part")]
+
+        # Verificar se arquivo foi salvo corretamente
+        if size == 0:
+            self._discard()
+            self.download_failed.emit("Arquivo baixado está vazio")
+            return
+
+        # Arquivo truncado ou corrompido: descarta para não retomar em cima dele
+        if self.expected_size and size != self.expected_size:
+            self._discard()
+            self.download_failed.emit(
+                f"Tamanho inválido: {size} bytes (esperado {self.expected_size})"
+            )
+            return
+
+        digest = hasher.hexdigest()
+        print(f"[DEBUG] SHA-256 do download: {digest}")
+        if self.expected_sha256 and digest != self.expected_sha256:
+            self._discard()
+            self.download_failed.emit(
+                "O arquivo baixado não confere com o SHA-256 publicado; "
+                "a atualização não será instalada"
+            )
+            return
+
+        os.replace(self.part_path, file_path)
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+        self.download_completed.emit(file_path)
+
+    def _hash_partial(self):
+        """
+        Calcula o SHA-256 do download parcial existente.
+
+        Returns:
+            hashlib: Objeto de hash pronto para receber o restante dos chunks.
+        """
+        return _sha256_file(self.part_path)
+
+    def _discard(self):
+        """Remove o download parcial e seus metadados"""
+        for path in (self.part_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _load_meta(self):
+        """
+        Lê os metadados do download parcial.
+
+        Returns:
+            dict ou None: Metadados, se forem da mesma URL.
+        """
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("url") == self.url:
+                return meta
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _save_meta(self, meta):
+        """Grava os metadados do download parcial"""
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @staticmethod
+    def _total_from_content_range(response):
+        """
+        Extrai o tamanho total do cabeçalho Content-Range ("bytes a-b/total").
+
+        Returns:
+            int ou None: Tamanho total, se informado.
+        """
+        content_range = response.headers.get("Content-Range", "")
+        total = content_range.rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+
+
+class PatchThread(QThread):
+    """Thread que aplica um patch binário ao executável atual e verifica o resultado"""
+    patch_completed = pyqtSignal(str)
+    patch_failed = pyqtSignal(str)
+
+    def __init__(self, old_exe, patch_path, expected_sha256, expected_size=None):
+        super().__init__()
+        self.old_exe = old_exe
+        self.patch_path = patch_path
+        self.new_path = os.path.splitext(patch_path)[0] + ".exe"
+        self.expected_sha256 = expected_sha256
+        self.expected_size = expected_size
+
+    def run(self):
+        try:
+            apply_patch_file(
+                self.old_exe,
+                self.patch_path,
+                self.new_path,
+                expected_sha256=self.expected_sha256,
+                expected_size=self.expected_size,
+            )
+            self.patch_completed.emit(self.new_path)
+        except (OSError, PatchError) as e:
+            self.patch_failed.emit(str(e))
+        finally:
+            # O patch só serve para esta versão de origem; não vale retomar
+            if os.path.exists(self.patch_path):
+                os.remove(self.patch_path)
+
+
+class UpdateDownloader(QObject):
+    """
+    Obtém a nova versão verificada: patch binário, se houver, ou executável completo.
+
+    Usado pela janela de progresso e pelo download em segundo plano; qualquer
+    falha do patch cai no download completo.
+    """
+    progress_updated = pyqtSignal(int, float, float)
+    status_changed = pyqtSignal(str)
+    completed = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, updater, download_url, expected_sha256=None, expected_size=None,
+                 patch_info=None, max_rate=None, priority=QThread.Priority.InheritPriority,
+                 version=None, parent=None):
+        super().__init__(parent)
+        self.updater = updater
+        self.download_url = download_url
+        self.version = version
+        self._fontes = []
+        self.expected_sha256 = expected_sha256
+        self.expected_size = expected_size
+        self.patch_info = patch_info
+        self.max_rate = max_rate
+        self.priority = priority
+        self._download = None
+        self._patch = None
+        # Toda thread iniciada fica referenciada até "finished": ao trocar de
+        # origem, a anterior ainda pode estar saindo do run()
+        self._threads = set()
+        self._paused = False
+        self._cancelled = False
+
+    def start(self):
+        """Inicia pelo patch (se houver) ou pelo executável completo"""
+        if self.patch_info:
+            self._iniciar_patch()
+        else:
+            self._iniciar_completo()
+
+    def pause(self):
+        """Suspende a transferência (ex.: usuário ativo)"""
+        self._paused = True
+        if self._download is not None:
+            self._download.pause()
+
+    def resume(self):
+        """Retoma a transferência suspensa"""
+        self._paused = False
+        if self._download is not None:
+            self._download.resume()
+
+    def cancel(self):
+        """Cancela; o download parcial fica no cache para ser retomado"""
+        self._cancelled = True
+        if self._download is not None:
+            self._download.cancel()
+
+    def is_running(self):
+        """Indica se ainda há download ou patch em andamento"""
+        return any(t.isRunning() for t in list(self._threads))
+
+    def wait(self, msecs):
+        """
+        Aguarda as threads terminarem.
+
+        Returns:
+            bool: True se terminaram dentro do prazo.
+        """
+        return all(t.wait(msecs) for t in list(self._threads))
+
+    def _iniciar_completo(self, motivo=None):
+        """Baixa o executável completo (espelho primeiro, depois a URL publicada)"""
+        if motivo:
+            print(f"[DEBUG] Patch indisponível ({motivo}); baixando executável completo")
+        self._fontes = self.updater.download_sources(self.download_url, self.version)
+        self._proxima_fonte()
+
+    def _proxima_fonte(self, motivo=None):
+        """Tenta a próxima origem do executável completo"""
+        if motivo:
+            print(f"[DEBUG] Origem falhou ({motivo})")
+        if self._cancelled:
+            self.cancelled.emit()
+            return
+        if not self._fontes:
+            self.failed.emit(motivo or "Nenhuma origem disponível")
+            return
+
+        fonte = self._fontes.pop(0)
+        self.status_changed.emit(
+            "Copiando atualização do espelho..." if local_path(fonte) is not None else "Baixando atualização..."
+        )
+        thread = DownloadThread(
+            fonte,
+            cache_dir=self.updater.cache_dir,
+            expected_sha256=self.expected_sha256,
+            expected_size=self.expected_size,
+            max_rate=None if local_path(fonte) is not None else self.max_rate,
+            session=self.updater.session,
+            timeout=self.updater.timeout,
+        )
+        on_failed = self._proxima_fonte if self._fontes else self.failed.emit
+        self._conectar(thread, lambda caminho: self._completo_concluido(fonte, caminho), on_failed)
+
+    def _completo_concluido(self, fonte, file_path):
+        """Publica no espelho o que veio da internet e repassa o executável"""
+        if local_path(fonte) is None:
+            self.updater.publish_to_mirror(file_path, fonte, self.version, self.expected_sha256)
+        self.completed.emit(file_path)
+
+    def _iniciar_patch(self):
+        """Baixa o patch binário (ou usa o resultado já aplicado e verificado)"""
+        print(f"[DEBUG] Usando patch binário: {self.patch_info['url']}")
+        thread = DownloadThread(
+            self.patch_info["url"],
+            cache_dir=self.updater.cache_dir,
+            expected_sha256=self.patch_info.get("sha256"),
+            expected_size=self.patch_info.get("size"),
+            suffix=".patch",
+            max_rate=self.max_rate,
+            session=self.updater.session,
+            timeout=self.updater.timeout,
+        )
+
+        patched = os.path.splitext(thread.part_path[: -len(".part")])[0] + ".exe"
+        if os.path.exists(patched) and _sha256_file(patched).hexdigest() == self.expected_sha256.lower():
+            print(f"[DEBUG] Atualização já aplicada: {patched}")
+            self.completed.emit(patched)
+            return
+
+        self.status_changed.emit("Baixando atualização (patch)...")
+        self._conectar(thread, self._aplicar_patch, self._iniciar_completo)
+
+    def _conectar(self, thread, on_completed, on_failed):
+        """Liga os sinais de um DownloadThread e o inicia"""
+        thread.progress_updated.connect(self.progress_updated)
+        thread.download_completed.connect(on_completed)
+        thread.download_failed.connect(on_failed)
+        thread.download_cancelled.connect(self.cancelled)
+        if self._paused:
+            thread.pause()
+        self._download = thread
+        self._iniciar_thread(thread)
+
+    def _aplicar_patch(self, patch_path):
+        """Aplica o patch baixado ao executável atual"""
+        self.status_changed.emit("Aplicando atualização...")
+        thread = PatchThread(sys.executable, patch_path, self.expected_sha256, self.expected_size)
+        thread.patch_completed.connect(self._patch_concluido)
+        thread.patch_failed.connect(self._iniciar_completo)
+        self._patch = thread
+        self._iniciar_thread(thread)
+
+    def _iniciar_thread(self, thread):
+        """Inicia a thread mantendo a referência até ela terminar de fato"""
+        self._threads.add(thread)
+        thread.finished.connect(lambda: self._threads.discard(thread))
+        thread.start(self.priority)
+
+    def _patch_concluido(self, file_path):
+        """Repassa o executável gerado pelo patch (se não houve cancelamento)"""
+        if self._cancelled:
+            self.cancelled.emit()
+        else:
+            self.completed.emit(file_path)
+
+
+class UpdateCheckThread(QObject):
+    """
+    Verifica atualizações em uma thread daemon, sem bloquear a interface.
+
+    Não é um QThread: a consulta pode ficar presa no socket até o timeout,
+    e uma thread daemon não impede nem trava o encerramento do programa
+    (nunca é preciso terminate()). Os sinais chegam à interface pela fila
+    de eventos do Qt.
+    """
+    update_available = pyqtSignal(object)
+    no_update = pyqtSignal()
+    check_failed = pyqtSignal(str)
+
+    def __init__(self, updater, max_retries=2, force=False, parent=None):
+        super().__init__(parent)
+        self.updater = updater
+        self.max_retries = max_retries
+        self.force = force  # Ignora o intervalo mínimo entre consultas
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia a verificação"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def isRunning(self):
+        """Indica se a verificação ainda está em andamento"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, msecs=None):
+        """
+        Aguarda o término da verificação.
+
+        Returns:
+            bool: True se terminou dentro do prazo.
+        """
+        if self._thread is None:
+            return True
+        self._thread.join(None if msecs is None else msecs / 1000)
+        return not self._thread.is_alive()
+
+    def run(self):
+        # Cópia para o espelho interrompida no encerramento anterior
+        self.updater.resume_mirror_publish()
+        try:
+            version_info = self.updater.check_for_updates_with_retry(
+                max_retries=self.max_retries,
+                cancel_event=self._cancel_event,
+                force=self.force,
+            )
+        except Exception as e:
+            if not self._cancel_event.is_set():
+                self.check_failed.emit(str(e))
+            return
+
+        # Resultado descartado se a janela já foi fechada
+        if self._cancel_event.is_set():
+            return
+        if version_info:
+            self.update_available.emit(version_info)
+        else:
+            self.no_update.emit()
+
+    def cancel(self):
+        """Cancela a verificação (interrompe a espera entre tentativas e descarta o resultado)"""
+        self._cancel_event.set()
 
 
 class Updater:
@@ -86,10 +818,49 @@ class Updater:
     Gerencia a verificação e atualização do aplicativo.
     """
     
-    def __init__(self, current_version, version_url=None):
+    def __init__(self, current_version, version_url=None, cache_dir=None, check_interval=6 * 3600, mirror=None,
+                 connect_timeout=10, read_timeout=30, max_retries=3):
+        """
+        Args:
+            current_version (str): Versão em execução.
+            version_url (str): URL do version.json (http, file:// ou caminho).
+            cache_dir (str): Diretório do cache local (padrão: default_cache_dir()).
+            check_interval (int): Segundos mínimos entre consultas à rede.
+            mirror (str): Pasta local/compartilhamento de rede (ou file://) usada
+                antes do GitHub para o version.json e os executáveis.
+            connect_timeout (float): Tempo máximo para conectar (segundos).
+            read_timeout (float): Tempo máximo sem receber dados (segundos).
+            max_retries (int): Novas tentativas por requisição HTTP.
+        """
         self.current_version = current_version
         # URL do arquivo version.json no GitHub
         self.version_url = version_url or "https://raw.githubusercontent.com/DreamerJP/POS-assistencia/refs/heads/main/version.json"
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.check_interval = check_interval
+        self.version_cache_path = os.path.join(self.cache_dir, "version_cache.json")
+        self.mirror_dir = local_path(mirror) if mirror else None
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self._session = None
+        # Cópia para o espelho interrompida, retomada na próxima execução
+        self.mirror_publish_path = os.path.join(self.cache_dir, "espelho_pendente.json")
+        self._publicacao_lock = threading.Lock()
+        self._publicacao = None  # Cópia para o espelho em andamento
+        self._arquivo_publicado = None
+        self._remover_apos_publicar = False  # Já instalado: remover do cache ao terminar
+
+    @property
+    def session(self):
+        """Sessão HTTP compartilhada (version.json e downloads), criada no primeiro uso"""
+        if self._session is None:
+            self._session = create_session(max_retries=self.max_retries)
+        return self._session
+
+    def close(self):
+        """Fecha as conexões da sessão HTTP (uma nova é criada se necessário)"""
+        session, self._session = self._session, None
+        if session is not None:
+            session.close()
     
     def check_for_updates(self):
         """
@@ -99,15 +870,7 @@ class Updater:
             dict ou None: Informações da nova versão, se disponível.
         """
         try:
-            response = requests.get(self.version_url, timeout=10)
-            response.raise_for_status()
-            version_info = response.json()
-            
-            # Compara versões (string comparison funciona para versionamento simples)
-            if version_info["version"] > self.current_version:
-                return version_info
-            return None
-            
+            return self._fetch_update_info()
         except requests.RequestException as e:
             print(f"Erro de rede ao verificar atualizações: {e}")
             return None
@@ -115,17 +878,354 @@ class Updater:
             print(f"Erro ao verificar atualizações: {e}")
             return None
     
-    def download_and_install(self, download_url, parent_widget=None):
+    def _fetch_update_info(self, force=False):
+        """
+        Consulta a URL de versão sem tratar erros de rede.
+
+        Usa GET condicional (ETag/Last-Modified) e, dentro do intervalo
+        mínimo entre consultas, o resultado em cache sem acessar a rede.
+
+        Args:
+            force (bool): Consulta a rede mesmo dentro do intervalo.
+
+        Returns:
+            dict ou None: Informações da nova versão, se disponível.
+
+        Raises:
+            requests.RequestException: Falha de rede (permite nova tentativa).
+        """
+        # Espelho local primeiro; GitHub só se ele não estiver acessível
+        version_info = self._fetch_local_manifest()
+        if version_info is None:
+            version_info = self._fetch_remote_manifest(force)
+
+        # Compara versões (string comparison funciona para versionamento simples)
+        if version_info["version"] > self.current_version:
+            return version_info
+        return None
+
+    def _fetch_local_manifest(self):
+        """
+        Lê o version.json do espelho local (ou da version_url, se for local).
+
+        URLs relativas de download/patch são resolvidas a partir da pasta do
+        version.json, para que o espelho possa ser copiado para qualquer lugar.
+
+        Returns:
+            dict ou None: Conteúdo do version.json, ou None se indisponível.
+        """
+        candidatos = []
+        if self.mirror_dir:
+            candidatos.append(os.path.join(self.mirror_dir, "version.json"))
+        if local_path(self.version_url) is not None:
+            candidatos.append(local_path(self.version_url))
+
+        for caminho in candidatos:
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    version_info = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[DEBUG] Espelho indisponível ({caminho}): {e}")
+                continue
+
+            base = os.path.dirname(os.path.abspath(caminho))
+            version_info["download_url"] = self._resolve_url(version_info.get("download_url"), base)
+            for patch_info in version_info.get("patches", {}).values():
+                patch_info["url"] = self._resolve_url(patch_info.get("url"), base)
+            print(f"[DEBUG] version.json lido do espelho: {caminho}")
+            return version_info
+        return None
+
+    @staticmethod
+    def _resolve_url(url, base):
+        """
+        Resolve um caminho relativo de um version.json local.
+
+        Args:
+            url (str): URL ou caminho informado no version.json.
+            base (str): Pasta do version.json.
+
+        Returns:
+            str: URL http/file ou caminho absoluto.
+        """
+        caminho = local_path(url)
+        if caminho is None or urllib.parse.urlparse(url).scheme == "file" or os.path.isabs(caminho):
+            return url
+        return os.path.join(base, caminho)
+
+    def _fetch_remote_manifest(self, force=False):
+        """
+        Consulta a version_url remota com GET condicional e cache local.
+
+        Args:
+            force (bool): Consulta a rede mesmo dentro do intervalo.
+
+        Returns:
+            dict: Conteúdo do version.json.
+
+        Raises:
+            requests.RequestException: Falha de rede.
+        """
+        cache = self._load_version_cache()
+        version_info = cache.get("version_info")
+        recente = time.time() - cache.get("checked_at", 0) < self.check_interval
+
+        if force or not recente or version_info is None:
+            headers = {}
+            if version_info is not None:
+                if cache.get("etag"):
+                    headers["If-None-Match"] = cache["etag"]
+                if cache.get("last_modified"):
+                    headers["If-Modified-Since"] = cache["last_modified"]
+
+            response = self.session.get(self.version_url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                print("[DEBUG] version.json não mudou (304)")
+            else:
+                response.raise_for_status()
+                version_info = response.json()
+                cache["etag"] = response.headers.get("ETag")
+                cache["last_modified"] = response.headers.get("Last-Modified")
+                cache["version_info"] = version_info
+
+            cache["checked_at"] = time.time()
+            self._save_version_cache(cache)
+        else:
+            print("[DEBUG] Usando version.json em cache")
+
+        return version_info
+
+    def _load_version_cache(self):
+        """
+        Lê o cache do version.json (vazio se ausente, inválido ou de outra URL).
+
+        Returns:
+            dict: Campos etag, last_modified, checked_at e version_info.
+        """
+        try:
+            with open(self.version_cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("url") == self.version_url:
+                return cache
+        except (OSError, ValueError):
+            pass
+        return {"url": self.version_url}
+
+    def _save_version_cache(self, cache):
+        """
+        Grava o cache do version.json de forma atômica.
+
+        Args:
+            cache (dict): Conteúdo do cache.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = self.version_cache_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(temp_path, self.version_cache_path)
+        except OSError as e:
+            print(f"Erro ao salvar cache de versão: {e}")
+
+    def download_sources(self, download_url, version=None):
+        """
+        Lista as origens do executável, da preferida para a última opção.
+
+        Se houver espelho, a cópia em "<espelho>/<versão>/<arquivo>" vem antes
+        da URL publicada (o SHA-256 do version.json continua sendo conferido).
+
+        Args:
+            download_url (str): URL publicada no version.json.
+            version (str): Versão a baixar.
+
+        Returns:
+            list: URLs/caminhos a tentar em ordem.
+        """
+        fontes = []
+        espelhado = self._mirror_file(download_url, version)
+        if espelhado and os.path.exists(espelhado):
+            fontes.append(espelhado)
+        fontes.append(download_url)
+        return fontes
+
+    def publish_to_mirror(self, file_path, download_url, version=None, verified_sha256=None):
+        """
+        Copia um executável verificado para o espelho, para as demais estações.
+
+        Só publica o que foi conferido com o sha256 do version.json (sem ele,
+        um download corrompido seria distribuído para toda a rede). A cópia
+        roda em uma thread daemon: o compartilhamento pode ser lento e não
+        deve travar a interface. Falhas (ex.: compartilhamento só leitura)
+        são apenas registradas; uma cópia interrompida pelo encerramento do
+        programa é retomada na próxima execução (resume_mirror_publish).
+
+        Args:
+            file_path (str): Executável baixado e verificado.
+            download_url (str): URL de onde foi baixado.
+            version (str): Versão do executável.
+            verified_sha256 (str): sha256 publicado com o qual o arquivo foi conferido.
+        """
+        if not verified_sha256:
+            print("[DEBUG] Executável sem sha256 publicado; não será copiado para o espelho")
+            return
+        destino = self._mirror_file(download_url, version)
+        if not destino or os.path.exists(destino):
+            return
+        pendente = {"arquivo": file_path, "destino": destino, "versao": version, "sha256": verified_sha256}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.mirror_publish_path, "w", encoding="utf-8") as f:
+                json.dump(pendente, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"[DEBUG] Não foi possível registrar a publicação pendente: {e}")
+        self._iniciar_publicacao(file_path, destino)
+
+    def resume_mirror_publish(self):
+        """
+        Retoma a cópia para o espelho interrompida na execução anterior.
+
+        O arquivo do cache é conferido de novo com o sha256 registrado antes
+        da cópia e, se a versão já estiver instalada, removido ao final.
+        """
+        try:
+            with open(self.mirror_publish_path, "r", encoding="utf-8") as f:
+                pendente = json.load(f)
+            arquivo = pendente["arquivo"]
+            destino = pendente["destino"]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[DEBUG] Publicação pendente ignorada: {e}")
+            self._remover_publicacao_pendente()
+            return
+
+        if not self.mirror_dir or not os.path.exists(arquivo) or os.path.exists(destino):
+            self._remover_publicacao_pendente()
+            if os.path.exists(arquivo) and pendente.get("versao") == self.current_version:
+                self._remover_do_cache(arquivo)
+            return
+        with self._publicacao_lock:
+            if self._publicacao is not None:
+                return
+        print(f"[DEBUG] Retomando publicação no espelho: {destino}")
+        self._iniciar_publicacao(
+            arquivo,
+            destino,
+            sha256=pendente.get("sha256"),
+            remover=pendente.get("versao") == self.current_version,
+        )
+
+    def _iniciar_publicacao(self, file_path, destino, sha256=None, remover=False):
+        """Inicia a thread de cópia para o espelho"""
+        thread = threading.Thread(target=self._publicar, args=(file_path, destino, sha256), daemon=True)
+        with self._publicacao_lock:
+            self._publicacao = thread
+            self._arquivo_publicado = file_path
+            self._remover_apos_publicar = remover
+        thread.start()
+
+    def _publicar(self, file_path, destino, sha256=None):
+        """Copia para o espelho e faz a limpeza (executado na thread de publicação)"""
+        if sha256 and _sha256_file(file_path).hexdigest() != sha256.lower():
+            print(f"[DEBUG] Arquivo do cache alterado; não será publicado: {file_path}")
+        else:
+            self._copiar_para_espelho(file_path, destino)
+        # Concluída (com sucesso ou não): nada a retomar na próxima execução
+        self._remover_publicacao_pendente()
+        with self._publicacao_lock:
+            remover = self._remover_apos_publicar
+            self._publicacao = None
+            self._arquivo_publicado = None
+            self._remover_apos_publicar = False
+        if remover:
+            self._remover_do_cache(file_path)
+
+    @staticmethod
+    def _copiar_para_espelho(file_path, destino):
+        """Copia o executável para o espelho (executado na thread de publicação)"""
+        if os.path.exists(destino):
+            return
+        try:
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            temp_path = f"{destino}.{os.getpid()}.tmp"
+            shutil.copyfile(file_path, temp_path)
+            os.replace(temp_path, destino)
+            print(f"[DEBUG] Atualização publicada no espelho: {destino}")
+        except OSError as e:
+            print(f"Erro ao publicar atualização no espelho: {e}")
+
+    def _remover_publicacao_pendente(self):
+        try:
+            os.remove(self.mirror_publish_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[DEBUG] Não foi possível remover {self.mirror_publish_path}: {e}")
+
+    @staticmethod
+    def _remover_do_cache(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"[DEBUG] Não foi possível remover {path}: {e}")
+
+    def _mirror_file(self, download_url, version):
+        """
+        Caminho da cópia de um executável remoto no espelho.
+
+        Returns:
+            str ou None: "<espelho>/<versão>/<arquivo>", ou None sem espelho.
+        """
+        if not self.mirror_dir or not version or local_path(download_url) is not None:
+            return None
+        nome = os.path.basename(urllib.parse.urlparse(download_url).path) or "POS.exe"
+        return os.path.join(self.mirror_dir, str(version), nome)
+
+    def find_patch(self, version_info):
+        """
+        Procura um patch binário da versão atual para a nova versão.
+
+        O version.json pode listar, em "patches", um patch por versão de
+        origem: {"1.3": {"url": ..., "sha256": ..., "size": ...}}. O patch só
+        é usado no executável empacotado e quando o resultado pode ser
+        verificado pelo sha256 da nova versão.
+
+        Args:
+            version_info (dict): Conteúdo do version.json.
+
+        Returns:
+            dict ou None: Informações do patch, se aplicável.
+        """
+        if not getattr(sys, "frozen", False) or not version_info.get("sha256"):
+            return None
+        patch_info = version_info.get("patches", {}).get(self.current_version)
+        if patch_info and patch_info.get("url"):
+            return patch_info
+        return None
+
+    def download_and_install(self, download_url, parent_widget=None, expected_sha256=None, expected_size=None, patch_info=None, version=None,
+                             on_downloaded=None):
         """
         Faz o download do novo executável e executa a substituização.
+
+        Com patch_info, baixa e aplica o patch binário ao executável atual;
+        qualquer falha no patch ou na verificação cai no download completo.
         
         Args:
             download_url (str): URL para download do novo executável.
             parent_widget: Widget pai para a janela de progresso.
+            expected_sha256 (str): SHA-256 publicado no version.json (opcional).
+            expected_size (int): Tamanho em bytes publicado no version.json (opcional).
+            patch_info (dict): Patch retornado por find_patch (opcional).
+            version (str): Versão a instalar (localiza a cópia no espelho).
+            on_downloaded (callable): Recebe o executável baixado em vez de
+                instalar na hora (ex.: para instalar ao fechar a janela).
         """
         try:
             current_exe = sys.executable
             print(f"[DEBUG] Caminho atual: {current_exe}")
+            if not expected_sha256:
+                print("[DEBUG] version.json sem sha256; download não será verificado")
             
             # Criar janela de progresso
             progress_dialog = QProgressDialog("Baixando atualização...", "Cancelar", 0, 100, parent_widget)
@@ -134,18 +1234,36 @@ class Updater:
             progress_dialog.setAutoClose(False)
             progress_dialog.setAutoReset(False)
             progress_dialog.setMinimumDuration(0)
+
+            downloader = UpdateDownloader(
+                self,
+                download_url,
+                expected_sha256=expected_sha256,
+                expected_size=expected_size,
+                patch_info=patch_info,
+                version=version,
+                parent=parent_widget,  # Sobrevive ao diálogo até as threads terminarem
+            )
+            titulo = {"texto": "Baixando atualização..."}
+
+            def on_status(texto):
+                titulo["texto"] = texto
+                progress_dialog.setLabelText(texto)
             
-            # Criar thread de download
-            download_thread = DownloadThread(download_url)
-            
-            def on_progress(progress):
-                progress_dialog.setValue(progress)
-                progress_dialog.setLabelText("Baixando atualização...")
+            def on_progress(progress, speed, eta):
+                if progress >= 0:
+                    progress_dialog.setValue(progress)
+                progress_dialog.setLabelText(
+                    f"{titulo['texto']}\n" + self._format_download_status(speed, eta)
+                )
             
             def on_completed(file_path):
                 progress_dialog.close()
                 print(f"[DEBUG] Download concluído: {file_path}")
-                self._install_update(current_exe, file_path)
+                if on_downloaded is not None:
+                    on_downloaded(file_path)
+                else:
+                    self._install_update(current_exe, file_path)
             
             def on_failed(error):
                 progress_dialog.close()
@@ -156,73 +1274,223 @@ class Updater:
                 progress_dialog.close()
                 print("[DEBUG] Download cancelado pelo usuário")
             
-            def on_cancel_clicked():
-                download_thread.cancel()
-            
             # Conectar sinais
-            download_thread.progress_updated.connect(on_progress)
-            download_thread.download_completed.connect(on_completed)
-            download_thread.download_failed.connect(on_failed)
-            download_thread.download_cancelled.connect(on_cancelled)
+            downloader.status_changed.connect(on_status)
+            downloader.progress_updated.connect(on_progress)
+            downloader.completed.connect(on_completed)
+            downloader.failed.connect(on_failed)
+            downloader.cancelled.connect(on_cancelled)
             
             # Conectar cancelamento do diálogo
-            progress_dialog.canceled.connect(on_cancel_clicked)
+            progress_dialog.canceled.connect(downloader.cancel)
             
             # Iniciar download
-            download_thread.start()
+            downloader.start()
             progress_dialog.exec()
             
         except Exception as e:
             print(f"Falha crítica na atualização: {str(e)}")
             QMessageBox.critical(parent_widget, "Erro de Atualização", f"Detalhes: {str(e)}")
     
-    def _install_update(self, current_exe, new_exe_path):
+    @staticmethod
+    def _format_download_status(speed, eta):
+        """
+        Formata velocidade e tempo restante para a janela de progresso.
+
+        Args:
+            speed (float): Velocidade em bytes/s.
+            eta (float): Tempo restante em segundos (negativo se desconhecido).
+
+        Returns:
+            str: Texto como "1.2 MB/s - restam 0:35".
+        """
+        if speed <= 0:
+            return "Calculando velocidade..."
+        if speed >= 1024 * 1024:
+            texto = f"{speed / (1024 * 1024):.1f} MB/s"
+        else:
+            texto = f"{speed / 1024:.0f} KB/s"
+        if eta >= 0:
+            minutos, segundos = divmod(int(eta), 60)
+            texto += f" - restam {minutos}:{segundos:02d}"
+        return texto
+
+    def install_downloaded(self, new_exe_path):
+        """
+        Instala uma atualização já baixada e verificada (ex.: em segundo plano).
+
+        Não encerra a aplicação: o script de troca espera o processo sair, e
+        o chamador encerra pelo fluxo normal (depois de gravar o pendente).
+
+        Args:
+            new_exe_path (str): Caminho do novo executável no cache.
+
+        Returns:
+            bool: True se o script de troca foi iniciado.
+        """
+        return self._install_update(sys.executable, new_exe_path, exit_app=False)
+
+    def _install_update(self, current_exe, new_exe_path, exit_app=True):
         """
         Instala a atualização após o download.
+
+        O novo executável é copiado para "<exe>.new" na mesma pasta do atual
+        (assim a troca final é um rename atômico no mesmo volume). O script
+        de troca espera o processo atual terminar pelo PID, renomeia o
+        executável atual para "<exe>.old" (mantido para rollback), coloca o
+        novo no lugar e reinicia a aplicação imediatamente.
         
         Args:
             current_exe (str): Caminho do executável atual.
             new_exe_path (str): Caminho do novo executável.
+            exit_app (bool): Encerra a aplicação logo após iniciar o script.
+
+        Returns:
+            bool: True se o script de troca foi iniciado (quando não encerra).
         """
         try:
+            if not getattr(sys, "frozen", False):
+                QMessageBox.warning(
+                    None,
+                    "Atualização",
+                    "A instalação automática só está disponível no executável.\n"
+                    f"Arquivo baixado: {new_exe_path}",
+                )
+                return False
+
             print(f"[DEBUG] Tamanho do arquivo: {os.path.getsize(new_exe_path)} bytes")
-            
-            # Gera e valida script de atualização
-            bat_content = self.generate_bat_script(current_exe, new_exe_path)
-            bat_path = self.write_and_validate_bat(bat_content, current_exe, new_exe_path)
+
+            # Deixa o novo executável pronto ao lado do atual
+            staged_exe = self.stage_update(current_exe, new_exe_path)
+            pids = self._pids_to_wait()
             
             # Executa script de atualização
             print("Iniciando processo de atualização...")
-            print(f"[DEBUG] Executando script: {bat_path}")
             print(f"[DEBUG] Executável atual: {current_exe}")
-            print(f"[DEBUG] Novo executável: {new_exe_path}")
+            print(f"[DEBUG] Novo executável: {staged_exe}")
+            print(f"[DEBUG] Aguardando PIDs: {pids}")
+            self.launch_swap_script(current_exe, staged_exe, pids)
             
-            # Executar script
-            subprocess.Popen([bat_path], shell=True)
-            
-            # Aguarda um momento para o script iniciar
-            time.sleep(2)
-            
-            # Encerra aplicação atual
-            sys.exit(0)
+            # Encerra aplicação atual (o script espera o PID sair)
+            if exit_app:
+                sys.exit(0)
+            return True
             
         except Exception as e:
             print(f"Falha na instalação: {str(e)}")
             QMessageBox.critical(None, "Erro de Instalação", f"Detalhes: {str(e)}")
+            return False
+
+    def stage_update(self, current_exe, new_exe_path):
+        """
+        Copia o novo executável para "<exe>.new" na pasta do executável atual.
+
+        Args:
+            current_exe (str): Caminho do executável atual.
+            new_exe_path (str): Caminho do executável baixado.
+
+        Returns:
+            str: Caminho do executável preparado.
+
+        Raises:
+            OSError: Sem permissão de escrita na pasta ou disco cheio.
+        """
+        current_exe = os.path.normpath(os.path.abspath(current_exe))
+        staged_exe = current_exe + ".new"
+        temp_path = staged_exe + ".tmp"
+
+        with open(new_exe_path, "rb") as origem, open(temp_path, "wb") as destino:
+            shutil.copyfileobj(origem, destino, 1024 * 1024)
+            destino.flush()
+            os.fsync(destino.fileno())
+        shutil.copymode(new_exe_path, temp_path)
+        os.replace(temp_path, staged_exe)
+
+        # O arquivo do cache já não é necessário; se a cópia para o espelho
+        # ainda estiver lendo, ela o remove ao terminar (sem esperar aqui)
+        with self._publicacao_lock:
+            publicando = self._publicacao is not None and self._arquivo_publicado == new_exe_path
+            if publicando:
+                self._remover_apos_publicar = True
+        if not publicando:
+            self._remover_do_cache(new_exe_path)
+        return staged_exe
+
+    @staticmethod
+    def _pids_to_wait():
+        """
+        Lista os processos que mantêm o executável aberto.
+
+        No executável "onefile" do PyInstaller, o bootloader (processo pai)
+        continua vivo até este processo terminar e também trava o arquivo.
+
+        Returns:
+            list: PIDs a aguardar.
+        """
+        pids = [os.getpid()]
+        meipass = getattr(sys, "_MEIPASS", None)
+        if meipass and os.path.normcase(os.path.dirname(os.path.abspath(sys.executable))) != os.path.normcase(os.path.abspath(meipass)):
+            pids.append(os.getppid())
+        return pids
+
+    def launch_swap_script(self, current_exe, staged_exe, pids):
+        """
+        Gera e inicia o script de troca do executável (BAT no Windows, sh nos demais).
+
+        Args:
+            current_exe (str): Caminho do executável atual.
+            staged_exe (str): Caminho do executável preparado por stage_update.
+            pids (list): Processos cujo término deve ser aguardado.
+
+        Returns:
+            subprocess.Popen: Processo do script.
+        """
+        if os.name == "nt":
+            bat_content = self.generate_bat_script(current_exe, staged_exe, pids)
+            script_path = self.write_and_validate_bat(bat_content, current_exe, staged_exe)
+            print(f"[DEBUG] Executando script: {script_path}")
+            return subprocess.Popen([script_path], shell=True)
+
+        sh_content = self.generate_sh_script(current_exe, staged_exe)
+        script_path = self.write_and_validate_sh(sh_content, current_exe, staged_exe)
+        print(f"[DEBUG] Executando script: {script_path}")
+        # O script lê o stdin até EOF: o pipe fecha quando este processo termina
+        process = subprocess.Popen(
+            ["/bin/sh", script_path],
+            stdin=subprocess.PIPE,
+            start_new_session=True,
+        )
+        self._swap_process = process
+        return process
     
-    def generate_bat_script(self, old_exe, new_exe):
+    def generate_bat_script(self, old_exe, new_exe, pids):
         """
         Gera o conteúdo do script BAT para substituição do executável.
         
         Args:
             old_exe (str): Caminho do executável atual.
-            new_exe (str): Caminho do novo executável.
+            new_exe (str): Caminho do novo executável (preparado ao lado do atual).
+            pids (list): Processos cujo término deve ser aguardado.
         
         Returns:
             str: Conteúdo do script BAT.
         """
         old_exe = os.path.normpath(os.path.abspath(old_exe))
         new_exe = os.path.normpath(os.path.abspath(new_exe))
+        pid_list = ",".join(str(pid) for pid in pids)
+        # Antivírus/indexador podem segurar o arquivo por alguns segundos
+        # depois do fim do processo: tentar de novo antes de desistir
+        tentativas = 10
+        # Sem PowerShell: consulta o tasklist até cada PID sumir
+        fallback = "\n".join(
+            f""" :aguardar_{pid}
+ tasklist /FI "PID eq {pid}" 2>nul | find "{pid}" >nul
+ if errorlevel 1 goto encerrado_{pid}
+ timeout /t 1 /nobreak >nul
+ goto aguardar_{pid}
+ :encerrado_{pid}"""
+            for pid in pids
+        )
         
         return f"""@echo off
  setlocal enabledelayedexpansion
@@ -230,16 +1498,15 @@ class Updater:
  :: === DADOS DO PROCESSO ===
  set "OLD_EXE={old_exe}"
  set "NEW_EXE={new_exe}"
+ set "BACKUP_EXE={old_exe}.old"
  
  echo Iniciando processo de atualizacao...
  
- :: === ENCERRAMENTO DO PROCESSO ===
- for %%I in ("%OLD_EXE%") do set "EXE_NAME=%%~nxI"
- echo Encerrando processo: !EXE_NAME!
- taskkill /IM "!EXE_NAME!" /F >nul 2>&1
- 
- :: === AGUARDAR PROCESSO ENCERRAR ===
- timeout /t 3 /nobreak >nul
+ :: === AGUARDAR PROCESSO ENCERRAR (pelo handle do PID, sem espera fixa) ===
+ powershell -NoProfile -NonInteractive -Command "Wait-Process -Id {pid_list} -ErrorAction SilentlyContinue" >nul 2>&1
+ if %ERRORLEVEL% EQU 0 goto processo_encerrado
+{fallback}
+ :processo_encerrado
  
  :: === VALIDACAO DOS ARQUIVOS ===
  if not exist "%NEW_EXE%" (
@@ -249,65 +1516,122 @@ class Updater:
      exit /b 1
  )
  
- :: === PROCESSO DE SUBSTITUICAO ===
+ :: === TROCA POR RENAME (versao anterior fica para rollback) ===
  echo Substituindo executavel...
- 
- :: Obter diretório de destino
- for %%I in ("%OLD_EXE%") do set "TARGET_DIR=%%~dpI"
- 
- :: Deletar arquivo antigo se existir
- if exist "%OLD_EXE%" (
-     del /F /Q "%OLD_EXE%" >nul 2>&1
-     timeout /t 2 /nobreak >nul
- )
- 
- :: Copiar novo executável diretamente
- copy /Y "%NEW_EXE%" "%OLD_EXE%" >nul 2>&1
- if %ERRORLEVEL% EQU 0 (
-     echo Copia realizada com sucesso
-     goto reiniciar
+ if exist "%BACKUP_EXE%" del /F /Q "%BACKUP_EXE%" >nul 2>&1
+ set /a TENTATIVA=0
+ :mover_atual
+ move /Y "%OLD_EXE%" "%BACKUP_EXE%" >nul 2>&1
+ if !ERRORLEVEL! EQU 0 goto instalar_novo
+ set /a TENTATIVA+=1
+ if !TENTATIVA! GEQ {tentativas} (
+     echo ERRO: Nao foi possivel mover o executavel atual
+     pause
+     exit /b 1
  )
+ timeout /t 1 /nobreak >nul
+ goto mover_atual
  
- :: Se copia falhou, tentar mover
+ :instalar_novo
+ set /a TENTATIVA=0
+ :mover_novo
  move /Y "%NEW_EXE%" "%OLD_EXE%" >nul 2>&1
- if %ERRORLEVEL% EQU 0 (
-     echo Movimento realizado com sucesso
-     goto reiniciar
+ if !ERRORLEVEL! EQU 0 goto reiniciar
+ set /a TENTATIVA+=1
+ if !TENTATIVA! LSS {tentativas} (
+     timeout /t 1 /nobreak >nul
+     goto mover_novo
  )
- 
- echo ERRO: Falha ao copiar executavel
+ echo ERRO: Falha ao instalar o novo executavel, restaurando versao anterior
+ move /Y "%BACKUP_EXE%" "%OLD_EXE%" >nul 2>&1
+ start "" "%OLD_EXE%"
  pause
  exit /b 1
  
- :reiniciar
  :: === REINICIALIZACAO ===
+ :reiniciar
  echo Atualizacao concluida! Reiniciando aplicacao...
- timeout /t 2 /nobreak >nul
- 
- :: Tentar iniciar o aplicativo
  start "" "%OLD_EXE%"
- if %ERRORLEVEL% NEQ 0 (
-     echo ERRO: Falha ao reiniciar aplicacao
-     echo Tentando executar diretamente...
-     "%OLD_EXE%"
- )
- 
- :: === LIMPEZA ===
- echo Limpando arquivos temporarios...
- timeout /t 2 /nobreak >nul
- 
- :: Deletar apenas o arquivo temporário específico que foi baixado
- if exist "%NEW_EXE%" (
-     echo Deletando arquivo temporario: %NEW_EXE%
-     del /F /Q "%NEW_EXE%" >nul 2>&1
- )
  
  :: Deletar o próprio script BAT
  del /F /Q "%~f0" >nul 2>&1
- 
- echo Limpeza concluida!
  exit /b 0
  """
+
+    def generate_sh_script(self, old_exe, new_exe):
+        """
+        Gera o conteúdo do script sh (POSIX) para substituição do executável.
+
+        O script espera o fim do processo lendo o stdin até EOF (o pipe é
+        fechado pelo sistema quando o processo atual termina).
+
+        Args:
+            old_exe (str): Caminho do executável atual.
+            new_exe (str): Caminho do novo executável (preparado ao lado do atual).
+
+        Returns:
+            str: Conteúdo do script sh.
+        """
+        old_exe = shlex.quote(os.path.abspath(old_exe))
+        new_exe = shlex.quote(os.path.abspath(new_exe))
+
+        return f"""#!/bin/sh
+OLD_EXE={old_exe}
+NEW_EXE={new_exe}
+BACKUP_EXE="$OLD_EXE.old"
+
+# === AGUARDAR PROCESSO ENCERRAR (EOF no pipe, sem espera fixa) ===
+cat >/dev/null
+
+# === VALIDACAO DOS ARQUIVOS ===
+if [ ! -f "$NEW_EXE" ]; then
+    echo "ERRO: Novo executavel nao encontrado: $NEW_EXE" >&2
+    exit 1
+fi
+
+# === TROCA POR RENAME (versao anterior fica para rollback) ===
+rm -f "$BACKUP_EXE"
+if ! ln "$OLD_EXE" "$BACKUP_EXE" 2>/dev/null; then
+    cp -p "$OLD_EXE" "$BACKUP_EXE" || exit 1
+fi
+if ! mv -f "$NEW_EXE" "$OLD_EXE"; then
+    echo "ERRO: Falha ao instalar o novo executavel" >&2
+    exit 1
+fi
+
+# === REINICIALIZACAO ===
+rm -f "$0"
+exec "$OLD_EXE" </dev/null
+"""
+
+    def write_and_validate_sh(self, content, old_exe, new_exe):
+        """
+        Escreve e valida o script sh.
+
+        Args:
+            content (str): Conteúdo do script.
+            old_exe (str): Caminho do executável atual.
+            new_exe (str): Caminho do novo executável.
+
+        Returns:
+            str: Caminho do script criado.
+        """
+        sh_path = os.path.join(tempfile.gettempdir(), f"update_script_{os.getpid()}.sh")
+        try:
+            with open(sh_path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            # Validação crítica
+            with open(sh_path, "r", encoding="utf-8") as f:
+                content_read = f.read()
+                if os.path.abspath(old_exe) not in content_read or os.path.abspath(new_exe) not in content_read:
+                    raise ValueError("Falha na validação do script de atualização")
+
+            print(f"[DEBUG] Script sh criado em: {sh_path}")
+            return sh_path
+
+        except Exception as e:
+            raise ValueError(f"Erro ao criar script de atualização: {str(e)}")
     
     def write_and_validate_bat(self, content, old_exe, new_exe):
         """
@@ -342,21 +1666,37 @@ class Updater:
         except Exception as e:
             raise ValueError(f"Erro ao criar script de atualização: {str(e)}")
     
-    def check_for_updates_with_retry(self, max_retries=3):
+    def check_for_updates_with_retry(self, max_retries=3, cancel_event=None, force=False):
         """
         Verifica atualizações com retry automático.
+
+        Cada tentativa já passa pelas novas tentativas da sessão HTTP
+        (falhas de conexão, 429/5xx); este laço cobre o que sobra, como
+        quedas no meio da resposta, e pode ser interrompido pelo cancel_event.
         
         Args:
             max_retries (int): Número máximo de tentativas.
+            cancel_event (threading.Event): Interrompe a espera entre tentativas.
+            force (bool): Consulta a rede mesmo dentro do intervalo mínimo.
         
         Returns:
             dict ou None: Informações da nova versão, se disponível.
+
+        Raises:
+            requests.RequestException: Se todas as tentativas falharem.
         """
         for attempt in range(max_retries):
             try:
-                return self.check_for_updates()
+                return self._fetch_update_info(force=force)
             except requests.RequestException as e:
                 if attempt == max_retries - 1:
                     raise e
-                time.sleep(2 ** attempt)  # Backoff exponencial
+                print(f"Tentativa {attempt + 1} falhou, tentando novamente: {e}")
+                # Backoff exponencial com jitter
+                espera = random.uniform(0, 2 ** (attempt + 1))
+                if cancel_event is not None:
+                    if cancel_event.wait(espera):
+                        return None
+                else:
+                    time.sleep(espera)
         return None 
\ No newline at end of file